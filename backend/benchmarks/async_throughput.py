@@ -0,0 +1,166 @@
+"""Concurrent-run throughput of the agent graph against a fake Gemini backend.
+
+Runs several "high effort" research runs (5 queries x 10 loops) at the same time
+and reports how many complete per second. Two backends are compared:
+
+- ``threaded``: every model call blocks a worker thread for its latency, which is
+  what the former sync nodes did when langgraph ran them in its executor.
+- ``async``: every model call awaits on the event loop, as the async nodes do now.
+
+Usage:
+    python benchmarks/async_throughput.py --runs 20 --latency 0.05 --workers 8
+"""
+
+import argparse
+import asyncio
+import importlib
+import itertools
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.language_models.chat_models import generate_from_stream
+from langchain_core.messages import AIMessageChunk, HumanMessage
+from langchain_core.outputs import ChatGenerationChunk
+
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+# Every run asks the same questions; measure the calls, not the search cache.
+os.environ.setdefault("SEARCH_CACHE_MEMORY_ENTRIES", "0")
+
+from agent.tools_and_schemas import Reflection, SearchQueryList  # noqa: E402
+
+# `agent.graph` is shadowed by the compiled graph re-exported from `agent`.
+graph_module = importlib.import_module("agent.graph")
+
+
+class FakeBackend:
+    """Sleeps for a fixed latency either on the event loop or in a thread pool."""
+
+    def __init__(self, mode: str, latency: float, workers: int):
+        self.mode = mode
+        self.latency = latency
+        self.pool = ThreadPoolExecutor(max_workers=workers)
+
+    async def wait(self):
+        if self.mode == "async":
+            await asyncio.sleep(self.latency)
+        else:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(self.pool, time.sleep, self.latency)
+
+
+def fake_grounded_response(query: str, sentences: int = 1):
+    text = " ".join(
+        f"Finding {i} about {query} reports a figure and the context behind it."
+        for i in range(sentences)
+    )
+    chunk = SimpleNamespace(
+        web=SimpleNamespace(
+            uri=f"https://example.com/{abs(hash(query))}", title="example.com"
+        )
+    )
+    support = SimpleNamespace(
+        segment=SimpleNamespace(start_index=0, end_index=len(text)),
+        grounding_chunk_indices=[0],
+    )
+    metadata = SimpleNamespace(grounding_chunks=[chunk], grounding_supports=[support])
+    return SimpleNamespace(
+        text=text, candidates=[SimpleNamespace(grounding_metadata=metadata)]
+    )
+
+
+def install_fakes(backend: FakeBackend, follow_ups: int, sentences: int = 1):
+    # Distinct follow-ups per loop so query deduplication does not end runs early
+    loop_ids = itertools.count()
+
+    class FakeStructured:
+        def __init__(self, schema):
+            self.schema = schema
+
+        async def ainvoke(self, prompt):
+            await backend.wait()
+            if self.schema is SearchQueryList:
+                return SearchQueryList(
+                    query=[f"query {i}" for i in range(5)], rationale="benchmark"
+                )
+            n = next(loop_ids)
+            return Reflection(
+                is_sufficient=False,
+                knowledge_gap="benchmark",
+                follow_up_queries=[f"follow up q{n}x{i}" for i in range(follow_ups)],
+                confidence=1.0,
+            )
+
+    class FakeChatModel(BaseChatModel):
+        @property
+        def _llm_type(self):
+            return "fake"
+
+        def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+            return generate_from_stream(self._stream(messages, stop, run_manager))
+
+        def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+            # The graph only calls the model asynchronously; sync calls skip the latency
+            yield ChatGenerationChunk(message=AIMessageChunk(content="Final answer."))
+
+        async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+            await backend.wait()
+            yield ChatGenerationChunk(message=AIMessageChunk(content="Final answer."))
+
+    class FakeModels:
+        async def generate_content(self, model, contents, config):
+            await backend.wait()
+            # The prompt quotes the search query
+            return fake_grounded_response(contents.split('"', 2)[1], sentences)
+
+    graph_module.get_chat_model = lambda model, **kwargs: FakeChatModel()
+    graph_module.get_structured_model = lambda model, schema, **kwargs: FakeStructured(
+        schema
+    )
+    client = SimpleNamespace(aio=SimpleNamespace(models=FakeModels()))
+    graph_module.get_genai_client = lambda: client
+
+
+async def run_concurrently(runs: int) -> float:
+    state = {
+        "messages": [HumanMessage(content="benchmark question")],
+        "initial_search_query_count": 5,
+        "max_research_loops": 10,
+        "reasoning_model": "fake-model",
+    }
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(
+            graph_module.graph.ainvoke(
+                state,
+                {"recursion_limit": 100, "configurable": {"max_research_loops": 10}},
+            )
+            for _ in range(runs)
+        )
+    )
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--follow-ups", type=int, default=5)
+    args = parser.parse_args()
+
+    for mode in ("threaded", "async"):
+        backend = FakeBackend(mode, args.latency, args.workers)
+        install_fakes(backend, args.follow_ups)
+        elapsed = asyncio.run(run_concurrently(args.runs))
+        print(  # noqa: T201
+            f"{mode:>8}: {args.runs} runs in {elapsed:.2f}s "
+            f"({args.runs / elapsed:.2f} runs/s)"
+        )
+        backend.pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Checkpoint bytes written per run, with and without the blob store.
+
+Runs one "high effort" research run (5 queries x 10 loops) against the fake
+Gemini backend from ``async_throughput.py`` and counts the serialized bytes a
+checkpointer is asked to write: every new channel version at each superstep plus
+every pending write, which is what langgraph-api stores in Postgres.
+
+Usage:
+    python benchmarks/checkpoint_bytes.py --loops 10 --sentences 40
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+
+from async_throughput import FakeBackend, graph_module, install_fakes
+from langchain_core.messages import HumanMessage
+from langgraph.checkpoint.memory import InMemorySaver
+
+
+class CountingSaver(InMemorySaver):
+    """In-memory checkpointer that tallies the bytes each write serializes."""
+
+    def __init__(self):
+        super().__init__()
+        self.bytes_written = 0
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        for channel in new_versions:
+            if channel in checkpoint["channel_values"]:
+                value = checkpoint["channel_values"][channel]
+                self.bytes_written += len(self.serde.dumps_typed(value)[1])
+        return super().put(config, checkpoint, metadata, new_versions)
+
+    def put_writes(self, config, writes, task_id, task_path=""):
+        for _, value in writes:
+            self.bytes_written += len(self.serde.dumps_typed(value)[1])
+        return super().put_writes(config, writes, task_id, task_path)
+
+
+async def checkpoint_bytes(loops: int, queries: int) -> int:
+    saver = CountingSaver()
+    graph = graph_module.builder.compile(checkpointer=saver)
+    await graph.ainvoke(
+        {
+            "messages": [HumanMessage(content="benchmark question")],
+            "initial_search_query_count": queries,
+            "reasoning_model": "fake-model",
+        },
+        {
+            "recursion_limit": 100,
+            "configurable": {"thread_id": "benchmark", "max_research_loops": loops},
+        },
+    )
+    return saver.bytes_written
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--loops", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=5)
+    parser.add_argument("--sentences", type=int, default=40)
+    args = parser.parse_args()
+
+    install_fakes(FakeBackend("async", 0, 1), args.queries, args.sentences)
+    with tempfile.TemporaryDirectory() as blob_dir:
+        for label, uri in (("inline", None), ("blob store", f"file://{blob_dir}")):
+            if uri is None:
+                os.environ.pop("BLOB_STORE_URI", None)
+            else:
+                os.environ["BLOB_STORE_URI"] = uri
+            written = asyncio.run(checkpoint_bytes(args.loops, args.queries))
+            print(f"{label:>10}: {written:,} bytes")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Citation marker insertion time, per-citation slicing versus single pass.
+
+Builds a ~100 KB grounded answer with 1,000 grounding supports and times the
+former slicing implementation of `insert_citation_markers` against the current
+one, checking that both produce the same text.
+
+Usage:
+    python benchmarks/citation_markers.py --size 100000 --supports 1000
+"""
+
+import argparse
+import os
+import random
+import timeit
+
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+
+from agent.utils import insert_citation_markers  # noqa: E402
+
+
+def insert_citation_markers_slicing(text, citations_list):
+    """The former implementation: rebuilds the string once per citation."""
+    sorted_citations = sorted(
+        citations_list, key=lambda c: (c["end_index"], c["start_index"]), reverse=True
+    )
+    modified_text = text
+    for citation_info in sorted_citations:
+        end_idx = citation_info["end_index"]
+        marker_to_insert = ""
+        for segment in citation_info["segments"]:
+            marker_to_insert += f" [{segment['label']}]({segment['short_url']})"
+        modified_text = (
+            modified_text[:end_idx] + marker_to_insert + modified_text[end_idx:]
+        )
+    return modified_text
+
+
+def make_citations(size: int, supports: int, seed: int = 0):
+    rng = random.Random(seed)
+    text = "".join(rng.choice("abcdefghij klmnop. ") for _ in range(size))
+    # Distinct end indices so both implementations agree on marker order
+    ends = sorted(rng.sample(range(1, size), supports))
+    citations = [
+        {
+            "start_index": max(end - 200, 0),
+            "end_index": end,
+            "segments": [
+                {
+                    "label": "source",
+                    "short_url": f"https://vertexaisearch.cloud.google.com/id/0-{i}",
+                }
+            ],
+        }
+        for i, end in enumerate(ends)
+    ]
+    return text, citations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=100_000)
+    parser.add_argument("--supports", type=int, default=1_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    text, citations = make_citations(args.size, args.supports)
+    assert insert_citation_markers(text, citations) == (
+        insert_citation_markers_slicing(text, citations)
+    )
+    for name, fn in (
+        ("slicing", insert_citation_markers_slicing),
+        ("single pass", insert_citation_markers),
+        ("single pass, byte offsets", lambda t, c: insert_citation_markers(t, c, True)),
+    ):
+        seconds = min(
+            timeit.repeat(lambda: fn(text, citations), number=1, repeat=args.repeat)
+        )
+        print(f"{name:>26}: {seconds * 1000:8.2f} ms")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
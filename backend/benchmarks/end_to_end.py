@@ -0,0 +1,63 @@
+"""End-to-end run latency of the agent graph against the offline fake backend.
+
+Starts several research runs at once with ``GEMINI_BACKEND=fake`` and reports the
+distribution of run latencies. The fake's latency and response sizes come from
+the ``FAKE_GEMINI_*`` environment variables (see ``agent.fake_backend``).
+
+Usage:
+    FAKE_GEMINI_LATENCY_SECONDS=0.2 python benchmarks/end_to_end.py --runs 20
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+os.environ["GEMINI_BACKEND"] = "fake"
+
+from langchain_core.messages import HumanMessage  # noqa: E402
+
+from agent import graph  # noqa: E402
+
+
+async def timed_run(index: int, queries: int, loops: int) -> float:
+    start = time.perf_counter()
+    await graph.ainvoke(
+        {
+            "messages": [HumanMessage(content=f"Benchmark question number {index}")],
+            "initial_search_query_count": queries,
+            "reasoning_model": "gemini-2.5-flash",
+        },
+        {"recursion_limit": 100, "configurable": {"max_research_loops": loops}},
+    )
+    return time.perf_counter() - start
+
+
+async def run_concurrently(runs: int, queries: int, loops: int) -> list[float]:
+    return await asyncio.gather(
+        *(timed_run(index, queries, loops) for index in range(runs))
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=3)
+    parser.add_argument("--loops", type=int, default=2)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    latencies = sorted(
+        asyncio.run(run_concurrently(args.runs, args.queries, args.loops))
+    )
+    elapsed = time.perf_counter() - start
+    p95 = latencies[min(len(latencies) - 1, round(0.95 * (len(latencies) - 1)))]
+    print(  # noqa: T201
+        f"{args.runs} runs in {elapsed:.2f}s ({args.runs / elapsed:.2f} runs/s), "
+        f"p50 {statistics.median(latencies):.2f}s, p95 {p95:.2f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
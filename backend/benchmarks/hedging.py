@@ -0,0 +1,84 @@
+"""Grounded-search tail latency with and without hedged requests.
+
+Sends batches of parallel grounded searches, like the ``web_research`` fan-out of
+one research loop, to the offline fake backend with a heavy-tailed latency
+distribution and compares the latency of each batch, which is set by its slowest
+search.
+
+Usage:
+    python benchmarks/hedging.py --batches 200 --percentile 90 --max-rate 0.1
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+os.environ["GEMINI_BACKEND"] = "fake"
+
+from prometheus_client import REGISTRY  # noqa: E402
+
+from agent.fake_backend import FakeGenaiClient, FakeProfile  # noqa: E402
+from agent.hedging import LatencyTracker, hedged_call  # noqa: E402
+
+
+async def run_batches(args, hedge: bool) -> list[float]:
+    client = FakeGenaiClient(
+        FakeProfile(
+            latency_seconds=args.latency, latency_sigma=args.sigma, seed=args.seed
+        )
+    )
+    tracker = LatencyTracker()
+
+    async def search(query: str) -> None:
+        async def send(is_hedge: bool):
+            return await client.aio.models.generate_content(
+                model="gemini-2.0-flash", contents=f'Research Topic:\n"{query}"'
+            )
+
+        if hedge:
+            await hedged_call(send, tracker, args.percentile, args.max_rate)
+        else:
+            await send(False)
+
+    latencies = []
+    for batch in range(args.batches):
+        start = time.perf_counter()
+        await asyncio.gather(*(search(f"q{batch}-{i}") for i in range(args.fanout)))
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def summarize(label: str, latencies: list[float]) -> None:
+    ordered = sorted(latencies)
+    p99 = ordered[min(len(ordered) - 1, round(0.99 * (len(ordered) - 1)))]
+    print(  # noqa: T201
+        f"{label:>10}: p50 {statistics.median(ordered) * 1000:6.1f}ms  "
+        f"p99 {p99 * 1000:6.1f}ms  mean {statistics.fmean(ordered) * 1000:6.1f}ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batches", type=int, default=200)
+    parser.add_argument("--fanout", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--sigma", type=float, default=0.8)
+    parser.add_argument("--percentile", type=float, default=90)
+    parser.add_argument("--max-rate", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    summarize("no hedge", asyncio.run(run_batches(args, hedge=False)))
+    summarize("hedged", asyncio.run(run_batches(args, hedge=True)))
+    sent = REGISTRY.get_sample_value("agent_hedged_requests_total", {"outcome": "sent"})
+    won = REGISTRY.get_sample_value("agent_hedged_requests_total", {"outcome": "won"})
+    total = args.batches * args.fanout
+    print(  # noqa: T201
+        f"hedges sent {sent:.0f} ({sent / total:.1%} of searches), won {won:.0f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
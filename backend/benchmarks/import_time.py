@@ -0,0 +1,138 @@
+"""Import time of ``agent.graph``, checked against a baseline revision.
+
+Imports the graph module in fresh interpreters with ``python -X importtime`` and
+reports the median cumulative import time, together with the top-level packages
+that account for most of it. No ``GEMINI_API_KEY`` is set, since importing the
+graph must not need one.
+
+With ``--baseline-ref`` the same measurement is taken on a checkout of that git
+revision, on the same machine, and the script exits with status 1 when the
+median is more than ``--max-regression`` slower than the baseline's. Absolute
+times vary too much between machines for a fixed budget to mean much, but
+``--budget-ms`` sets one as well.
+
+Usage:
+    python benchmarks/import_time.py --repeat 5 --baseline-ref main
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from collections import Counter
+from pathlib import Path
+from typing import Optional
+
+MODULE = "agent.graph"
+
+
+def import_times(
+    module: str, src: Path, api_key: Optional[str] = None
+) -> dict[str, tuple[int, int]]:
+    """Return the self and cumulative import time in microseconds of each module."""
+    env = {
+        k: v
+        for k, v in os.environ.items()
+        if k not in ("GEMINI_API_KEY", "GEMINI_BACKEND")
+    }
+    if api_key:
+        env["GEMINI_API_KEY"] = api_key
+    # Put the measured sources ahead of any installed copy of the package
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(src), env.get("PYTHONPATH")]))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def median_import_ms(
+    src: Path, repeat: int, api_key: Optional[str] = None
+) -> tuple[float, list]:
+    """Return the median import time of MODULE from `src` and the runs it came from."""
+    # The first import compiles bytecode, which a fresh checkout has not done yet
+    import_times(MODULE, src, api_key)
+    runs = [import_times(MODULE, src, api_key) for _ in range(repeat)]
+    return statistics.median(run[MODULE][1] for run in runs) / 1000, runs
+
+
+def baseline_import_ms(ref: str, repeat: int) -> float:
+    """Return the median import time of MODULE on a temporary checkout of `ref`."""
+    src = Path(__file__).resolve().parents[1] / "src"
+    root = Path(
+        subprocess.run(
+            ["git", "rev-parse", "--show-toplevel"],
+            cwd=src,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        checkout = Path(tmp) / "baseline"
+        subprocess.run(
+            ["git", "worktree", "add", "--detach", "--quiet", str(checkout), ref],
+            cwd=root,
+            check=True,
+        )
+        try:
+            # Older revisions may still need a key to import the graph
+            return median_import_ms(
+                checkout / src.relative_to(root), repeat, api_key="import-time"
+            )[0]
+        finally:
+            subprocess.run(
+                ["git", "worktree", "remove", "--force", str(checkout)],
+                cwd=root,
+                check=True,
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--baseline-ref")
+    parser.add_argument("--max-regression", type=float, default=0.1)
+    parser.add_argument("--budget-ms", type=float)
+    parser.add_argument("--top", type=int, default=8)
+    args = parser.parse_args()
+
+    src = Path(__file__).resolve().parents[1] / "src"
+    median_ms, runs = median_import_ms(src, args.repeat)
+    by_package = Counter()
+    for run in runs:
+        for name, (self_us, _) in run.items():
+            by_package[name.split(".")[0]] += self_us / len(runs)
+
+    print(f"import {MODULE}: median {median_ms:.0f}ms")  # noqa: T201
+    for package, self_us in by_package.most_common(args.top):
+        print(f"  {package:<28} {self_us / 1000:7.1f}ms")  # noqa: T201
+
+    limits: list[tuple[str, Optional[float]]] = [("budget", args.budget_ms)]
+    if args.baseline_ref:
+        baseline_ms = baseline_import_ms(args.baseline_ref, args.repeat)
+        limit_ms = baseline_ms * (1 + args.max_regression)
+        print(  # noqa: T201
+            f"{args.baseline_ref}: median {baseline_ms:.0f}ms, "
+            f"limit {limit_ms:.0f}ms (+{args.max_regression:.0%})"
+        )
+        limits.append((f"{args.max_regression:.0%} over {args.baseline_ref}", limit_ms))
+    over = [name for name, limit_ms in limits if limit_ms and median_ms > limit_ms]
+    if over:
+        print(f"over {', '.join(over)}")  # noqa: T201
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
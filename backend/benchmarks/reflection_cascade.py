@@ -0,0 +1,95 @@
+"""Escalation rate of the reflection cascade and the reflection tokens per model.
+
+Runs the graph against the offline fake backend, first with every reflection on
+the reflection model and then with a fast model tried first. The fake backend
+draws each reflection's confidence uniformly from 0 to 1, so the low-confidence
+share of escalations tracks ``--min-confidence``; real models report higher
+confidence on easy verdicts.
+
+Usage:
+    python benchmarks/reflection_cascade.py --runs 10 --loops 3 --min-confidence 0.7
+"""
+
+import argparse
+import asyncio
+import os
+from collections import Counter
+
+os.environ["GEMINI_BACKEND"] = "fake"
+
+from langchain_core.messages import HumanMessage  # noqa: E402
+from prometheus_client import REGISTRY  # noqa: E402
+
+from agent import graph  # noqa: E402
+
+REFLECTION_MODEL = "gemini-2.5-pro"
+FAST_MODEL = "gemini-2.0-flash"
+
+
+def reflection_metrics() -> tuple[Counter, Counter]:
+    outcomes, tokens = Counter(), Counter()
+    for family in REGISTRY.collect():
+        for sample in family.samples:
+            if sample.name == "agent_reflection_cascade_total":
+                outcomes[sample.labels["outcome"]] += sample.value
+            elif (
+                sample.name == "agent_node_tokens_total"
+                and sample.labels["node"] == "reflection"
+                and sample.labels["kind"] == "prompt"
+            ):
+                tokens[sample.labels["model"]] += sample.value
+    return outcomes, tokens
+
+
+async def run(args, fast_model: str) -> tuple[Counter, Counter]:
+    outcomes, tokens = reflection_metrics()
+    for index in range(args.runs):
+        await graph.ainvoke(
+            {"messages": [HumanMessage(content=f"Benchmark question number {index}")]},
+            {
+                "recursion_limit": 100,
+                "configurable": {
+                    "max_research_loops": args.loops,
+                    "reflection_model": REFLECTION_MODEL,
+                    "reflection_fast_model": fast_model,
+                    "reflection_min_confidence": args.min_confidence,
+                },
+            },
+        )
+    after_outcomes, after_tokens = reflection_metrics()
+    return after_outcomes - outcomes, after_tokens - tokens
+
+
+def report(label: str, outcomes: Counter, tokens: Counter, runs: int) -> None:
+    per_model = ", ".join(
+        f"{model} {count / runs:.0f}" for model, count in sorted(tokens.items())
+    )
+    print(f"{label:>8}: reflection prompt tokens per run: {per_model}")  # noqa: T201
+    attempts = sum(outcomes.values())
+    if attempts:
+        escalated = attempts - outcomes["kept"]
+        reasons = ", ".join(
+            f"{reason} {count:.0f}"
+            for reason, count in sorted(outcomes.items())
+            if reason != "kept"
+        )
+        print(  # noqa: T201
+            f"{'':>8}  {escalated:.0f} of {attempts:.0f} fast reflections escalated "
+            f"({escalated / attempts:.0%}): {reasons or 'none'}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--loops", type=int, default=3)
+    parser.add_argument("--min-confidence", type=float, default=0.7)
+    args = parser.parse_args()
+    os.environ.setdefault("FAKE_GEMINI_LATENCY_SECONDS", "0.01")
+
+    report("single", *asyncio.run(run(args, "")), args.runs)
+    report("cascade", *asyncio.run(run(args, FAST_MODEL)), args.runs)
+
+
+if __name__ == "__main__":
+    main()
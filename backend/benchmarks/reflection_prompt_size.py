@@ -0,0 +1,62 @@
+"""Reflection prompt size per research loop, full history versus running digest.
+
+Simulates a "high effort" run that adds a batch of web research summaries every
+loop and prints the estimated prompt tokens reflection would send in each loop.
+
+Usage:
+    python benchmarks/reflection_prompt_size.py --loops 10 --queries 5
+"""
+
+import argparse
+import os
+
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+
+from agent.configuration import Configuration  # noqa: E402
+from agent.digest import strip_citation_links, update_digest  # noqa: E402
+from agent.prompts import reflection_prefix, reflection_suffix  # noqa: E402
+from agent.utils import estimate_tokens  # noqa: E402
+
+
+def fake_summary(loop: int, query: int, sentences: int) -> str:
+    return " ".join(
+        f"Finding {i} for query {query} of loop {loop} reports a specific figure "
+        f"and the context needed to interpret it "
+        f"[source](https://vertexaisearch.cloud.google.com/id/{loop}{query}-{i})."
+        for i in range(sentences)
+    )
+
+
+def prompt_tokens(summaries: list[str]) -> int:
+    prompt = reflection_prefix + reflection_suffix.format(
+        research_topic="benchmark question",
+        summaries="\n\n---\n\n".join(summaries),
+    )
+    return estimate_tokens(prompt)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--loops", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=5)
+    parser.add_argument("--sentences", type=int, default=20)
+    parser.add_argument(
+        "--digest-tokens", type=int, default=Configuration().reflection_digest_tokens
+    )
+    args = parser.parse_args()
+
+    results: list[str] = []
+    digest: list[str] = []
+    print(f"{'loop':>4} {'full history':>13} {'digest':>8}")  # noqa: T201
+    for loop in range(args.loops):
+        batch = [fake_summary(loop, q, args.sentences) for q in range(args.queries)]
+        results += batch
+        new_summaries = [strip_citation_links(s) for s in batch]
+        full = prompt_tokens(results)
+        incremental = prompt_tokens(digest + new_summaries)
+        digest = update_digest(digest, new_summaries, args.digest_tokens)
+        print(f"{loop + 1:>4} {full:>13} {incremental:>8}")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
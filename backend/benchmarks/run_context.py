@@ -0,0 +1,54 @@
+"""Per-node overhead of resolving the configuration, date and research topic.
+
+Compares what every node and router used to do on each invocation, validating
+``Configuration`` from the environment and the runnable config and formatting the
+date and research topic, with a lookup of the turn's cached ``RunContext``.
+
+Usage:
+    python benchmarks/run_context.py --calls 20000
+"""
+
+import argparse
+import time
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from agent.configuration import Configuration
+from agent.prompts import get_current_date
+from agent.run_context import get_run_context
+from agent.utils import get_research_topic
+
+
+def per_call_us(fn, calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--history", type=int, default=6)
+    args = parser.parse_args()
+
+    messages = [
+        (HumanMessage if i % 2 == 0 else AIMessage)(content=f"Message {i} " * 50)
+        for i in range(args.history - 1)
+    ] + [HumanMessage(content="How large is the heat pump market?")]
+    state = {"messages": messages, "turn_id": "benchmark"}
+    config = {"configurable": {"thread_id": "benchmark", "max_research_loops": 3}}
+
+    def derive():
+        Configuration.from_runnable_config(config)
+        get_current_date()
+        get_research_topic(messages)
+
+    derived = per_call_us(derive, args.calls)
+    cached = per_call_us(lambda: get_run_context(state, config), args.calls)
+    print(f"derive per node: {derived:7.1f}us")  # noqa: T201
+    print(f"cached context:  {cached:7.1f}us ({derived / cached:.0f}x)")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Short URL substitution time in the final answer, per-source loop versus one pass.
+
+Builds a `sources_gathered` list of 5,000 entries (unique short URLs repeated once
+per citing segment, as web_research produces them) and an answer citing a subset
+of them, then times the former per-source `in`/`replace` loop against
+`replace_short_urls`, checking that both produce the same text.
+
+Usage:
+    python benchmarks/short_url_substitution.py --sources 5000 --unique 500
+"""
+
+import argparse
+import os
+import random
+import timeit
+
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+
+from agent.utils import replace_short_urls  # noqa: E402
+
+PREFIX = "https://vertexaisearch.cloud.google.com/id/"
+
+
+def replace_short_urls_loop(text, sources):
+    """The former finalize_answer loop: one scan and replace per source entry."""
+    unique_sources = []
+    for source in sources:
+        if source["short_url"] in text:
+            text = text.replace(source["short_url"], source["value"])
+            unique_sources.append(source)
+    return text, unique_sources
+
+
+def make_inputs(n_sources: int, n_unique: int, citations: int, seed: int = 0):
+    rng = random.Random(seed)
+    unique = [
+        {
+            "label": f"site{i}",
+            # Fixed-width ids so no short URL is a prefix of another; the former
+            # loop would corrupt those, which would fail the equality check.
+            "short_url": f"{PREFIX}{i // 10:03d}-{i % 10}",
+            "value": f"https://www.example.com/articles/{i}/{'x' * 80}",
+        }
+        for i in range(n_unique)
+    ]
+    sources = [rng.choice(unique) for _ in range(n_sources)]
+    cited = rng.sample(unique, min(citations, n_unique))
+    text = " ".join(
+        f"Claim number {i} backed by evidence [{s['label']}]({s['short_url']})."
+        for i, s in enumerate(cited * (citations // len(cited)))
+    )
+    return text, sources
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sources", type=int, default=5_000)
+    parser.add_argument("--unique", type=int, default=500)
+    parser.add_argument("--citations", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    text, sources = make_inputs(args.sources, args.unique, args.citations)
+    assert (
+        replace_short_urls(text, sources)[0]
+        == (replace_short_urls_loop(text, sources)[0])
+    )
+    for name, fn in (
+        ("per-source loop", replace_short_urls_loop),
+        ("single pass", replace_short_urls),
+    ):
+        seconds = min(
+            timeit.repeat(lambda: fn(text, sources), number=1, repeat=args.repeat)
+        )
+        print(f"{name:>16}: {seconds * 1000:8.2f} ms")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Input tokens billed per run with and without the shared summaries cache.
+
+Runs the graph against the offline fake backend, first with the summaries sent
+inline and then with the last reflection and the final answer reading them from
+one context cache. The fake backend models cache creation and cache hits, and
+reports cached prompt tokens the way Gemini does.
+
+Billed input counts uncached prompt tokens in full, cached ones at
+``--cached-rate`` and the tokens written to new caches in full. Cache storage is
+billed per token-hour and is not included.
+
+Usage:
+    python benchmarks/summaries_cache.py --runs 5 --loops 2 --ttl 300
+"""
+
+import argparse
+import asyncio
+import os
+
+os.environ["GEMINI_BACKEND"] = "fake"
+
+from langchain_core.messages import HumanMessage  # noqa: E402
+from prometheus_client import REGISTRY  # noqa: E402
+
+from agent import graph  # noqa: E402
+
+
+def token_totals() -> dict[str, float]:
+    totals = {"prompt": 0.0, "cache_read": 0.0, "cache_written": 0.0}
+    for family in REGISTRY.collect():
+        for sample in family.samples:
+            if sample.name == "agent_node_tokens_total":
+                if sample.labels["kind"] in totals:
+                    totals[sample.labels["kind"]] += sample.value
+            elif sample.name == "agent_context_cache_tokens_total":
+                totals["cache_written"] += sample.value
+    return totals
+
+
+async def run(args, ttl: int) -> dict[str, float]:
+    before = token_totals()
+    for index in range(args.runs):
+        await graph.ainvoke(
+            {
+                "messages": [
+                    HumanMessage(content=f"Benchmark question number {index}")
+                ],
+                "initial_search_query_count": args.queries,
+                "reasoning_model": "gemini-2.5-flash",
+            },
+            {
+                "recursion_limit": 100,
+                "configurable": {
+                    "max_research_loops": args.loops,
+                    "summaries_cache_ttl_seconds": ttl,
+                },
+            },
+        )
+    after = token_totals()
+    return {kind: (after[kind] - before[kind]) / args.runs for kind in after}
+
+
+def report(label: str, tokens: dict[str, float], cached_rate: float) -> None:
+    billed = (
+        tokens["prompt"]
+        - tokens["cache_read"] * (1 - cached_rate)
+        + tokens["cache_written"]
+    )
+    print(  # noqa: T201
+        f"{label:>8}: {tokens['prompt']:8.0f} prompt tokens per run, "
+        f"{tokens['cache_read']:7.0f} from cache, {tokens['cache_written']:7.0f} "
+        f"written to caches, {billed:8.0f} billed"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--queries", type=int, default=3)
+    parser.add_argument("--loops", type=int, default=2)
+    parser.add_argument("--ttl", type=int, default=300)
+    parser.add_argument("--cached-rate", type=float, default=0.25)
+    args = parser.parse_args()
+    os.environ.setdefault("FAKE_GEMINI_LATENCY_SECONDS", "0.01")
+
+    report("inline", asyncio.run(run(args, 0)), args.cached_rate)
+    report("cached", asyncio.run(run(args, args.ttl)), args.cached_rate)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Print the OpenTelemetry span tree of one run against the offline fake backend.
+
+Shows where a run spends its time: each node, every Gemini request and the
+citation post-processing of each ``web_research`` branch, with ``Send`` branches
+and research loops attached to the run's trace.
+
+Usage:
+    FAKE_GEMINI_LATENCY_SECONDS=0.2 python benchmarks/trace_run.py --loops 2
+"""
+
+import argparse
+import asyncio
+import os
+from collections import defaultdict
+
+os.environ["GEMINI_BACKEND"] = "fake"
+
+from langchain_core.messages import HumanMessage  # noqa: E402
+
+from agent import graph  # noqa: E402
+from agent.tracing import configure_tracing  # noqa: E402
+
+
+def print_tree(spans) -> None:
+    children = defaultdict(list)
+    for span in spans:
+        children[span.parent.span_id if span.parent else None].append(span)
+    trace_ids = {span.context.trace_id for span in spans}
+
+    def walk(parent_id, depth):
+        for span in sorted(children[parent_id], key=lambda s: s.start_time):
+            duration = (span.end_time - span.start_time) / 1e9
+            print(f"{'  ' * depth}{span.name:<{60 - 2 * depth}} {duration:7.3f}s")  # noqa: T201
+            walk(span.context.span_id, depth + 1)
+
+    walk(None, 0)
+    print(f"{len(spans)} spans in {len(trace_ids)} trace(s)")  # noqa: T201
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--queries", type=int, default=3)
+    parser.add_argument("--loops", type=int, default=2)
+    args = parser.parse_args()
+
+    exporter = configure_tracing("memory")
+    asyncio.run(
+        graph.ainvoke(
+            {
+                "messages": [
+                    HumanMessage(content="How large is the heat pump market?")
+                ],
+                "initial_search_query_count": args.queries,
+                "reasoning_model": "gemini-2.5-flash",
+            },
+            {
+                "recursion_limit": 100,
+                "configurable": {"max_research_loops": args.loops},
+            },
+        )
+    )
+    print_tree(exporter.get_finished_spans())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+import re
+from typing import List
+
+from agent.digest import split_sentences, strip_citation_links
+from agent.query_dedup import content_words, query_tokens
+from agent.utils import estimate_tokens
+
+_SHORT_URL_RE = re.compile(r"https://vertexaisearch\.cloud\.google\.com/id/[\w-]+")
+
+# How much citation density counts relative to topic relevance when ranking
+CITATION_DENSITY_WEIGHT = 0.5
+
+
+def rank_summaries(summaries: List[str], research_topic: str) -> List[int]:
+    """Order summaries by relevance to the research topic and citation density.
+
+    Relevance is the share of the topic's content words that a summary mentions.
+    Citation density is the number of cited short URLs per token, scaled so the
+    densest summary scores 1.
+
+    Returns:
+        Indices into `summaries`, best first.
+    """
+    topic = query_tokens(research_topic)
+    densities = [
+        len(_SHORT_URL_RE.findall(summary)) / estimate_tokens(summary)
+        for summary in summaries
+    ]
+    max_density = max(densities, default=0) or 1
+    scores = [
+        len(topic & query_tokens(strip_citation_links(summary))) / max(len(topic), 1)
+        + CITATION_DENSITY_WEIGHT * density / max_density
+        for summary, density in zip(summaries, densities)
+    ]
+    return sorted(range(len(summaries)), key=lambda i: scores[i], reverse=True)
+
+
+def unseen_content_share(drafted: List[str], new: List[str]) -> float:
+    """Return the share of an answer's material that a draft from `drafted` lacks.
+
+    Counts the content words of all summaries, `drafted` and `new` together, and
+    returns the share that are words of the new summaries which no drafted summary
+    contains. New summaries that restate known findings barely count, and the same
+    new findings count for less the more research the draft already had.
+    """
+    known = set()
+    total = 0
+    for summary in drafted:
+        words = content_words(strip_citation_links(summary))
+        known.update(words)
+        total += len(words)
+    unseen = 0
+    for summary in new:
+        words = content_words(strip_citation_links(summary))
+        unseen += sum(word not in known for word in words)
+        total += len(words)
+    return unseen / total if total else 0.0
+
+
+def assemble_context(
+    summaries: List[str], research_topic: str, max_tokens: int
+) -> List[str]:
+    """Pack the most useful summaries into a token budget for the final answer.
+
+    Summaries are taken in rank order. One that does not fit whole contributes its
+    leading sentences instead; sentences are never split, so every citation link
+    that makes it into the context keeps its short URL intact.
+
+    Args:
+        summaries: Web research summaries with inline citation markers.
+        research_topic: The research topic the answer is about.
+        max_tokens: Token budget for the packed summaries.
+
+    Returns:
+        The selected summaries, possibly shortened, in their original order.
+    """
+    if sum(estimate_tokens(s) for s in summaries) <= max_tokens:
+        return list(summaries)
+
+    packed: dict[int, str] = {}
+    remaining = max_tokens
+    for index in rank_summaries(summaries, research_topic):
+        summary = summaries[index]
+        cost = estimate_tokens(summary)
+        if cost <= remaining:
+            packed[index] = summary
+            remaining -= cost
+            continue
+        kept = []
+        for sentence in split_sentences(summary):
+            cost = estimate_tokens(sentence)
+            if cost > remaining:
+                break
+            kept.append(sentence)
+            remaining -= cost
+        if kept:
+            packed[index] = " ".join(kept)
+    return [packed[index] for index in sorted(packed)]
@@ -1,11 +1,42 @@
 # mypy: disable - error - code = "no-untyped-def,misc"
+import os
 import pathlib
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, Response
 from fastapi.staticfiles import StaticFiles
 import fastapi.exceptions
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+from agent.clients import credentials_ready, warm_up
+from agent.tracing import configure_tracing
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Optionally build the pooled LLM clients before the first request arrives."""
+    if os.getenv("WARM_UP_CLIENTS", "").lower() in ("1", "true", "yes"):
+        warm_up()
+    if os.getenv("AGENT_TRACE_EXPORTER"):
+        configure_tracing()
+    yield
+
 
 # Define the FastAPI app
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
+
+
+@app.get("/metrics")
+def metrics():
+    """Expose the agent's Prometheus metrics."""
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
+@app.get("/ready")
+def ready():
+    """Report whether the agent can reach Gemini, i.e. its credentials are set."""
+    if not credentials_ready():
+        return Response("GEMINI_API_KEY is not set", status_code=503)
+    return Response("ok", media_type="text/plain")
 
 
 def create_frontend_router(build_dir="../frontend/dist"):
@@ -0,0 +1,182 @@
+import asyncio
+import hashlib
+import os
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Optional
+from urllib.parse import urlparse
+
+# Large state values are replaced by references of this form; everything else in
+# a list of texts is stored inline.
+BLOB_REF_PREFIX = "blob:sha256:"
+
+
+def is_blob_ref(value: object) -> bool:
+    """Return whether a state value is a reference to an offloaded blob."""
+    return isinstance(value, str) and value.startswith(BLOB_REF_PREFIX)
+
+
+class BlobStore(ABC):
+    """Content-addressed store for large state values.
+
+    Blobs are keyed by the SHA-256 of their content, so storing the same value
+    twice is free and a reference never goes stale.
+    """
+
+    @abstractmethod
+    def _write(self, digest: str, data: bytes) -> None:
+        """Store `data` under its digest; storing an existing digest is a no-op."""
+
+    @abstractmethod
+    def _read(self, digest: str) -> bytes:
+        """Return the data stored under a digest."""
+
+    def put(self, data: bytes) -> str:
+        """Store `data` and return its reference."""
+        digest = hashlib.sha256(data).hexdigest()
+        self._write(digest, data)
+        return BLOB_REF_PREFIX + digest
+
+    def get(self, ref: str) -> bytes:
+        """Return the content behind a reference."""
+        return self._read(ref[len(BLOB_REF_PREFIX) :])
+
+
+class FilesystemBlobStore(BlobStore):
+    """Blob store in a local or shared directory, two hex digits per subdirectory."""
+
+    def __init__(self, root: str):
+        """Store blobs under `root`, creating the directory if needed."""
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest[2:]
+
+    def _write(self, digest: str, data: bytes) -> None:
+        path = self._path(digest)
+        if path.exists():
+            return
+        path.parent.mkdir(exist_ok=True)
+        # Write to a temporary file first so readers never see a partial blob
+        fd, tmp = tempfile.mkstemp(dir=path.parent)
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def _read(self, digest: str) -> bytes:
+        return self._path(digest).read_bytes()
+
+
+class PostgresBlobStore(BlobStore):
+    """Blob store in a Postgres table, e.g. the database langgraph-api already uses."""
+
+    def __init__(self, uri: str):
+        """Connect to the database at `uri` and create the blob table if needed."""
+        import psycopg_pool
+
+        self._pool = psycopg_pool.ConnectionPool(uri, min_size=1, open=True)
+        with self._pool.connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS agent_blobs ("
+                " digest TEXT PRIMARY KEY, data BYTEA NOT NULL)"
+            )
+
+    def _write(self, digest: str, data: bytes) -> None:
+        with self._pool.connection() as conn:
+            conn.execute(
+                "INSERT INTO agent_blobs (digest, data) VALUES (%s, %s)"
+                " ON CONFLICT (digest) DO NOTHING",
+                (digest, data),
+            )
+
+    def _read(self, digest: str) -> bytes:
+        with self._pool.connection() as conn:
+            row = conn.execute(
+                "SELECT data FROM agent_blobs WHERE digest = %s", (digest,)
+            ).fetchone()
+        if row is None:
+            raise KeyError(digest)
+        return bytes(row[0])
+
+
+_lock = threading.Lock()
+_store: Optional[BlobStore] = None
+_store_uri: Optional[str] = None
+# Blobs are immutable, so recently loaded ones can be kept without invalidation
+_recent: OrderedDict[str, str] = OrderedDict()
+_RECENT_SIZE = 256
+
+
+def get_blob_store() -> Optional[BlobStore]:
+    """Return the blob store configured by `BLOB_STORE_URI`, if any.
+
+    `file:///path/to/dir` selects the filesystem backend and `postgres://...` or
+    `postgresql://...` the Postgres backend. When unset, values stay inline.
+    """
+    global _store, _store_uri
+    uri = os.getenv("BLOB_STORE_URI") or None
+    if uri != _store_uri:
+        with _lock:
+            if uri != _store_uri:
+                if uri is None:
+                    _store = None
+                elif uri.startswith(("postgres://", "postgresql://")):
+                    _store = PostgresBlobStore(uri)
+                else:
+                    _store = FilesystemBlobStore(urlparse(uri).path or uri)
+                _store_uri = uri
+    return _store
+
+
+def offload_text(text: str) -> str:
+    """Replace a large text with a blob reference when a blob store is configured."""
+    store = get_blob_store()
+    data = text.encode("utf-8")
+    if store is None or len(data) < int(os.getenv("BLOB_OFFLOAD_MIN_BYTES", 1024)):
+        return text
+    ref = store.put(data)
+    _remember(ref, text)
+    return ref
+
+
+def load_text(value: str) -> str:
+    """Return the text behind a state value, loading it if it was offloaded."""
+    if not is_blob_ref(value):
+        return value
+    with _lock:
+        text = _recent.get(value)
+    if text is None:
+        store = get_blob_store()
+        if store is None:
+            raise RuntimeError(
+                f"State references blob {value} but BLOB_STORE_URI is not set"
+            )
+        text = store.get(value).decode("utf-8")
+        _remember(value, text)
+    return text
+
+
+def _remember(ref: str, text: str) -> None:
+    with _lock:
+        _recent[ref] = text
+        _recent.move_to_end(ref)
+        while len(_recent) > _RECENT_SIZE:
+            _recent.popitem(last=False)
+
+
+async def aoffload_text(text: str) -> str:
+    """Async variant of `offload_text` that keeps blob I/O off the event loop."""
+    if get_blob_store() is None:
+        return text
+    return await asyncio.to_thread(offload_text, text)
+
+
+async def aload_texts(values: List[str]) -> List[str]:
+    """Load a list of possibly offloaded texts without blocking the event loop."""
+    if not any(is_blob_ref(value) for value in values):
+        return list(values)
+    return await asyncio.to_thread(lambda: [load_text(value) for value in values])
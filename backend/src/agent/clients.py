@@ -0,0 +1,143 @@
+import os
+import threading
+from typing import TYPE_CHECKING, Optional, Type
+
+from langchain_core.runnables import Runnable, RunnableSequence
+from pydantic import BaseModel
+
+from agent.configuration import Configuration
+from agent.fake_backend import (
+    FakeChatModel,
+    FakeGenaiClient,
+    FakeProfile,
+    fake_backend_enabled,
+)
+from agent.tools_and_schemas import Reflection, SearchQueryList
+
+if TYPE_CHECKING:
+    from google.genai import Client
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
+# Clients are expensive to build (HTTP channel, auth, schema conversion) and safe to
+# share, so every node draws from these process-wide maps instead of constructing
+# its own. The Gemini SDKs take a large share of the package's import time, so
+# they are only imported once the first client is built.
+_lock = threading.Lock()
+_genai_client: Optional["Client"] = None
+_chat_models: dict[tuple[str, float, int], "ChatGoogleGenerativeAI"] = {}
+_structured_models: dict[tuple[str, float, int, Type[BaseModel]], Runnable] = {}
+
+
+def require_api_key() -> str:
+    """Return the Gemini API key, raising ValueError if it is not configured."""
+    api_key = os.getenv("GEMINI_API_KEY")
+    if api_key is None:
+        raise ValueError("GEMINI_API_KEY is not set")
+    return api_key
+
+
+def credentials_ready() -> bool:
+    """Return whether the graph's clients can be built, for readiness checks."""
+    return fake_backend_enabled() or os.getenv("GEMINI_API_KEY") is not None
+
+
+def get_genai_client() -> "Client":
+    """Return the shared google-genai client used for grounded search calls.
+
+    With `GEMINI_BACKEND=fake` this is the offline stand-in from `agent.fake_backend`.
+    """
+    global _genai_client
+    if _genai_client is None:
+        with _lock:
+            if _genai_client is None:
+                if fake_backend_enabled():
+                    _genai_client = FakeGenaiClient()
+                else:
+                    from google.genai import Client
+
+                    _genai_client = Client(api_key=require_api_key())
+    return _genai_client
+
+
+def get_chat_model(
+    model: str, temperature: float = 0, max_retries: int = 2
+) -> "ChatGoogleGenerativeAI":
+    """Return a pooled chat model for the given model name and sampling settings.
+
+    With `GEMINI_BACKEND=fake` this is the offline stand-in from `agent.fake_backend`.
+    A call continues a context cache by passing `cached_content` with the call, so
+    cache names, which change with every cached text, never enter the pool.
+    """
+    key = (model, float(temperature), max_retries)
+    llm = _chat_models.get(key)
+    if llm is None:
+        with _lock:
+            llm = _chat_models.get(key)
+            if llm is None:
+                if fake_backend_enabled():
+                    llm = FakeChatModel(
+                        model=model,
+                        temperature=temperature,
+                        max_retries=max_retries,
+                        profile=FakeProfile.from_env(),
+                    )
+                else:
+                    from langchain_google_genai import ChatGoogleGenerativeAI
+
+                    llm = ChatGoogleGenerativeAI(
+                        model=model,
+                        temperature=temperature,
+                        max_retries=max_retries,
+                        api_key=require_api_key(),
+                    )
+                _chat_models[key] = llm
+    return llm
+
+
+def get_structured_model(
+    model: str,
+    schema: Type[BaseModel],
+    temperature: float = 0,
+    max_retries: int = 2,
+    cached_content: Optional[str] = None,
+) -> Runnable:
+    """Return a pooled structured-output runnable bound to `schema`.
+
+    The runnable wraps the pooled chat model for the same settings, so structured and
+    plain calls to one model share a connection pool. With `cached_content` the
+    pooled runnable is returned with the cache name bound to its model call; the
+    binding is not pooled.
+    """
+    key = (model, float(temperature), max_retries, schema)
+    runnable = _structured_models.get(key)
+    if runnable is None:
+        llm = get_chat_model(model, temperature, max_retries)
+        with _lock:
+            runnable = _structured_models.get(key)
+            if runnable is None:
+                runnable = llm.with_structured_output(schema)
+                _structured_models[key] = runnable
+    if cached_content is not None:
+        # Structured output is the bound model call piped into an output parser
+        runnable = RunnableSequence(
+            runnable.first.bind(cached_content=cached_content),
+            *runnable.middle,
+            runnable.last,
+        )
+    return runnable
+
+
+def warm_up(configurable: Optional[Configuration] = None) -> None:
+    """Build the clients the graph nodes use so the first run does not pay for it.
+
+    Args:
+        configurable: Configuration whose model names are warmed. Defaults to the
+            configuration resolved from the environment.
+    """
+    configurable = configurable or Configuration.from_runnable_config()
+    get_genai_client()
+    get_structured_model(
+        configurable.query_generator_model, SearchQueryList, temperature=1.0
+    )
+    get_structured_model(configurable.reflection_model, Reflection, temperature=1.0)
+    get_chat_model(configurable.answer_model, temperature=0)
@@ -0,0 +1,77 @@
+import asyncio
+import os
+import time
+import weakref
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from agent.instrumentation import record_queue_wait
+from agent.metrics import SEARCH_QUEUE_WAIT_SECONDS
+
+# asyncio primitives are bound to the loop that first waits on them, so the global
+# semaphore is kept per event loop.
+_global_semaphores: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, asyncio.Semaphore
+] = weakref.WeakKeyDictionary()
+# Per-run semaphores with the number of branches currently using each of them, so a
+# run's entry can be dropped as soon as its last branch leaves.
+_run_semaphores: dict[str, tuple[asyncio.Semaphore, int]] = {}
+
+
+def _global_semaphore() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    semaphore = _global_semaphores.get(loop)
+    if semaphore is None:
+        limit = int(os.getenv("MAX_GLOBAL_CONCURRENT_SEARCHES", 32))
+        semaphore = _global_semaphores[loop] = asyncio.Semaphore(limit)
+    return semaphore
+
+
+def _enter_run(run_key: str, limit: int) -> asyncio.Semaphore:
+    semaphore, users = _run_semaphores.get(run_key, (None, 0))
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(limit)
+    _run_semaphores[run_key] = (semaphore, users + 1)
+    return semaphore
+
+
+def _leave_run(run_key: str) -> None:
+    semaphore, users = _run_semaphores[run_key]
+    if users <= 1:
+        del _run_semaphores[run_key]
+    else:
+        _run_semaphores[run_key] = (semaphore, users - 1)
+
+
+@asynccontextmanager
+async def search_slot(run_key: str, per_run_limit: int) -> AsyncIterator[float]:
+    """Hold one outbound search slot for the duration of the block.
+
+    A branch first waits for a slot of its own run, then for one of the process-wide
+    slots, so a run never holds more global slots than it is allowed to use.
+
+    Args:
+        run_key: Identifier of the run the branch belongs to.
+        per_run_limit: Maximum concurrent searches of that run; 0 means unlimited.
+
+    Yields:
+        The number of seconds spent waiting for the slot.
+    """
+    start = time.perf_counter()
+    if per_run_limit <= 0:
+        async with _global_semaphore():
+            wait = time.perf_counter() - start
+            SEARCH_QUEUE_WAIT_SECONDS.observe(wait)
+            record_queue_wait("concurrency", wait)
+            yield wait
+        return
+
+    run_semaphore = _enter_run(run_key, per_run_limit)
+    try:
+        async with run_semaphore, _global_semaphore():
+            wait = time.perf_counter() - start
+            SEARCH_QUEUE_WAIT_SECONDS.observe(wait)
+            record_queue_wait("concurrency", wait)
+            yield wait
+    finally:
+        _leave_run(run_key)
@@ -39,6 +39,111 @@ class Configuration(BaseModel):
         metadata={"description": "The maximum number of research loops to perform."},
     )
 
+    max_concurrent_searches: int = Field(
+        default=5,
+        metadata={
+            "description": "The maximum number of web research branches of one run that may call Gemini at the same time. 0 means unlimited."
+        },
+    )
+
+    query_similarity_threshold: float = Field(
+        default=0.8,
+        metadata={
+            "description": "Similarity at or above which a search query is skipped as a duplicate of an earlier one."
+        },
+    )
+
+    query_dedup_use_vectors: bool = Field(
+        default=False,
+        metadata={
+            "description": "Whether query deduplication also compares hashed character-trigram vectors."
+        },
+    )
+
+    reflection_digest_tokens: int = Field(
+        default=2000,
+        metadata={
+            "description": "Token budget for the running digest of earlier summaries that reflection sees."
+        },
+    )
+
+    answer_context_tokens: int = Field(
+        default=16000,
+        metadata={
+            "description": "Token budget for the summaries packed into the final answer prompt."
+        },
+    )
+
+    search_hedge_percentile: float = Field(
+        default=0,
+        metadata={
+            "description": "Latency percentile of recent grounded searches after which a duplicate request is raced against a slow one. 0 disables hedging."
+        },
+    )
+
+    search_hedge_max_rate: float = Field(
+        default=0.1,
+        metadata={
+            "description": "Largest share of grounded searches that may be hedged."
+        },
+    )
+
+    reflection_fast_model: str = Field(
+        default="",
+        metadata={
+            "description": "Cheaper model tried first for reflection. Its verdict is kept unless it fails validation, is not confident enough or asks for more research after a loop that found no new sources; the reflection model then decides. Empty always uses the reflection model."
+        },
+    )
+
+    reflection_min_confidence: float = Field(
+        default=0.7,
+        metadata={
+            "description": "Lowest confidence, from 0 to 1, at which a verdict of reflection_fast_model is kept."
+        },
+    )
+
+    reflection_quorum: float = Field(
+        default=1.0,
+        metadata={
+            "description": "Share of a loop's searches that must finish before reflection starts. Later results are merged into the next reflection or the answer. 1 waits for every search."
+        },
+    )
+
+    speculative_answer: bool = Field(
+        default=False,
+        metadata={
+            "description": "Draft the final answer from the summaries gathered so far while the last research loop searches, and keep the draft if the new results add little."
+        },
+    )
+
+    speculative_answer_max_novelty: float = Field(
+        default=0.2,
+        metadata={
+            "description": "Largest share of the answer's material, in content words of all summaries, that may be new to a speculative draft for the draft to be kept."
+        },
+    )
+
+    prompt_cache_ttl_seconds: int = Field(
+        default=0,
+        metadata={
+            "description": "TTL of the explicit Gemini context caches holding the static prompt prefixes. Prefixes below the model's minimum for explicit caching, 1024 tokens on Gemini 2.5 Flash and 2048 on 2.5 Pro, are sent inline; the shipped prefixes are shorter than that. 0 sends prompts without explicit caching."
+        },
+    )
+
+    summaries_cache_ttl_seconds: int = Field(
+        default=0,
+        metadata={
+            "description": "TTL of the context cache holding the summaries that the last reflection and the final answer share. Only used when both run on the same model. 0 sends the summaries inline."
+        },
+    )
+
+    deadline_seconds: float = Field(
+        default=0,
+        metadata={
+            "description": "Wall-clock budget of a run in seconds. Research stops early when another loop would not fit. 0 means unbounded."
+        },
+    )
+
     @classmethod
     def from_runnable_config(
         cls, config: Optional[RunnableConfig] = None
@@ -0,0 +1,154 @@
+import hashlib
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from agent.clients import get_genai_client
+from agent.metrics import CONTEXT_CACHE_OPERATIONS, CONTEXT_CACHE_TOKENS
+from agent.utils import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+# Smallest context Gemini accepts for an explicit cache, by model name prefix
+MIN_CACHE_TOKENS = {
+    "gemini-2.5-flash": 1024,
+    "gemini-2.5-pro": 2048,
+}
+DEFAULT_MIN_CACHE_TOKENS = 4096
+# A cache is extended once less than this share of its TTL is left
+REFRESH_FRACTION = 0.25
+
+
+def min_cache_tokens(model: str) -> int:
+    """Return the smallest context, in tokens, that `model` can cache explicitly."""
+    for prefix, tokens in MIN_CACHE_TOKENS.items():
+        if model.startswith(prefix):
+            return tokens
+    return DEFAULT_MIN_CACHE_TOKENS
+
+
+@dataclass
+class _CacheHandle:
+    # None when creating the cache failed; the text is then sent inline until expiry
+    name: Optional[str]
+    expires_at: float
+
+
+class ContextCacheManager:
+    """Explicit Gemini context caches for static prompt text, one per model and text.
+
+    A cache is created on first use with the given TTL, reused by every later call,
+    extended when it is close to expiring and recreated once it has expired. Texts
+    below the model's minimum are never cached. While a cache is being created,
+    concurrent callers send the text inline rather than waiting.
+    """
+
+    def __init__(self, ttl_seconds: int):
+        """Create a manager whose caches live for `ttl_seconds`."""
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._handles: dict[tuple[str, str], _CacheHandle] = {}
+        self._pending: set[tuple[str, str]] = set()
+
+    async def aget(self, model: str, text: str, create: bool = True) -> Optional[str]:
+        """Return the name of a live cache holding `text` for `model`, if it has one.
+
+        Args:
+            model: The model the cache is used with.
+            text: The static text to cache.
+            create: Create or extend the cache as needed. Otherwise only an
+                existing live cache is returned.
+        """
+        if estimate_tokens(text) < min_cache_tokens(model):
+            return None
+        key = (model, hashlib.sha256(text.encode("utf-8")).hexdigest())
+        now = time.time()
+        with self._lock:
+            handle = self._handles.get(key)
+            fresh = handle is not None and (
+                handle.expires_at - now > REFRESH_FRACTION * self.ttl_seconds
+            )
+            if fresh or key in self._pending or not create:
+                return handle.name if handle and handle.expires_at > now else None
+            self._pending.add(key)
+            # Texts that change between runs, like summaries, leave a handle each
+            self._purge_expired(now)
+        try:
+            if handle is not None and handle.name and handle.expires_at > now:
+                handle = await self._refresh(handle)
+            else:
+                handle = await self._create(model, text)
+            with self._lock:
+                self._handles[key] = handle
+        finally:
+            with self._lock:
+                self._pending.discard(key)
+        return handle.name
+
+    def _purge_expired(self, now: float) -> None:
+        for key, handle in list(self._handles.items()):
+            if handle.expires_at <= now and key not in self._pending:
+                del self._handles[key]
+
+    async def _create(self, model: str, text: str) -> _CacheHandle:
+        try:
+            cache = await get_genai_client().aio.caches.create(
+                model=model,
+                config={"contents": [text], "ttl": f"{self.ttl_seconds}s"},
+            )
+        except Exception as exc:
+            logger.warning("Could not create a context cache for %s: %r", model, exc)
+            CONTEXT_CACHE_OPERATIONS.labels("failed").inc()
+            return _CacheHandle(None, time.time() + self.ttl_seconds)
+        CONTEXT_CACHE_OPERATIONS.labels("created").inc()
+        usage = getattr(cache, "usage_metadata", None)
+        CONTEXT_CACHE_TOKENS.inc(
+            getattr(usage, "total_token_count", None) or estimate_tokens(text)
+        )
+        return _CacheHandle(cache.name, time.time() + self.ttl_seconds)
+
+    async def _refresh(self, handle: _CacheHandle) -> _CacheHandle:
+        try:
+            await get_genai_client().aio.caches.update(
+                name=handle.name, config={"ttl": f"{self.ttl_seconds}s"}
+            )
+        except Exception as exc:
+            # The cache is still live until its old expiry
+            logger.warning("Could not extend context cache %s: %r", handle.name, exc)
+            return handle
+        CONTEXT_CACHE_OPERATIONS.labels("refreshed").inc()
+        return _CacheHandle(handle.name, time.time() + self.ttl_seconds)
+
+
+_lock = threading.Lock()
+_managers: dict[int, ContextCacheManager] = {}
+
+
+def get_context_cache(ttl_seconds: int) -> ContextCacheManager:
+    """Return the process-wide context cache manager for a TTL."""
+    with _lock:
+        manager = _managers.get(ttl_seconds)
+        if manager is None:
+            manager = _managers[ttl_seconds] = ContextCacheManager(ttl_seconds)
+        return manager
+
+
+async def cached_prompt(
+    model: str, prefix: str, suffix: str, ttl_seconds: int
+) -> tuple[str, Optional[str]]:
+    """Split a prompt into the part to send and the context cache holding the rest.
+
+    Only prefixes of at least the model's minimum are cached, which the shipped
+    prompts are not; they only benefit once their static part grows past it.
+
+    Returns:
+        The suffix and the cache name when the prefix is cached, otherwise the
+        whole prompt and None.
+    """
+    if ttl_seconds > 0:
+        cache = await get_context_cache(ttl_seconds).aget(model, prefix)
+        if cache is not None:
+            return suffix, cache
+    return prefix + suffix, None
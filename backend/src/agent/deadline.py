@@ -0,0 +1,73 @@
+import logging
+import time
+from typing import Optional
+
+from agent.hedging import get_latency_tracker
+
+logger = logging.getLogger(__name__)
+
+# Calls still get this much time after the deadline has passed, so a run that is
+# out of budget can always produce its final answer
+MIN_CALL_TIMEOUT_SECONDS = 5.0
+# Latency percentile used to predict how long the next loop and the answer take
+ESTIMATE_PERCENTILE = 90
+
+
+def start_deadline(deadline_seconds: float) -> Optional[float]:
+    """Return the wall-clock time a run started now must finish by, if bounded.
+
+    Wall-clock time is used rather than a monotonic clock because the nodes of one
+    run may execute in different worker processes.
+    """
+    return time.time() + deadline_seconds if deadline_seconds > 0 else None
+
+
+def remaining_seconds(deadline: Optional[float]) -> Optional[float]:
+    """Return the time left until `deadline`, or None for an unbounded run."""
+    return None if deadline is None else deadline - time.time()
+
+
+def call_timeout(deadline: Optional[float], reserve: float = 0.0) -> Optional[float]:
+    """Return the timeout for one Gemini call of a run.
+
+    Args:
+        deadline: The run's deadline, or None for an unbounded run.
+        reserve: Time to leave for the work that must still follow the call.
+    """
+    remaining = remaining_seconds(deadline)
+    if remaining is None:
+        return None
+    return max(remaining - reserve, MIN_CALL_TIMEOUT_SECONDS)
+
+
+def estimated_node_seconds(node: str) -> float:
+    """Predict how long a node takes from its recently observed durations."""
+    estimate = get_latency_tracker(f"node:{node}").percentile(
+        ESTIMATE_PERCENTILE, min_samples=1
+    )
+    return estimate or 0.0
+
+
+def fits_another_loop(deadline: Optional[float]) -> bool:
+    """Return whether one more research loop and the final answer fit the deadline.
+
+    Branch durations include the time spent waiting for a search slot, so the slow
+    end of the web_research durations stands for a whole fan-out. Without any
+    observed durations the loop is assumed to fit.
+    """
+    remaining = remaining_seconds(deadline)
+    if remaining is None:
+        return True
+    needed = (
+        estimated_node_seconds("web_research")
+        + estimated_node_seconds("reflection")
+        + estimated_node_seconds("finalize_answer")
+    )
+    if needed > remaining:
+        logger.info(
+            "Finalizing early: %.1fs left, next loop and answer need about %.1fs",
+            remaining,
+            needed,
+        )
+        return False
+    return True
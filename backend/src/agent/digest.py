@@ -0,0 +1,82 @@
+import re
+from typing import List
+
+from agent.utils import estimate_tokens
+
+_CITATION_LINK_RE = re.compile(r" ?\[[^\]]*\]\(https?://[^)]*\)")
+# A sentence ends at terminal punctuation, plus any citation markers right after it
+_SENTENCE_END_RE = re.compile(r"[.!?](?:\s*\x00\d+\x00)*\s+")
+_PLACEHOLDER_RE = re.compile(r"\x00(\d+)\x00")
+
+
+def strip_citation_links(text: str) -> str:
+    """Remove inline markdown citation links, which reflection does not need."""
+    return _CITATION_LINK_RE.sub("", text)
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split text into sentences without ever breaking a citation link.
+
+    Citation markers are inserted right after the segment they support, so markers
+    that follow a sentence end stay attached to that sentence.
+    """
+    links: List[str] = []
+
+    def protect(match: re.Match) -> str:
+        links.append(match.group(0).strip())
+        return f"\x00{len(links) - 1}\x00"
+
+    protected = _CITATION_LINK_RE.sub(protect, text)
+    sentences, start = [], 0
+    for match in _SENTENCE_END_RE.finditer(protected):
+        sentences.append(protected[start : match.end()])
+        start = match.end()
+    sentences.append(protected[start:])
+    return [
+        _PLACEHOLDER_RE.sub(lambda m: " " + links[int(m.group(1))], sentence).strip()
+        for sentence in sentences
+        if sentence.strip()
+    ]
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Keep the leading sentences of `text` that fit in `max_tokens` tokens.
+
+    If even the first sentence is too long it is cut at a word boundary.
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    kept, used = [], 0
+    for sentence in split_sentences(text):
+        cost = estimate_tokens(sentence)
+        if used + cost > max_tokens:
+            break
+        kept.append(sentence)
+        used += cost
+    if kept:
+        return " ".join(kept)
+    return text[: max_tokens * 4].rsplit(" ", 1)[0]
+
+
+def update_digest(
+    digest: List[str], new_summaries: List[str], max_tokens: int
+) -> List[str]:
+    """Fold new web research summaries into the bounded running digest.
+
+    Every entry gets an equal share of the token budget, so the digest stays within
+    `max_tokens` however many loops have run. Entries only ever get shorter: older
+    findings are condensed to their lead sentences as new ones arrive.
+
+    Args:
+        digest: Condensed entries for the summaries seen in earlier loops.
+        new_summaries: Summaries added to the state since the digest was updated.
+        max_tokens: Token budget for the whole digest.
+
+    Returns:
+        The updated list of digest entries.
+    """
+    entries = digest + [strip_citation_links(s) for s in new_summaries]
+    if not entries:
+        return []
+    share = max(max_tokens // len(entries), 1)
+    return [truncate_to_tokens(entry, share) for entry in entries]
@@ -0,0 +1,567 @@
+import asyncio
+import hashlib
+import math
+import os
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Iterator,
+    List,
+    Optional,
+    Type,
+    get_origin,
+)
+
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForLLMRun,
+    CallbackManagerForLLMRun,
+)
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.output_parsers import PydanticOutputParser
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.runnables import Runnable
+from pydantic import BaseModel, PrivateAttr
+
+from agent.utils import estimate_tokens
+
+if TYPE_CHECKING:
+    from google.genai import types
+
+# Word lists the synthetic queries and summaries are drawn from
+_ASPECTS = [
+    "recent developments",
+    "market size",
+    "regulatory changes",
+    "technical limitations",
+    "adoption rates",
+    "cost breakdown",
+    "expert criticism",
+    "historical background",
+    "performance benchmarks",
+    "regional differences",
+    "environmental impact",
+    "future outlook",
+]
+_QUALIFIERS = [
+    "2024",
+    "2025",
+    "Europe",
+    "United States",
+    "Asia",
+    "startups",
+    "industry",
+]
+_DOMAINS = [
+    "reuters.com",
+    "nature.com",
+    "wikipedia.org",
+    "bloomberg.com",
+    "arxiv.org",
+    "gov.uk",
+    "techcrunch.com",
+    "who.int",
+]
+_FINDINGS = [
+    "grew by {n} percent over the previous year",
+    "was estimated at {n} billion dollars",
+    "was reported by {n} independent sources",
+    "declined for the {n}th consecutive quarter",
+    "was cited in {n} peer-reviewed studies",
+    "affected roughly {n} million people",
+]
+_SHORT_URL_LINK_RE = re.compile(
+    r"\[[^\]]*\]\(https://vertexaisearch\.cloud\.google\.com/id/[\w-]+\)"
+)
+
+
+def fake_backend_enabled() -> bool:
+    """Return whether `GEMINI_BACKEND=fake` selects the offline stand-in."""
+    return os.getenv("GEMINI_BACKEND", "").lower() == "fake"
+
+
+@dataclass(frozen=True)
+class FakeProfile:
+    """Latency and size distributions of the fake Gemini backend.
+
+    Latencies are log-normal around `latency_seconds`; response sizes are normal
+    around their means with `tokens_sigma` as the relative standard deviation.
+    """
+
+    seed: int = 0
+    latency_seconds: float = 0.5
+    latency_sigma: float = 0.25
+    tokens_per_second: float = 0
+    summary_tokens: int = 400
+    answer_tokens: int = 300
+    tokens_sigma: float = 0.3
+    sources_per_search: int = 5
+    follow_up_queries: int = 3
+    sufficient_rate: float = 0.0
+
+    @classmethod
+    def from_env(cls) -> "FakeProfile":
+        """Read the profile from `FAKE_GEMINI_*` environment variables."""
+        values = {}
+        for name, field in cls.__dataclass_fields__.items():
+            raw = os.getenv(f"FAKE_GEMINI_{name.upper()}")
+            if raw is not None:
+                values[name] = field.type(raw)
+        return cls(**values)
+
+    def rng(self, *parts: str) -> random.Random:
+        """Return a generator seeded by the profile seed and the request."""
+        digest = hashlib.sha256("\x00".join((str(self.seed),) + parts).encode())
+        return random.Random(digest.digest())
+
+    def latency(self, rng: random.Random) -> float:
+        """Draw a time to first token."""
+        if self.latency_seconds <= 0:
+            return 0.0
+        return rng.lognormvariate(math.log(self.latency_seconds), self.latency_sigma)
+
+    def tokens(self, rng: random.Random, mean: int) -> int:
+        """Draw a response size in tokens."""
+        return max(1, round(rng.gauss(mean, mean * self.tokens_sigma)))
+
+    def stream_delay(self, text: str) -> float:
+        """Return how long streaming `text` takes at the configured token rate."""
+        if self.tokens_per_second <= 0:
+            return 0.0
+        return estimate_tokens(text) / self.tokens_per_second
+
+
+def _short_topic(topic: str) -> str:
+    # Keep a few content words so queries stay distinct enough to survive dedup
+    words = [word for word in re.findall(r"[\w-]+", topic) if len(word) > 3]
+    return " ".join(words[:4]) or topic
+
+
+def _search_query(rng: random.Random, topic: str) -> str:
+    return f"{rng.choice(_ASPECTS)} {rng.choice(_QUALIFIERS)} {_short_topic(topic)}"
+
+
+def _sentence(rng: random.Random, topic: str) -> str:
+    finding = rng.choice(_FINDINGS).format(n=rng.randint(2, 90))
+    return f"The {rng.choice(_ASPECTS)} of {_short_topic(topic)} {finding}."
+
+
+def _sentences(rng: random.Random, topic: str, tokens: int) -> List[str]:
+    sentences = []
+    while sum(estimate_tokens(s) for s in sentences) < tokens:
+        sentences.append(_sentence(rng, topic))
+    return sentences
+
+
+def _prompt_field(pattern: str, prompt: str, default: str = "") -> str:
+    match = re.search(pattern, prompt, re.MULTILINE)
+    return match.group(1).strip() if match else default
+
+
+def _fake_value(annotation: Any, rng: random.Random, topic: str) -> Any:
+    if annotation is bool:
+        return False
+    if annotation is int:
+        return rng.randint(0, 10)
+    if annotation is float:
+        return round(rng.random(), 2)
+    if get_origin(annotation) in (list, List):
+        return [_sentence(rng, topic) for _ in range(rng.randint(1, 3))]
+    return _sentence(rng, topic)
+
+
+def fake_structured_output(
+    schema: Type[BaseModel], prompt: str, profile: FakeProfile, rng: random.Random
+) -> BaseModel:
+    """Build a schema-valid answer to one of the graph's structured prompts.
+
+    Query lists respect the requested query count and reflections decide they are
+    sufficient at `profile.sufficient_rate`; any other field gets a plausible value
+    of its type, so new schemas work without changes here.
+    """
+    topic = _prompt_field(r"^Context: (.*)$", prompt) or _prompt_field(
+        r'^Research Topic: "(.*)"$', prompt, "the research topic"
+    )
+    values = {}
+    for name, field in schema.model_fields.items():
+        if name == "query":
+            count = int(_prompt_field(r"number of queries: (\d+)", prompt, "3"))
+            values[name] = [_search_query(rng, topic) for _ in range(count)]
+        elif name == "is_sufficient":
+            values[name] = rng.random() < profile.sufficient_rate
+        elif name == "follow_up_queries":
+            values[name] = [
+                _search_query(rng, topic) for _ in range(profile.follow_up_queries)
+            ]
+        else:
+            values[name] = _fake_value(field.annotation, rng, topic)
+    if values.get("is_sufficient"):
+        values["follow_up_queries"] = []
+    return schema(**values)
+
+
+def fake_answer(prompt: str, tokens: int, rng: random.Random) -> str:
+    """Write an answer that cites the short urls found in the summaries."""
+    topic = _prompt_field(r"^User Context:\s*\n- (.*)$", prompt, "the question")
+    links = list(dict.fromkeys(_SHORT_URL_LINK_RE.findall(prompt)))
+    sentences = _sentences(rng, topic, tokens)
+    for index, link in enumerate(links):
+        position = index % len(sentences)
+        sentences[position] = f"{sentences[position][:-1]} {link}."
+    return " ".join(sentences)
+
+
+def _prompt_text(messages: List[BaseMessage]) -> str:
+    return "\n".join(
+        message.content if isinstance(message.content, str) else str(message.content)
+        for message in messages
+    )
+
+
+def _usage(prompt: str, text: str, cached: str = "") -> dict:
+    # As with Gemini, input tokens include the ones served from a context cache
+    cached_tokens = estimate_tokens(cached) if cached else 0
+    input_tokens = estimate_tokens(prompt) + cached_tokens
+    output_tokens = estimate_tokens(text)
+    usage = {
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "total_tokens": input_tokens + output_tokens,
+    }
+    if cached:
+        usage["input_token_details"] = {"cache_read": cached_tokens}
+    return usage
+
+
+_caches_lock = threading.Lock()
+# Context caches of every fake client, by name: (model, contents, expiry time)
+_caches: dict[str, tuple[str, str, float]] = {}
+
+
+def _config_value(config: Any, name: str) -> Any:
+    return config.get(name) if isinstance(config, dict) else getattr(config, name)
+
+
+def _ttl_seconds(config: Any) -> float:
+    return float(str(_config_value(config, "ttl")).rstrip("s"))
+
+
+def fake_cached_contents(name: str, model: str) -> str:
+    """Return the text held by a fake context cache, failing like Gemini if it is gone."""
+    with _caches_lock:
+        cache = _caches.get(name)
+    if cache is None or cache[2] <= time.time():
+        raise ValueError(f"CachedContent not found (or permission denied): {name}")
+    if cache[0] != model:
+        raise ValueError(
+            f"CachedContent {name} was created for {cache[0]}, not {model}"
+        )
+    return cache[1]
+
+
+class FakeChatModel(BaseChatModel):
+    """Offline stand-in for `ChatGoogleGenerativeAI`.
+
+    Answers are deterministic for a given profile seed, model and prompt; latencies
+    come from a separate seeded sequence, so repeating a call takes a different
+    time as it would against the real API. Structured output goes through the usual
+    message-then-parser path, so callbacks, streaming and usage metadata behave as
+    they do with the real model.
+    """
+
+    model: str
+    temperature: float = 0
+    max_retries: int = 2
+    cached_content: Optional[str] = None
+    profile: FakeProfile = FakeProfile()
+    _latency_rng: random.Random = PrivateAttr()
+
+    def model_post_init(self, context: Any) -> None:
+        """Seed the latency sequence for this model."""
+        self._latency_rng = self.profile.rng("latency", self.model)
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-gemini"
+
+    def with_structured_output(
+        self, schema: Type[BaseModel], **kwargs: Any
+    ) -> Runnable:
+        """Bind the schema and parse the JSON reply, as the real model does."""
+        return self.bind(response_schema=schema) | PydanticOutputParser(
+            pydantic_object=schema
+        )
+
+    def _respond(
+        self,
+        messages: List[BaseMessage],
+        response_schema: Optional[Type[BaseModel]],
+        cached_content: Optional[str],
+    ) -> tuple[str, float, dict]:
+        prompt = _prompt_text(messages)
+        # A cache passed with the call overrides the model's own, as with Gemini
+        cached_content = cached_content or self.cached_content
+        cached = (
+            fake_cached_contents(cached_content, self.model) if cached_content else ""
+        )
+        rng = self.profile.rng(self.model, cached + prompt)
+        latency = self.profile.latency(self._latency_rng)
+        if response_schema is not None:
+            result = fake_structured_output(
+                response_schema, cached + prompt, self.profile, rng
+            )
+            text = result.model_dump_json()
+        else:
+            tokens = self.profile.tokens(rng, self.profile.answer_tokens)
+            text = fake_answer(cached + prompt, tokens, rng)
+        return text, latency, _usage(prompt, text, cached)
+
+    def _chunks(self, text: str) -> List[str]:
+        return re.findall(r"\S+\s*", text) or [text]
+
+    def _result(self, text: str, usage: dict) -> ChatResult:
+        message = AIMessage(
+            content=text,
+            usage_metadata=usage,
+            response_metadata={"model_name": self.model},
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _last_chunk(self, usage: dict) -> ChatGenerationChunk:
+        return ChatGenerationChunk(
+            message=AIMessageChunk(
+                content="",
+                usage_metadata=usage,
+                response_metadata={"model_name": self.model},
+            )
+        )
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        response_schema: Optional[Type[BaseModel]] = None,
+        cached_content: Optional[str] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        text, latency, usage = self._respond(messages, response_schema, cached_content)
+        time.sleep(latency + self.profile.stream_delay(text))
+        return self._result(text, usage)
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        response_schema: Optional[Type[BaseModel]] = None,
+        cached_content: Optional[str] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        text, latency, usage = self._respond(messages, response_schema, cached_content)
+        await asyncio.sleep(latency + self.profile.stream_delay(text))
+        return self._result(text, usage)
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        response_schema: Optional[Type[BaseModel]] = None,
+        cached_content: Optional[str] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        text, latency, usage = self._respond(messages, response_schema, cached_content)
+        time.sleep(latency)
+        for piece in self._chunks(text):
+            time.sleep(self.profile.stream_delay(piece))
+            yield ChatGenerationChunk(message=AIMessageChunk(content=piece))
+        yield self._last_chunk(usage)
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        response_schema: Optional[Type[BaseModel]] = None,
+        cached_content: Optional[str] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        text, latency, usage = self._respond(messages, response_schema, cached_content)
+        await asyncio.sleep(latency)
+        for piece in self._chunks(text):
+            await asyncio.sleep(self.profile.stream_delay(piece))
+            yield ChatGenerationChunk(message=AIMessageChunk(content=piece))
+        yield self._last_chunk(usage)
+
+
+def fake_grounded_response(
+    model: str, prompt: str, profile: FakeProfile, rng: random.Random
+) -> "types.GenerateContentResponse":
+    """Build a grounded search response with chunks and byte-offset supports."""
+    from google.genai import types
+
+    topic = _prompt_field(r"^Research Topic:\s*\n(.*)$", prompt, "the research topic")
+    chunks = []
+    for _ in range(profile.sources_per_search):
+        token = f"{rng.getrandbits(128):032x}"
+        chunks.append(
+            types.GroundingChunk(
+                web=types.GroundingChunkWeb(
+                    uri=f"https://vertexaisearch.cloud.google.com/grounding-api-redirect/{token}",
+                    title=rng.choice(_DOMAINS),
+                )
+            )
+        )
+    sentences = _sentences(rng, topic, profile.tokens(rng, profile.summary_tokens))
+    text = " ".join(sentences)
+    supports = []
+    offset = 0
+    for sentence in sentences:
+        end = offset + len(sentence.encode("utf-8"))
+        supports.append(
+            types.GroundingSupport(
+                segment=types.Segment(start_index=offset, end_index=end, text=sentence),
+                grounding_chunk_indices=sorted(
+                    rng.sample(
+                        range(len(chunks)), k=min(len(chunks), rng.randint(1, 2))
+                    )
+                ),
+            )
+        )
+        offset = end + 1
+    prompt_tokens = estimate_tokens(prompt)
+    output_tokens = estimate_tokens(text)
+    return types.GenerateContentResponse(
+        candidates=[
+            types.Candidate(
+                content=types.Content(role="model", parts=[types.Part(text=text)]),
+                grounding_metadata=types.GroundingMetadata(
+                    grounding_chunks=chunks,
+                    grounding_supports=supports if chunks else [],
+                    web_search_queries=[topic],
+                ),
+                finish_reason=types.FinishReason.STOP,
+            )
+        ],
+        usage_metadata=types.GenerateContentResponseUsageMetadata(
+            prompt_token_count=prompt_tokens,
+            candidates_token_count=output_tokens,
+            total_token_count=prompt_tokens + output_tokens,
+        ),
+        model_version=model,
+    )
+
+
+class _FakeModels:
+    def __init__(self, profile: FakeProfile):
+        self.profile = profile
+        self._latency_rng = profile.rng("latency")
+
+    def _respond(self, model: str, contents: Any) -> tuple[Any, float]:
+        prompt = contents if isinstance(contents, str) else str(contents)
+        rng = self.profile.rng(model, prompt)
+        latency = self.profile.latency(self._latency_rng)
+        response = fake_grounded_response(model, prompt, self.profile, rng)
+        return response, latency + self.profile.stream_delay(response.text)
+
+    def generate_content(self, *, model: str, contents: Any, config: Any = None):
+        response, delay = self._respond(model, contents)
+        time.sleep(delay)
+        return response
+
+
+class _FakeAsyncModels(_FakeModels):
+    async def generate_content(self, *, model: str, contents: Any, config: Any = None):
+        response, delay = self._respond(model, contents)
+        await asyncio.sleep(delay)
+        return response
+
+
+class _FakeCaches:
+    """Context caches that expire after their TTL, shared with `FakeChatModel`."""
+
+    def create(self, *, model: str, config: Any):
+        from agent.context_cache import min_cache_tokens
+
+        contents = "".join(str(part) for part in _config_value(config, "contents"))
+        # Gemini rejects explicit caches smaller than the model's minimum
+        if estimate_tokens(contents) < min_cache_tokens(model):
+            raise ValueError(
+                f"Cached content is too small. total_token_count="
+                f"{estimate_tokens(contents)}, "
+                f"min_total_token_count={min_cache_tokens(model)}"
+            )
+        name = f"cachedContents/{random.getrandbits(128):032x}"
+        expires_at = time.time() + _ttl_seconds(config)
+        with _caches_lock:
+            _caches[name] = (model, contents, expires_at)
+        return self._describe(name)
+
+    def update(self, *, name: str, config: Any):
+        with _caches_lock:
+            model, contents, expires_at = _caches[name]
+            if expires_at <= time.time():
+                raise ValueError(f"CachedContent not found: {name}")
+            _caches[name] = (model, contents, time.time() + _ttl_seconds(config))
+        return self._describe(name)
+
+    def get(self, *, name: str):
+        return self._describe(name)
+
+    def delete(self, *, name: str) -> None:
+        with _caches_lock:
+            _caches.pop(name, None)
+
+    def _describe(self, name: str) -> "types.CachedContent":
+        from google.genai import types
+
+        with _caches_lock:
+            model, contents, expires_at = _caches[name]
+        return types.CachedContent(
+            name=name,
+            model=model,
+            expire_time=datetime.fromtimestamp(expires_at, UTC),
+            usage_metadata=types.CachedContentUsageMetadata(
+                total_token_count=estimate_tokens(contents)
+            ),
+        )
+
+
+class _FakeAsyncCaches(_FakeCaches):
+    async def create(self, *, model: str, config: Any):
+        return super().create(model=model, config=config)
+
+    async def update(self, *, name: str, config: Any):
+        return super().update(name=name, config=config)
+
+    async def get(self, *, name: str):
+        return super().get(name=name)
+
+    async def delete(self, *, name: str) -> None:
+        super().delete(name=name)
+
+
+class FakeGenaiClient:
+    """Offline stand-in for `google.genai.Client` serving grounded search calls.
+
+    It also manages context caches, which `FakeChatModel` reads when given
+    `cached_content`, counting their tokens as cached input.
+    """
+
+    def __init__(self, profile: Optional[FakeProfile] = None):
+        """Build the fake model and cache services from `profile` or the env."""
+        profile = profile or FakeProfile.from_env()
+        self.models = _FakeModels(profile)
+        self.caches = _FakeCaches()
+        self.aio = SimpleNamespace(
+            models=_FakeAsyncModels(profile), caches=_FakeAsyncCaches()
+        )
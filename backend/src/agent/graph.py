@@ -1,13 +1,17 @@
-import os
+import asyncio
+import logging
+import uuid
+from typing import Optional
 
 from agent.tools_and_schemas import SearchQueryList, Reflection
 from dotenv import load_dotenv
+from langchain_core.exceptions import OutputParserException
 from langchain_core.messages import AIMessage
 from langgraph.types import Send
 from langgraph.graph import StateGraph
 from langgraph.graph import START, END
 from langchain_core.runnables import RunnableConfig
-from google.genai import Client
+from pydantic import ValidationError
 
 from agent.state import (
     OverallState,
@@ -15,33 +19,63 @@ from agent.state import (
     ReflectionState,
     WebSearchState,
 )
+from agent.answer_context import assemble_context, unseen_content_share
+from agent.blob_store import aload_texts, aoffload_text, is_blob_ref
+from agent.clients import get_chat_model, get_genai_client, get_structured_model
+from agent.concurrency import search_slot
+from agent.context_cache import cached_prompt, get_context_cache, min_cache_tokens
 from agent.configuration import Configuration
+from agent.deadline import (
+    call_timeout,
+    estimated_node_seconds,
+    fits_another_loop,
+    start_deadline,
+)
+from agent.digest import strip_citation_links, update_digest
+from agent.hedging import get_latency_tracker, hedged_call
+from agent.instrumentation import instrumented_node, record_fanout, record_tokens
+from agent.metrics import REFLECTION_CASCADE, RESEARCH_LOOPS, SPECULATIVE_ANSWERS
+from agent.query_dedup import dedupe_queries
+from agent.rate_limit import get_rate_limiter
+from agent.search_cache import get_search_cache
+from agent.sources import SourceTable, add_sources, source_url_count, unique_sources
+from agent.tracing import traced, traced_gemini_call, traced_node
+from agent.streaming import ShortUrlRewritingChatModel, message_text
+from agent.run_context import RunContext, get_run_context
+from agent.quorum import collect_late_results, gather_quorum, quorum_size
+from agent.reflection_cascade import escalation_reason
 from agent.prompts import (
-    get_current_date,
-    query_writer_instructions,
+    answer_prefix,
+    answer_suffix,
+    answer_topic_suffix,
+    query_writer_prefix,
+    query_writer_suffix,
+    reflection_prefix,
+    reflection_suffix,
+    reflection_topic_suffix,
+    summaries_context,
     web_searcher_instructions,
-    reflection_instructions,
-    answer_instructions,
 )
-from langchain_google_genai import ChatGoogleGenerativeAI
 from agent.utils import (
+    ShortUrlRewriter,
+    estimate_tokens,
     get_citations,
-    get_research_topic,
+    get_run_key,
     insert_citation_markers,
     resolve_urls,
 )
 
-load_dotenv()
-
-if os.getenv("GEMINI_API_KEY") is None:
-    raise ValueError("GEMINI_API_KEY is not set")
+logger = logging.getLogger(__name__)
 
-# Used for Google Search API
-genai_client = Client(api_key=os.getenv("GEMINI_API_KEY"))
+load_dotenv()
 
 
 # Nodes
-def generate_query(state: OverallState, config: RunnableConfig) -> QueryGenerationState:
+@instrumented_node
+@traced_node(entry=True)
+async def generate_query(
+    state: OverallState, config: RunnableConfig
+) -> QueryGenerationState:
     """LangGraph node that generates a search queries based on the User's question.
 
     Uses Gemini 2.0 Flash to create an optimized search query for web research based on
@@ -54,48 +88,123 @@ def generate_query(state: OverallState, config: RunnableConfig) -> QueryGenerati
     Returns:
         Dictionary with state update, including search_query key containing the generated query
     """
-    configurable = Configuration.from_runnable_config(config)
+    # Every turn of a thread resolves its context afresh
+    turn_id = uuid.uuid4().hex
+    context = get_run_context({**state, "turn_id": turn_id}, config)
+    configurable = context.configurable
+    deadline = start_deadline(configurable.deadline_seconds)
 
     # check for custom initial search query count
     if state.get("initial_search_query_count") is None:
         state["initial_search_query_count"] = configurable.number_of_initial_queries
 
+    # Format the prompt
+    formatted_suffix = query_writer_suffix.format(
+        current_date=context.current_date,
+        research_topic=context.research_topic,
+        number_queries=state["initial_search_query_count"],
+    )
+    formatted_prompt, cache = await cached_prompt(
+        configurable.query_generator_model,
+        query_writer_prefix,
+        formatted_suffix,
+        configurable.prompt_cache_ttl_seconds,
+    )
+
     # init Gemini 2.0 Flash
-    llm = ChatGoogleGenerativeAI(
-        model=configurable.query_generator_model,
+    structured_llm = get_structured_model(
+        configurable.query_generator_model,
+        SearchQueryList,
         temperature=1.0,
-        max_retries=2,
-        api_key=os.getenv("GEMINI_API_KEY"),
+        cached_content=cache,
     )
-    structured_llm = llm.with_structured_output(SearchQueryList)
 
-    # Format the prompt
-    current_date = get_current_date()
-    formatted_prompt = query_writer_instructions.format(
-        current_date=current_date,
-        research_topic=get_research_topic(state["messages"]),
-        number_queries=state["initial_search_query_count"],
-    )
     # Generate the search queries
-    result = structured_llm.invoke(formatted_prompt)
-    return {"query_list": result.query}
+    await get_rate_limiter(configurable.query_generator_model).acquire(
+        estimate_tokens(query_writer_prefix + formatted_suffix)
+    )
+    try:
+        with traced_gemini_call(configurable.query_generator_model, "generate_queries"):
+            async with asyncio.timeout(
+                call_timeout(
+                    deadline, reserve=estimated_node_seconds("finalize_answer")
+                )
+            ):
+                result = await structured_llm.ainvoke(formatted_prompt)
+        query_list = result.query
+    except TimeoutError:
+        # Out of time for query generation; search for the question itself
+        logger.warning("Query generation ran out of the run's time budget")
+        query_list = [context.research_topic]
+    return {
+        "query_list": query_list,
+        "deadline": deadline,
+        "turn_id": turn_id,
+    }
 
 
-def continue_to_web_research(state: QueryGenerationState):
+def web_research_sends(
+    state: QueryGenerationState | ReflectionState,
+    config: RunnableConfig,
+    queries: list[str],
+    first_id: int,
+    source: str,
+) -> list[Send]:
+    """Build the `Send` fan-out of one research loop.
+
+    By default every query gets its own web_research branch. With a reflection
+    quorum below 1 all queries go to a single branch that returns as soon as the
+    quorum of searches has finished, leaving the stragglers to be merged later.
+    """
+    configurable = get_run_context(state, config).configurable
+    record_fanout(source, len(queries))
+    shared = {
+        "trace_context": state.get("trace_context"),
+        "deadline": state.get("deadline"),
+        "turn_id": state.get("turn_id"),
+    }
+    if configurable.reflection_quorum < 1 and len(queries) > 1:
+        return [
+            Send(
+                "web_research",
+                {"search_queries": queries, "id": first_id, **shared},
+            )
+        ]
+    return [
+        Send(
+            "web_research",
+            {"search_query": search_query, "id": first_id + idx, **shared},
+        )
+        for idx, search_query in enumerate(queries)
+    ]
+
+
+def continue_to_web_research(state: QueryGenerationState, config: RunnableConfig):
     """LangGraph node that sends the search queries to the web research node.
 
     This is used to spawn n number of web research nodes, one for each search query.
+    Near-duplicate queries are dropped first so each one costs only one search.
     """
-    return [
-        Send("web_research", {"search_query": search_query, "id": int(idx)})
-        for idx, search_query in enumerate(state["query_list"])
-    ]
+    configurable = get_run_context(state, config).configurable
+    query_list = dedupe_queries(
+        state["query_list"],
+        threshold=configurable.query_similarity_threshold,
+        use_vectors=configurable.query_dedup_use_vectors,
+    )
+    return web_research_sends(state, config, query_list, 0, "generate_query")
 
 
-def web_research(state: WebSearchState, config: RunnableConfig) -> OverallState:
+@instrumented_node
+@traced_node
+async def web_research(state: WebSearchState, config: RunnableConfig) -> OverallState:
     """LangGraph node that performs web research using the native Google Search API tool.
 
     Executes a web search using the native Google Search API tool in combination with Gemini 2.0 Flash.
+    The request goes through the async client so parallel `Send` branches share the
+    event loop instead of each holding a worker thread.
+
+    In quorum mode the branch receives all of a loop's queries, searches them
+    concurrently and returns once `reflection_quorum` of them have finished.
 
     Args:
         state: Current graph state containing the search query and research loop count
@@ -104,39 +213,135 @@ def web_research(state: WebSearchState, config: RunnableConfig) -> OverallState:
     Returns:
         Dictionary with state update, including sources_gathered, research_loop_count, and web_research_results
     """
+    context = get_run_context(state, config)
+    if state.get("search_queries"):
+        queries = state["search_queries"]
+        update = await gather_quorum(
+            [
+                research_query(
+                    query, state["id"] + idx, state.get("deadline"), context, config
+                )
+                for idx, query in enumerate(queries)
+            ],
+            quorum_size(len(queries), context.configurable.reflection_quorum),
+            state["turn_id"],
+        )
+        # Searches still running keep their ids, so they count as used already
+        return {**update, "next_search_id": len(queries)}
+    update = await research_query(
+        state["search_query"], state["id"], state.get("deadline"), context, config
+    )
+    return {**update, "next_search_id": 1}
+
+
+async def research_query(
+    search_query: str,
+    id: int,
+    deadline: Optional[float],
+    context: RunContext,
+    config: RunnableConfig,
+) -> OverallState:
+    """Search the web for one query and return its cited summary as a state update."""
     # Configure
-    configurable = Configuration.from_runnable_config(config)
+    configurable = context.configurable
+    current_date = context.current_date
     formatted_prompt = web_searcher_instructions.format(
-        current_date=get_current_date(),
-        research_topic=state["search_query"],
+        current_date=current_date,
+        research_topic=search_query,
     )
 
-    # Uses the google genai client as the langchain client doesn't return grounding metadata
-    response = genai_client.models.generate_content(
-        model=configurable.query_generator_model,
-        contents=formatted_prompt,
-        config={
-            "tools": [{"google_search": {}}],
-            "temperature": 0,
-        },
+    # Identical searches on the same day reuse the cached grounded response
+    search_cache = get_search_cache()
+    response = await search_cache.aget(
+        search_query, configurable.query_generator_model, current_date
     )
-    # resolve the urls to short urls for saving tokens and time
-    resolved_urls = resolve_urls(
-        response.candidates[0].grounding_metadata.grounding_chunks, state["id"]
+    # Leave enough of the run's budget for reflecting on the results and answering
+    timeout = call_timeout(
+        deadline,
+        reserve=estimated_node_seconds("reflection")
+        + estimated_node_seconds("finalize_answer"),
     )
+    if response is None:
+        rate_limiter = get_rate_limiter(configurable.query_generator_model)
+
+        async def search(hedge: bool):
+            # A hedge is billed like any other request, so it takes budget as well
+            if hedge:
+                await rate_limiter.acquire(estimate_tokens(formatted_prompt))
+            # Uses the google genai client as the langchain client doesn't return grounding metadata
+            with traced_gemini_call(configurable.query_generator_model, "search"):
+                return await get_genai_client().aio.models.generate_content(
+                    model=configurable.query_generator_model,
+                    contents=formatted_prompt,
+                    config={
+                        "tools": [{"google_search": {}}],
+                        "temperature": 0,
+                    },
+                )
+
+        try:
+            async with (
+                asyncio.timeout(timeout),
+                search_slot(get_run_key(config), configurable.max_concurrent_searches),
+            ):
+                await rate_limiter.acquire(estimate_tokens(formatted_prompt))
+                if configurable.search_hedge_percentile > 0:
+                    # Race a duplicate request against searches in the latency tail
+                    response = await hedged_call(
+                        search,
+                        get_latency_tracker(configurable.query_generator_model),
+                        configurable.search_hedge_percentile,
+                        configurable.search_hedge_max_rate,
+                    )
+                else:
+                    response = await search(hedge=False)
+        except TimeoutError:
+            # The run is out of time; answer without this branch
+            logger.warning("Search %r ran out of the run's time budget", search_query)
+            return {
+                "sources_gathered": [],
+                "search_query": [search_query],
+                "web_research_result": [],
+            }
+        usage = getattr(response, "usage_metadata", None)
+        if usage is not None:
+            record_tokens(
+                configurable.query_generator_model,
+                usage.prompt_token_count,
+                usage.candidates_token_count,
+            )
+        await search_cache.aput(
+            search_query,
+            configurable.query_generator_model,
+            current_date,
+            response,
+        )
+    # resolve the urls to short urls for saving tokens and time
+    with traced("resolve_urls"):
+        resolved_urls = resolve_urls(
+            response.candidates[0].grounding_metadata.grounding_chunks, id
+        )
     # Gets the citations and adds them to the generated text
-    citations = get_citations(response, resolved_urls)
-    modified_text = insert_citation_markers(response.text, citations)
+    with traced("get_citations"):
+        citations = get_citations(response, resolved_urls)
+    # Gemini reports segment indices as byte offsets into the UTF-8 encoded text
+    with traced("insert_citation_markers", {"agent.citations": len(citations)}):
+        modified_text = insert_citation_markers(
+            response.text, citations, byte_offsets=True
+        )
     sources_gathered = [item for citation in citations for item in citation["segments"]]
 
     return {
         "sources_gathered": sources_gathered,
-        "search_query": [state["search_query"]],
-        "web_research_result": [modified_text],
+        "search_query": [search_query],
+        # Checkpointed as a content hash when a blob store is configured
+        "web_research_result": [await aoffload_text(modified_text)],
     }
 
 
-def reflection(state: OverallState, config: RunnableConfig) -> ReflectionState:
+@instrumented_node
+@traced_node
+async def reflection(state: OverallState, config: RunnableConfig) -> ReflectionState:
     """LangGraph node that identifies knowledge gaps and generates potential follow-up queries.
 
     Analyzes the current summary to identify areas for further research and generates
@@ -150,36 +355,130 @@ def reflection(state: OverallState, config: RunnableConfig) -> ReflectionState:
     Returns:
         Dictionary with state update, including search_query key containing the generated follow-up query
     """
-    configurable = Configuration.from_runnable_config(config)
+    context = get_run_context(state, config)
+    configurable = context.configurable
     # Increment the research loop count and get the reasoning model
     state["research_loop_count"] = state.get("research_loop_count", 0) + 1
-    reasoning_model = state.get("reasoning_model") or configurable.reasoning_model
+    reasoning_model = context.reflection_model
+
+    # Searches the previous quorum did not wait for are merged once they finish
+    late = collect_late_results(state.get("turn_id"))
+    search_queries = state["search_query"] + late.get("search_query", [])
+    results = state["web_research_result"] + late.get("web_research_result", [])
+
+    # Only the summaries added since the last loop are sent in full; earlier ones
+    # are represented by the bounded running digest
+    digest = state.get("research_digest") or []
+    digested = state.get("digested_result_count", 0)
+    new_summaries = [
+        strip_citation_links(summary)
+        for summary in await aload_texts(results[digested:])
+    ]
 
     # Format the prompt
-    current_date = get_current_date()
-    formatted_prompt = reflection_instructions.format(
-        current_date=current_date,
-        research_topic=get_research_topic(state["messages"]),
-        summaries="\n\n---\n\n".join(state["web_research_result"]),
+    formatted_suffix = reflection_suffix.format(
+        research_topic=context.research_topic,
+        summaries="\n\n---\n\n".join(digest + new_summaries),
     )
-    # init Reasoning Model
-    llm = ChatGoogleGenerativeAI(
-        model=reasoning_model,
-        temperature=1.0,
-        max_retries=2,
-        api_key=os.getenv("GEMINI_API_KEY"),
+    last_loop = state["research_loop_count"] >= context.max_research_loops
+    source_count = source_url_count(
+        add_sources(state.get("sources_gathered"), late.get("sources_gathered"))
     )
-    result = llm.with_structured_output(Reflection).invoke(formatted_prompt)
+    try:
+        async with asyncio.timeout(
+            call_timeout(
+                state.get("deadline"),
+                reserve=estimated_node_seconds("finalize_answer"),
+            )
+        ):
+            result = None
+            # Most verdicts are easy; a cheaper model makes them unless it is unsure
+            if context.reflection_fast_model:
+                try:
+                    result = await reflect(
+                        context.reflection_fast_model,
+                        context,
+                        results,
+                        formatted_suffix,
+                        last_loop,
+                    )
+                except (OutputParserException, ValidationError) as exc:
+                    logger.info("Fast reflection returned invalid output: %r", exc)
+                reason = escalation_reason(
+                    result,
+                    source_count - state.get("reflected_source_count", 0),
+                    configurable.reflection_min_confidence,
+                )
+                REFLECTION_CASCADE.labels(reason or "kept").inc()
+                if reason is not None:
+                    result = None
+            if result is None:
+                result = await reflect(
+                    reasoning_model, context, results, formatted_suffix, last_loop
+                )
+    except TimeoutError:
+        # The run is out of time; answer with what was gathered so far
+        logger.warning("Reflection ran out of the run's time budget")
+        result = Reflection(
+            is_sufficient=True, knowledge_gap="", follow_up_queries=[], confidence=0.0
+        )
 
     return {
+        **late,
         "is_sufficient": result.is_sufficient,
         "knowledge_gap": result.knowledge_gap,
         "follow_up_queries": result.follow_up_queries,
         "research_loop_count": state["research_loop_count"],
-        "number_of_ran_queries": len(state["search_query"]),
+        "number_of_ran_queries": len(search_queries),
+        "research_digest": update_digest(
+            digest, new_summaries, configurable.reflection_digest_tokens
+        ),
+        "digested_result_count": len(results),
+        "reflected_source_count": source_count,
     }
 
 
+async def reflect(
+    model: str,
+    context: RunContext,
+    results: list[str],
+    formatted_suffix: str,
+    last_loop: bool,
+) -> Reflection:
+    """Ask `model` whether the summaries in `formatted_suffix` answer the question."""
+    configurable = context.configurable
+    # The answer follows the last loop's reflection; when both use the same model
+    # they read the answer's summaries from one context cache
+    cache = None
+    if (
+        last_loop
+        and model == context.answer_model
+        and summaries_cacheable(context, results)
+    ):
+        cache = await shared_summaries_cache(
+            context, model, await answer_summaries(results, context)
+        )
+    if cache is not None:
+        formatted_prompt = reflection_prefix + reflection_topic_suffix.format(
+            research_topic=context.research_topic
+        )
+    else:
+        formatted_prompt, cache = await cached_prompt(
+            model,
+            reflection_prefix,
+            formatted_suffix,
+            configurable.prompt_cache_ttl_seconds,
+        )
+    structured_llm = get_structured_model(
+        model, Reflection, temperature=1.0, cached_content=cache
+    )
+    await get_rate_limiter(model).acquire(
+        estimate_tokens(reflection_prefix + formatted_suffix)
+    )
+    with traced_gemini_call(model, "reflect"):
+        return await structured_llm.ainvoke(formatted_prompt)
+
+
 def evaluate_research(
     state: ReflectionState,
     config: RunnableConfig,
@@ -196,33 +495,231 @@ def evaluate_research(
     Returns:
         String literal indicating the next node to visit ("web_research" or "finalize_summary")
     """
-    configurable = Configuration.from_runnable_config(config)
-    max_research_loops = (
-        state.get("max_research_loops")
-        if state.get("max_research_loops") is not None
-        else configurable.max_research_loops
-    )
+    context = get_run_context(state, config)
+    configurable = context.configurable
+    max_research_loops = context.max_research_loops
     if state["is_sufficient"] or state["research_loop_count"] >= max_research_loops:
         return "finalize_answer"
-    else:
-        return [
+    # Stop early when another loop and the answer would overrun the run's deadline
+    if not fits_another_loop(state.get("deadline")):
+        return "finalize_answer"
+
+    # Skip follow-up queries that were already searched in an earlier loop
+    follow_up_queries = dedupe_queries(
+        state["follow_up_queries"],
+        seen=state["search_query"],
+        threshold=configurable.query_similarity_threshold,
+        use_vectors=configurable.query_dedup_use_vectors,
+    )
+    if not follow_up_queries:
+        return "finalize_answer"
+    sends = web_research_sends(
+        state,
+        config,
+        follow_up_queries,
+        state["next_search_id"],
+        "reflection",
+    )
+    # The loop being dispatched is the last one, so the answer is next; start
+    # drafting it while the searches run
+    if (
+        configurable.speculative_answer
+        and state["research_loop_count"] + 1 >= max_research_loops
+    ):
+        sends.append(
             Send(
-                "web_research",
+                "draft_answer",
                 {
-                    "search_query": follow_up_query,
-                    "id": state["number_of_ran_queries"] + int(idx),
+                    "messages": state["messages"],
+                    "web_research_result": state["web_research_result"],
+                    "sources_gathered": state.get("sources_gathered"),
+                    "reasoning_model": state.get("reasoning_model"),
+                    "trace_context": state.get("trace_context"),
+                    "deadline": state.get("deadline"),
+                    "turn_id": state.get("turn_id"),
                 },
             )
-            for idx, follow_up_query in enumerate(state["follow_up_queries"])
-        ]
+        )
+    return sends
+
+
+async def answer_summaries(results: list[str], context: RunContext) -> str:
+    """Join the summaries an answer is written from, packed into its context budget."""
+    summaries = assemble_context(
+        await aload_texts(results),
+        context.research_topic,
+        context.configurable.answer_context_tokens,
+    )
+    return "\n---\n\n".join(summaries)
+
+
+def summaries_cacheable(context: RunContext, results: list[str]) -> bool:
+    """Return whether the summaries packed from `results` could be cached.
+
+    Checked before the summaries are built, since packing them loads and ranks
+    every result. Offloaded results are only known to be large, so any of them
+    counts as possibly reaching the model's minimum.
+    """
+    configurable = context.configurable
+    min_tokens = min_cache_tokens(context.answer_model)
+    if configurable.summaries_cache_ttl_seconds <= 0:
+        return False
+    if configurable.answer_context_tokens < min_tokens:
+        return False
+    return any(is_blob_ref(result) for result in results) or (
+        sum(estimate_tokens(result) for result in results) >= min_tokens
+    )
+
+
+async def shared_summaries_cache(
+    context: RunContext, model: str, summaries: str, create: bool = True
+) -> Optional[str]:
+    """Return the context cache holding `summaries` for the last reflection and answer.
+
+    Caches cannot be appended to, so summaries that changed in between get a new
+    cache; superseded ones expire after `summaries_cache_ttl_seconds`.
+    """
+    configurable = context.configurable
+    if configurable.summaries_cache_ttl_seconds <= 0:
+        return None
+    return await get_context_cache(configurable.summaries_cache_ttl_seconds).aget(
+        model,
+        summaries_context.format(summaries=summaries),
+        create=create,
+    )
+
+
+async def compose_answer(
+    state: OverallState,
+    config: RunnableConfig,
+    results: list[str],
+    sources_gathered: Optional[SourceTable],
+    stream: bool = True,
+) -> tuple[AIMessage, list[dict]]:
+    """Write the cited answer to the research topic from web research results.
+
+    Args:
+        state: Current graph state containing the messages and reasoning model
+        config: Configuration for the runnable
+        results: The web_research results, or blob refs to them, to answer from
+        sources_gathered: The source table the results' short urls resolve against
+        stream: Whether the answer goes to LangGraph's `messages` stream
+
+    Returns:
+        The answer message and the sources it cites
+    """
+    context = get_run_context(state, config)
+    configurable = context.configurable
+    reasoning_model = context.answer_model
+
+    # Pack the most relevant summaries into the answer context budget
+    research_topic = context.research_topic
+    summaries = await answer_summaries(results, context)
+
+    # Format the prompt, reusing the summaries cache of the last reflection if the
+    # summaries have not changed since
+    formatted_suffix = answer_suffix.format(
+        current_date=context.current_date,
+        research_topic=research_topic,
+        summaries=summaries,
+    )
+    cache = await shared_summaries_cache(
+        context, reasoning_model, summaries, create=False
+    )
+    if cache is not None:
+        formatted_prompt = answer_prefix + answer_topic_suffix.format(
+            current_date=context.current_date, research_topic=research_topic
+        )
+    else:
+        formatted_prompt, cache = await cached_prompt(
+            reasoning_model,
+            answer_prefix,
+            formatted_suffix,
+            configurable.prompt_cache_ttl_seconds,
+        )
+
+    # init Reasoning Model, default to Gemini 2.5 Flash
+    llm = get_chat_model(reasoning_model, temperature=0)
+    await get_rate_limiter(reasoning_model).acquire(
+        estimate_tokens(answer_prefix + formatted_suffix)
+    )
+
+    # Stream the answer with the short urls replaced by the original urls as the
+    # chunks arrive, collecting every source the answer uses along the way
+    # Short url ids restart on every turn of a thread, so the newest source wins
+    sources = unique_sources(sources_gathered)[::-1]
+    rewriter = ShortUrlRewriter(sources)
+    streaming_llm = ShortUrlRewritingChatModel(llm=llm, rewriter=rewriter)
+    content = []
+    message_id = None
+    # The answer is the run's output, so the deadline never cuts it off; the
+    # earlier steps reserve time for it instead
+    with traced_gemini_call(reasoning_model, "answer"):
+        async for chunk in streaming_llm.astream(
+            formatted_prompt,
+            None if stream else {"tags": ["nostream"]},
+            cached_content=cache,
+        ):
+            content.append(message_text(chunk))
+            message_id = chunk.id
+
+    return AIMessage(content="".join(content), id=message_id), rewriter.used_sources
+
+
+@instrumented_node
+@traced_node
+async def draft_answer(state: OverallState, config: RunnableConfig):
+    """LangGraph node that speculatively drafts the final answer.
+
+    Runs next to the last loop's web_research branches from the summaries gathered
+    so far. The draft is not streamed to clients; finalize_answer decides whether
+    it stands.
+
+    Args:
+        state: Current graph state containing the research gathered so far
+        config: Configuration for the runnable
+
+    Returns:
+        Dictionary with state update, including the answer_draft
+    """
+    try:
+        # Unlike the answer itself, a draft is dropped rather than awaited when the
+        # run is out of time, as the last reflection waits for it
+        async with asyncio.timeout(
+            call_timeout(
+                state.get("deadline"),
+                reserve=estimated_node_seconds("finalize_answer"),
+            )
+        ):
+            message, sources = await compose_answer(
+                state,
+                config,
+                state["web_research_result"],
+                state.get("sources_gathered"),
+                stream=False,
+            )
+    except TimeoutError:
+        logger.warning("Speculative answer ran out of the run's time budget")
+        return {"answer_draft": None}
+    return {
+        "answer_draft": {
+            "content": message.content,
+            "message_id": message.id,
+            "sources": sources,
+            "result_count": len(state["web_research_result"]),
+        }
+    }
 
 
-def finalize_answer(state: OverallState, config: RunnableConfig):
+@instrumented_node
+@traced_node
+async def finalize_answer(state: OverallState, config: RunnableConfig):
     """LangGraph node that finalizes the research summary.
 
     Prepares the final output by deduplicating and formatting sources, then
     combining them with the running summary to create a well-structured
-    research report with proper citations.
+    research report with proper citations. A speculative draft is used instead
+    when the results that came in after it add little.
 
     Args:
         state: Current graph state containing the running summary and sources gathered
@@ -230,38 +727,48 @@ def finalize_answer(state: OverallState, config: RunnableConfig):
     Returns:
         Dictionary with state update, including running_summary key containing the formatted final summary with sources
     """
-    configurable = Configuration.from_runnable_config(config)
-    reasoning_model = state.get("reasoning_model") or configurable.reasoning_model
-
-    # Format the prompt
-    current_date = get_current_date()
-    formatted_prompt = answer_instructions.format(
-        current_date=current_date,
-        research_topic=get_research_topic(state["messages"]),
-        summaries="\n---\n\n".join(state["web_research_result"]),
-    )
-
-    # init Reasoning Model, default to Gemini 2.5 Flash
-    llm = ChatGoogleGenerativeAI(
-        model=reasoning_model,
-        temperature=0,
-        max_retries=2,
-        api_key=os.getenv("GEMINI_API_KEY"),
-    )
-    result = llm.invoke(formatted_prompt)
-
-    # Replace the short urls with the original urls and add all used urls to the sources_gathered
-    unique_sources = []
-    for source in state["sources_gathered"]:
-        if source["short_url"] in result.content:
-            result.content = result.content.replace(
-                source["short_url"], source["value"]
+    configurable = get_run_context(state, config).configurable
+    RESEARCH_LOOPS.observe(state.get("research_loop_count", 0))
+
+    # Searches that finished since the last reflection still make the answer;
+    # those that are still running are given up on
+    late = collect_late_results(state.get("turn_id"), cancel_pending=True)
+    results = state["web_research_result"] + late.get("web_research_result", [])
+
+    draft = state.get("answer_draft")
+    if draft is not None:
+        novelty = unseen_content_share(
+            await aload_texts(results[: draft["result_count"]]),
+            await aload_texts(results[draft["result_count"] :]),
+        )
+        if novelty > configurable.speculative_answer_max_novelty:
+            logger.info(
+                "Discarding the answer draft: %.0f%% of the material is new to it",
+                novelty * 100,
             )
-            unique_sources.append(source)
+            SPECULATIVE_ANSWERS.labels("discarded").inc()
+            draft = None
+        else:
+            SPECULATIVE_ANSWERS.labels("kept").inc()
+
+    if draft is not None:
+        message = AIMessage(content=draft["content"], id=draft["message_id"])
+        sources = draft["sources"]
+    else:
+        message, sources = await compose_answer(
+            state,
+            config,
+            results,
+            add_sources(state.get("sources_gathered"), late.get("sources_gathered")),
+        )
 
     return {
-        "messages": [AIMessage(content=result.content)],
-        "sources_gathered": unique_sources,
+        "search_query": late.get("search_query", []),
+        "web_research_result": late.get("web_research_result", []),
+        "messages": [message],
+        "sources_gathered": sources,
+        # A draft only ever stands for the turn it was written in
+        "answer_draft": None,
     }
 
 
@@ -272,6 +779,7 @@ builder = StateGraph(OverallState, config_schema=Configuration)
 builder.add_node("generate_query", generate_query)
 builder.add_node("web_research", web_research)
 builder.add_node("reflection", reflection)
+builder.add_node("draft_answer", draft_answer)
 builder.add_node("finalize_answer", finalize_answer)
 
 # Set the entrypoint as `generate_query`
@@ -283,9 +791,12 @@ builder.add_conditional_edges(
 )
 # Reflect on the web research
 builder.add_edge("web_research", "reflection")
+builder.add_edge("draft_answer", "reflection")
 # Evaluate the research
 builder.add_conditional_edges(
-    "reflection", evaluate_research, ["web_research", "finalize_answer"]
+    "reflection",
+    evaluate_research,
+    ["web_research", "draft_answer", "finalize_answer"],
 )
 # Finalize the answer
 builder.add_edge("finalize_answer", END)
@@ -0,0 +1,122 @@
+import asyncio
+import logging
+import math
+import threading
+import time
+from collections import deque
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from agent.metrics import HEDGED_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Hedging only starts once enough latencies were seen to place the percentile
+MIN_SAMPLES = 20
+
+
+class LatencyTracker:
+    """Sliding window of recent call latencies and how many calls were hedged."""
+
+    def __init__(self, window: int = 200):
+        """Keep the latencies and hedge decisions of the last `window` calls."""
+        self._lock = threading.Lock()
+        self._latencies: deque[float] = deque(maxlen=window)
+        self._hedged: deque[bool] = deque(maxlen=window)
+
+    def observe(self, seconds: float) -> None:
+        """Record the latency of a completed call."""
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def percentile(
+        self, percentile: float, min_samples: int = MIN_SAMPLES
+    ) -> Optional[float]:
+        """Return the given percentile of the window, or None while it is too small."""
+        with self._lock:
+            if len(self._latencies) < min_samples:
+                return None
+            ordered = sorted(self._latencies)
+        rank = math.ceil(percentile / 100 * len(ordered)) - 1
+        return ordered[min(max(rank, 0), len(ordered) - 1)]
+
+    def can_hedge(self, max_rate: float) -> bool:
+        """Return whether hedging one more call keeps the hedged share within `max_rate`."""
+        with self._lock:
+            return (sum(self._hedged) + 1) / (len(self._hedged) + 1) <= max_rate
+
+    def record_call(self, hedged: bool) -> None:
+        """Record whether a call was hedged, for the hedge-rate cap."""
+        with self._lock:
+            self._hedged.append(hedged)
+
+
+_lock = threading.Lock()
+_trackers: dict[str, LatencyTracker] = {}
+
+
+def get_latency_tracker(key: str) -> LatencyTracker:
+    """Return the process-wide latency tracker for a call type, e.g. a model name."""
+    with _lock:
+        tracker = _trackers.get(key)
+        if tracker is None:
+            tracker = _trackers[key] = LatencyTracker()
+        return tracker
+
+
+async def _timed(call: Awaitable[T]) -> tuple[T, float]:
+    start = time.perf_counter()
+    result = await call
+    return result, time.perf_counter() - start
+
+
+async def hedged_call(
+    send: Callable[[bool], Awaitable[T]],
+    tracker: LatencyTracker,
+    percentile: float,
+    max_rate: float,
+) -> T:
+    """Await `send(False)`, racing a duplicate `send(True)` if it is slow.
+
+    The duplicate is sent once the first call has run longer than `percentile` of
+    the tracker's recent latencies, unless that would push the share of hedged
+    calls above `max_rate`. Whichever call finishes first wins and the other one
+    is cancelled; a failed call only loses if the other one can still succeed.
+
+    Args:
+        send: Issues the call; its argument tells whether it is the duplicate.
+        tracker: Latencies of earlier calls of the same kind.
+        percentile: Latency percentile after which to hedge, e.g. 95.
+        max_rate: Largest share of calls that may be hedged, e.g. 0.1.
+    """
+    primary = asyncio.ensure_future(_timed(send(False)))
+    pending = {primary}
+    try:
+        delay = tracker.percentile(percentile)
+        hedged = False
+        if delay is not None and not (await asyncio.wait(pending, timeout=delay))[0]:
+            if tracker.can_hedge(max_rate):
+                logger.info("Hedging a call still running after %.2fs", delay)
+                HEDGED_REQUESTS.labels("sent").inc()
+                pending.add(asyncio.ensure_future(_timed(send(True))))
+                hedged = True
+            else:
+                HEDGED_REQUESTS.labels("over_budget").inc()
+        tracker.record_call(hedged)
+        while True:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            # Prefer a successful call when both finished in the same iteration
+            winner = min(done, key=lambda task: task.exception() is not None)
+            if winner.exception() is None or not pending:
+                break
+        result, seconds = winner.result()
+        tracker.observe(seconds)
+        if winner is not primary:
+            HEDGED_REQUESTS.labels("won").inc()
+        return result
+    finally:
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,92 @@
+import functools
+import time
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Optional
+
+from langchain_core.callbacks import get_usage_metadata_callback
+
+from agent.hedging import get_latency_tracker
+from agent.metrics import (
+    NODE_DURATION_SECONDS,
+    NODE_QUEUE_WAIT_SECONDS,
+    NODE_TOKENS,
+    SEND_FANOUT_WIDTH,
+)
+
+
+class _NodeRun:
+    """Queue waits accumulated by one execution of a node."""
+
+    def __init__(self, node: str):
+        self.node = node
+        self.queue_wait: dict[str, float] = {}
+
+
+_current_node: ContextVar[Optional[_NodeRun]] = ContextVar(
+    "agent_current_node", default=None
+)
+
+
+def record_queue_wait(reason: str, seconds: float) -> None:
+    """Attribute time spent waiting for a slot or rate-limit budget to the running node.
+
+    Args:
+        reason: What the node waited for, e.g. `concurrency` or `rate_limit`.
+        seconds: How long it waited.
+    """
+    node_run = _current_node.get()
+    if node_run is not None:
+        node_run.queue_wait[reason] = node_run.queue_wait.get(reason, 0.0) + seconds
+
+
+def record_tokens(model: str, prompt_tokens: int, completion_tokens: int) -> None:
+    """Count tokens of a call made outside LangChain, e.g. with the google-genai client."""
+    node_run = _current_node.get()
+    node = node_run.node if node_run is not None else "unknown"
+    NODE_TOKENS.labels(node, model, "prompt").inc(prompt_tokens or 0)
+    NODE_TOKENS.labels(node, model, "completion").inc(completion_tokens or 0)
+
+
+def record_fanout(source: str, width: int) -> None:
+    """Observe how many searches a router dispatched in one research loop."""
+    SEND_FANOUT_WIDTH.labels(source).observe(width)
+
+
+def instrumented_node(
+    node: Callable[..., Awaitable[Any]],
+) -> Callable[..., Awaitable[Any]]:
+    """Wrap an async graph node with latency, queue-wait and token metrics.
+
+    Wall time and queue waits are labelled with the node's function name. Token
+    counts come from the usage metadata of every chat model call the node makes and
+    are labelled with the node and the model that reported them.
+    """
+    name = node.__name__
+
+    @functools.wraps(node)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        node_run = _NodeRun(name)
+        token = _current_node.set(node_run)
+        start = time.perf_counter()
+        try:
+            with get_usage_metadata_callback() as usage:
+                return await node(*args, **kwargs)
+        finally:
+            duration = time.perf_counter() - start
+            NODE_DURATION_SECONDS.labels(name).observe(duration)
+            # Recent durations let runs with a deadline predict the next loop
+            get_latency_tracker(f"node:{name}").observe(duration)
+            for reason, seconds in node_run.queue_wait.items():
+                NODE_QUEUE_WAIT_SECONDS.labels(name, reason).observe(seconds)
+            for model, counts in usage.usage_metadata.items():
+                NODE_TOKENS.labels(name, model, "prompt").inc(counts["input_tokens"])
+                NODE_TOKENS.labels(name, model, "completion").inc(
+                    counts["output_tokens"]
+                )
+                # Prompt tokens served from a context cache, included in "prompt"
+                NODE_TOKENS.labels(name, model, "cache_read").inc(
+                    counts.get("input_token_details", {}).get("cache_read", 0)
+                )
+            _current_node.reset(token)
+
+    return wrapper
@@ -0,0 +1,80 @@
+from prometheus_client import Counter, Histogram
+
+SEARCH_QUEUE_WAIT_SECONDS = Histogram(
+    "agent_search_queue_wait_seconds",
+    "Time a web_research branch waited for a per-run and global concurrency slot.",
+    buckets=(0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+
+SEARCH_CACHE_LOOKUPS = Counter(
+    "agent_search_cache_lookups_total",
+    "Lookups in the grounded search cache, by tier and outcome.",
+    ["tier", "result"],
+)
+
+SEARCH_QUERIES_SKIPPED = Counter(
+    "agent_search_queries_skipped_total",
+    "Search queries dropped before dispatch as near-duplicates of earlier queries.",
+)
+
+NODE_DURATION_SECONDS = Histogram(
+    "agent_node_duration_seconds",
+    "Wall time of one execution of a graph node.",
+    ["node"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120),
+)
+
+NODE_QUEUE_WAIT_SECONDS = Histogram(
+    "agent_node_queue_wait_seconds",
+    "Time a node execution spent waiting for a concurrency slot or rate-limit budget.",
+    ["node", "reason"],
+    buckets=(0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+
+NODE_TOKENS = Counter(
+    "agent_node_tokens_total",
+    "Prompt, completion and cached prompt tokens reported by model responses, by node and model.",
+    ["node", "model", "kind"],
+)
+
+CONTEXT_CACHE_OPERATIONS = Counter(
+    "agent_context_cache_operations_total",
+    "Explicit Gemini context cache operations, by operation.",
+    ["operation"],
+)
+
+CONTEXT_CACHE_TOKENS = Counter(
+    "agent_context_cache_tokens_total",
+    "Tokens written to newly created explicit Gemini context caches.",
+)
+
+SPECULATIVE_ANSWERS = Counter(
+    "agent_speculative_answers_total",
+    "Answers drafted during the last research loop, by whether the draft was kept.",
+    ["outcome"],
+)
+
+REFLECTION_CASCADE = Counter(
+    "agent_reflection_cascade_total",
+    "Reflections by the fast model: kept, or escalated to the reflection model and why.",
+    ["outcome"],
+)
+
+SEND_FANOUT_WIDTH = Histogram(
+    "agent_send_fanout_width",
+    "Number of searches dispatched in one research loop, by routing step.",
+    ["source"],
+    buckets=(0, 1, 2, 3, 4, 5, 7, 10, 15, 20),
+)
+
+RESEARCH_LOOPS = Histogram(
+    "agent_research_loops",
+    "Research loops a run completed before finalizing its answer.",
+    buckets=(0, 1, 2, 3, 4, 5, 6, 8, 10, 15, 20),
+)
+
+HEDGED_REQUESTS = Counter(
+    "agent_hedged_requests_total",
+    "Duplicate grounded searches: sent, won the race, or skipped by the rate cap.",
+    ["outcome"],
+)
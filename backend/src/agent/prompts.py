@@ -6,15 +6,19 @@ def get_current_date():
     return datetime.now().strftime("%B %d, %Y")
 
 
-query_writer_instructions = """Your goal is to generate sophisticated and diverse web search queries. These queries are intended for an advanced automated web research tool capable of analyzing complex results, following links, and synthesizing information.
+# The query writer, reflection and answer prompts are split into a static prefix,
+# sent first and identical across calls so Gemini can serve it from a context
+# cache once it reaches the model's minimum cache size, and a dynamic suffix
+# formatted for each call.
+query_writer_prefix = """Your goal is to generate sophisticated and diverse web search queries. These queries are intended for an advanced automated web research tool capable of analyzing complex results, following links, and synthesizing information.
 
 Instructions:
 - Always prefer a single search query, only add another query if the original question requests multiple aspects or elements and one query is not enough.
 - Each query should focus on one specific aspect of the original question.
-- Don't produce more than {number_queries} queries.
+- Don't produce more queries than the maximum number of queries given below.
 - Queries should be diverse, if the topic is broad, generate more than 1 query.
 - Don't generate multiple similar queries, 1 is enough.
-- Query should ensure that the most current information is gathered. The current date is {current_date}.
+- Query should ensure that the most current information is gathered. The current date is given below.
 
 Format: 
 - Format your response as a JSON object with ALL three of these exact keys:
@@ -25,11 +29,16 @@ Example:
 
 Topic: What revenue grew more last year apple stock or the number of people buying an iphone
 ```json
-{{
+{
     "rationale": "To answer this comparative growth question accurately, we need specific data points on Apple's stock performance and iPhone sales metrics. These queries target the precise financial information needed: company revenue trends, product-specific unit sales figures, and stock price movement over the same fiscal period for direct comparison.",
     "query": ["Apple total revenue growth fiscal year 2024", "iPhone unit sales growth fiscal year 2024", "Apple stock price growth fiscal year 2024"],
-}}
+}
 ```
+"""
+
+query_writer_suffix = """
+The current date is {current_date}.
+Maximum number of queries: {number_queries}
 
 Context: {research_topic}"""
 
@@ -47,7 +56,7 @@ Research Topic:
 {research_topic}
 """
 
-reflection_instructions = """You are an expert research assistant analyzing summaries about "{research_topic}".
+reflection_prefix = """You are an expert research assistant analyzing summaries about the research topic given below.
 
 Instructions:
 - Identify knowledge gaps or areas that need deeper exploration and generate a follow-up query. (1 or multiple).
@@ -63,34 +72,60 @@ Output Format:
    - "is_sufficient": true or false
    - "knowledge_gap": Describe what information is missing or needs clarification
    - "follow_up_queries": Write a specific question to address this gap
+   - "confidence": How confident you are in this assessment, from 0 to 1
 
 Example:
 ```json
-{{
+{
     "is_sufficient": true, // or false
     "knowledge_gap": "The summary lacks information about performance metrics and benchmarks", // "" if is_sufficient is true
-    "follow_up_queries": ["What are typical performance benchmarks and metrics used to evaluate [specific technology]?"] // [] if is_sufficient is true
-}}
+    "follow_up_queries": ["What are typical performance benchmarks and metrics used to evaluate [specific technology]?"], // [] if is_sufficient is true
+    "confidence": 0.8 // between 0 and 1
+}
 ```
 
-Reflect carefully on the Summaries to identify knowledge gaps and produce a follow-up query. Then, produce your output following this JSON format:
+Reflect carefully on the Summaries to identify knowledge gaps and produce a follow-up query. Then, produce your output following this JSON format.
+"""
+
+reflection_suffix = """
+Research Topic: "{research_topic}"
 
 Summaries:
 {summaries}
 """
 
-answer_instructions = """Generate a high-quality answer to the user's question based on the provided summaries.
+# In the last loop the summaries the answer is written from are sent ahead of the
+# instructions, as one context cache that the last reflection and the answer share
+summaries_context = """Summaries:
+{summaries}
+"""
+
+reflection_topic_suffix = """
+Research Topic: "{research_topic}"
+"""
+
+answer_prefix = """Generate a high-quality answer to the user's question based on the provided summaries.
 
 Instructions:
-- The current date is {current_date}.
+- The current date is given below.
 - You are the final step of a multi-step research process, don't mention that you are the final step. 
 - You have access to all the information gathered from the previous steps.
 - You have access to the user's question.
 - Generate a high-quality answer to the user's question based on the provided summaries and the user's question.
 - you MUST include all the citations from the summaries in the answer correctly.
+"""
+
+answer_suffix = """
+The current date is {current_date}.
 
 User Context:
 - {research_topic}
 
 Summaries:
 {summaries}"""
+
+answer_topic_suffix = """
+The current date is {current_date}.
+
+User Context:
+- {research_topic}"""
@@ -0,0 +1,101 @@
+import logging
+import math
+import re
+import zlib
+from typing import Iterable, List
+
+from agent.metrics import SEARCH_QUERIES_SKIPPED
+
+logger = logging.getLogger(__name__)
+
+_WORD_RE = re.compile(r"\w+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from how in is it of on or the to what when "
+    "where which who why with".split()
+)
+_VECTOR_DIMS = 512
+
+
+def content_words(text: str) -> List[str]:
+    """Return the lowercased words of `text` that are not stopwords, in order."""
+    return [w for w in _WORD_RE.findall(text.lower()) if w not in _STOPWORDS]
+
+
+def query_tokens(query: str) -> frozenset[str]:
+    """Return the normalized set of content words in a search query."""
+    return frozenset(content_words(query)) or frozenset(_WORD_RE.findall(query.lower()))
+
+
+def token_set_similarity(a: frozenset[str], b: frozenset[str]) -> float:
+    """Jaccard similarity of two token sets."""
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def hashed_vector(query: str) -> dict[int, float]:
+    """Embed a query as an L2-normalized bag of hashed character trigrams."""
+    text = f" {' '.join(query.lower().split())} "
+    counts: dict[int, float] = {}
+    for i in range(len(text) - 2):
+        bucket = zlib.crc32(text[i : i + 3].encode("utf-8")) % _VECTOR_DIMS
+        counts[bucket] = counts.get(bucket, 0.0) + 1.0
+    norm = math.sqrt(sum(v * v for v in counts.values())) or 1.0
+    return {k: v / norm for k, v in counts.items()}
+
+
+def cosine_similarity(a: dict[int, float], b: dict[int, float]) -> float:
+    """Cosine similarity of two normalized sparse vectors."""
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(v * b.get(k, 0.0) for k, v in a.items())
+
+
+def dedupe_queries(
+    candidates: Iterable[str],
+    seen: Iterable[str] = (),
+    threshold: float = 0.8,
+    use_vectors: bool = False,
+) -> List[str]:
+    """Drop candidate queries that are near-duplicates of earlier ones.
+
+    A candidate is compared with every query in `seen` and with the candidates kept
+    before it, so duplicates within one batch are dropped as well.
+
+    Args:
+        candidates: Queries about to be sent to web research, in order.
+        seen: Queries that were already searched in this run.
+        threshold: Similarity at or above which a query counts as a duplicate.
+        use_vectors: Also compare hashed character-trigram vectors, which catches
+            paraphrases that differ in word forms.
+
+    Returns:
+        The candidates that should still be searched, in their original order.
+    """
+    reference = [
+        (query, query_tokens(query), hashed_vector(query) if use_vectors else None)
+        for query in seen
+    ]
+    kept = []
+    for query in candidates:
+        tokens = query_tokens(query)
+        vector = hashed_vector(query) if use_vectors else None
+        duplicate_of = None
+        for other, other_tokens, other_vector in reference:
+            score = token_set_similarity(tokens, other_tokens)
+            if use_vectors:
+                score = max(score, cosine_similarity(vector, other_vector))
+            if score >= threshold:
+                duplicate_of = (other, score)
+                break
+        if duplicate_of is not None:
+            logger.info(
+                "Skipping search query %r: similar to %r (%.2f)",
+                query,
+                *duplicate_of,
+            )
+            SEARCH_QUERIES_SKIPPED.inc()
+            continue
+        kept.append(query)
+        reference.append((query, tokens, vector))
+    return kept
@@ -0,0 +1,105 @@
+import asyncio
+import logging
+import math
+import threading
+import time
+from typing import Any, Awaitable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Late searches of runs that never collect them are dropped after this long
+LATE_RESULT_TTL_SECONDS = 600
+
+_lock = threading.Lock()
+# Searches still running after their loop moved on, by the run's late_results_key
+_late_tasks: Dict[str, tuple[float, List[asyncio.Task]]] = {}
+
+
+def quorum_size(branches: int, fraction: float) -> int:
+    """Return how many of `branches` searches must finish before the run moves on."""
+    return min(branches, max(1, math.ceil(branches * fraction)))
+
+
+def merge_updates(updates: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Concatenate the list-valued state updates of several web_research searches."""
+    merged: Dict[str, Any] = {}
+    for update in updates:
+        for key, value in update.items():
+            merged.setdefault(key, []).extend(value)
+    return merged
+
+
+def _purge_expired() -> None:
+    now = time.monotonic()
+    for key, (created, tasks) in list(_late_tasks.items()):
+        if now - created > LATE_RESULT_TTL_SECONDS:
+            for task in tasks:
+                task.cancel()
+            del _late_tasks[key]
+
+
+async def gather_quorum(
+    searches: List[Awaitable[Dict[str, Any]]], quorum: int, late_results_key: str
+) -> Dict[str, Any]:
+    """Run searches concurrently and return the merged updates of the first `quorum`.
+
+    Searches that are still running are kept under `late_results_key`, so a later
+    node of the same run can merge them with `collect_late_results`. If one of the
+    first searches fails, the others are cancelled and the error propagates, as it
+    would with one branch per search.
+    """
+    tasks = [asyncio.ensure_future(search) for search in searches]
+    finished: List[asyncio.Task] = []
+    pending = set(tasks)
+    try:
+        while len(finished) < quorum:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            finished.extend(done)
+            for task in done:
+                task.result()
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+    if pending:
+        logger.info("Moving on after %d of %d searches", len(finished), len(tasks))
+        with _lock:
+            _purge_expired()
+            created, late = _late_tasks.get(late_results_key, (time.monotonic(), []))
+            _late_tasks[late_results_key] = (created, late + list(pending))
+    # Keep the order the searches were dispatched in
+    return merge_updates([task.result() for task in tasks if task in finished])
+
+
+def collect_late_results(
+    late_results_key: Optional[str], cancel_pending: bool = False
+) -> Dict[str, Any]:
+    """Take the updates of late searches that have finished since the run moved on.
+
+    Args:
+        late_results_key: The run's key for late searches.
+        cancel_pending: Give up on searches that are still running, e.g. when the
+            run is about to answer.
+
+    Returns:
+        The merged state updates of the finished searches; failed ones are skipped.
+    """
+    with _lock:
+        created, tasks = _late_tasks.pop(late_results_key, (None, []))
+        still_running = [task for task in tasks if not task.done()]
+        if still_running and not cancel_pending:
+            _late_tasks[late_results_key] = (created, still_running)
+    if cancel_pending:
+        for task in still_running:
+            task.cancel()
+    updates = []
+    for task in tasks:
+        if not task.done() or task.cancelled():
+            continue
+        if task.exception() is not None:
+            logger.warning("Late search failed: %r", task.exception())
+            continue
+        updates.append(task.result())
+    return merge_updates(updates)
@@ -0,0 +1,186 @@
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from typing import NamedTuple
+
+from agent.instrumentation import record_queue_wait
+
+logger = logging.getLogger(__name__)
+
+# Reserves one request and `tokens` tokens from the per-model buckets stored in a
+# Redis hash and returns how long the caller has to wait for its reservation. The
+# server clock is used so every replica sees the same refill timeline. The hash
+# lives until its buckets have refilled, so an idle key expires full and a key in
+# deficit never resets early.
+_RESERVE_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local wait = 0
+local specs = {{'req', tonumber(ARGV[1]), 1}, {'tok', tonumber(ARGV[2]), tonumber(ARGV[3])}}
+for _, spec in ipairs(specs) do
+  local name, limit, cost = spec[1], spec[2], spec[3]
+  if limit > 0 then
+    local level = tonumber(redis.call('HGET', KEYS[1], name) or limit)
+    local ts = tonumber(redis.call('HGET', KEYS[1], name .. '_ts') or now)
+    level = math.min(limit, level + (now - ts) * limit / 60) - math.min(cost, limit)
+    if level < 0 then
+      wait = math.max(wait, -level * 60 / limit)
+    end
+    redis.call('HSET', KEYS[1], name, tostring(level), name .. '_ts', tostring(now))
+  end
+end
+redis.call('EXPIRE', KEYS[1], math.ceil(wait) + 60)
+return tostring(wait)
+"""
+
+
+class RateLimits(NamedTuple):
+    """Per-minute budgets for one model. A limit of 0 disables that bucket."""
+
+    rpm: int = 0
+    tpm: int = 0
+
+
+class _Bucket:
+    """Token bucket that refills continuously up to `limit` units per minute.
+
+    Callers reserve capacity up front and the level may go negative; the deficit is
+    the time the caller has to wait, so concurrent callers queue in arrival order
+    instead of being rejected.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.level = float(limit)
+        self.updated = time.monotonic()
+
+    def reserve(self, cost: float, now: float) -> float:
+        """Take `cost` units and return the seconds until the bucket is solvent."""
+        rate = self.limit / 60
+        self.level = min(self.limit, self.level + (now - self.updated) * rate)
+        self.updated = now
+        self.level -= min(cost, self.limit)
+        return -self.level / rate if self.level < 0 else 0.0
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute limiter for one Gemini model.
+
+    The in-process buckets are guarded by a lock so the limiter can be shared by
+    threads and event loops alike. When a Redis client is given, the buckets live in
+    Redis instead and every replica draws from the same budget.
+    """
+
+    def __init__(self, model: str, limits: RateLimits, redis_client=None):
+        """Create a limiter for `model`, sharing its buckets through `redis_client`."""
+        self.model = model
+        self.limits = limits
+        self._redis = redis_client
+        self._lock = threading.Lock()
+        self._buckets: dict[str, _Bucket] = {}
+        if limits.rpm > 0:
+            self._buckets["requests"] = _Bucket(limits.rpm)
+        if limits.tpm > 0:
+            self._buckets["tokens"] = _Bucket(limits.tpm)
+
+    @property
+    def enabled(self) -> bool:
+        """Whether any budget is configured for this model."""
+        return bool(self._buckets)
+
+    def reserve(self, tokens: int) -> float:
+        """Reserve capacity for one call and return the seconds to wait before it."""
+        if not self.enabled:
+            return 0.0
+        if self._redis is not None:
+            wait = self._redis.eval(
+                _RESERVE_SCRIPT,
+                1,
+                f"gemini-rate-limit:{self.model}",
+                self.limits.rpm,
+                self.limits.tpm,
+                tokens,
+            )
+            return float(wait)
+        with self._lock:
+            now = time.monotonic()
+            costs = {"requests": 1, "tokens": tokens}
+            return max(
+                bucket.reserve(costs[name], now)
+                for name, bucket in self._buckets.items()
+            )
+
+    async def acquire(self, tokens: int) -> float:
+        """Wait until a call estimated at `tokens` tokens fits the budget.
+
+        Returns:
+            The number of seconds spent waiting.
+        """
+        if not self.enabled:
+            return 0.0
+        if self._redis is not None:
+            wait = await asyncio.to_thread(self.reserve, tokens)
+        else:
+            wait = self.reserve(tokens)
+        if wait > 0:
+            logger.info("Rate limit for %s: queued call for %.2fs", self.model, wait)
+            await asyncio.sleep(wait)
+        record_queue_wait("rate_limit", wait)
+        return wait
+
+
+_lock = threading.Lock()
+_limiters: dict[str, RateLimiter] = {}
+_redis_client = None
+
+
+def _limits_for(model: str) -> RateLimits:
+    """Read the budget for `model` from the environment.
+
+    `GEMINI_RATE_LIMITS` holds a JSON object mapping model names to
+    `{"rpm": ..., "tpm": ...}`; models not listed fall back to `GEMINI_RPM` and
+    `GEMINI_TPM`. Unset limits are treated as unlimited.
+    """
+    overrides = json.loads(os.getenv("GEMINI_RATE_LIMITS") or "{}")
+    if model in overrides:
+        return RateLimits(**overrides[model])
+    return RateLimits(
+        rpm=int(os.getenv("GEMINI_RPM", 0)), tpm=int(os.getenv("GEMINI_TPM", 0))
+    )
+
+
+def _get_redis_client():
+    """Return the Redis client shared by all limiters, if one is configured.
+
+    `RATE_LIMIT_REDIS_URI` accepts any redis:// URI. The special value
+    `fakeredis://` uses an in-process fakeredis server, which is handy for tests.
+    """
+    global _redis_client
+    uri = os.getenv("RATE_LIMIT_REDIS_URI")
+    if not uri:
+        return None
+    if _redis_client is None:
+        if uri.startswith("fakeredis://"):
+            import fakeredis
+
+            _redis_client = fakeredis.FakeRedis()
+        else:
+            import redis
+
+            _redis_client = redis.Redis.from_url(uri)
+    return _redis_client
+
+
+def get_rate_limiter(model: str) -> RateLimiter:
+    """Return the process-wide rate limiter for `model`."""
+    limiter = _limiters.get(model)
+    if limiter is None:
+        with _lock:
+            limiter = _limiters.get(model)
+            if limiter is None:
+                limiter = RateLimiter(model, _limits_for(model), _get_redis_client())
+                _limiters[model] = limiter
+    return limiter
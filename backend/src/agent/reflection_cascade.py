@@ -0,0 +1,30 @@
+from typing import Optional
+
+from agent.tools_and_schemas import Reflection
+
+
+def escalation_reason(
+    result: Optional[Reflection], new_source_count: int, min_confidence: float
+) -> Optional[str]:
+    """Return why a fast model's reflection should be redone by the reflection model.
+
+    Args:
+        result: The fast model's reflection, or None if its output failed validation.
+        new_source_count: Distinct sources the loop being reflected on added.
+        min_confidence: Lowest confidence at which the verdict is kept.
+
+    Returns:
+        "invalid", "low_confidence" or "no_new_sources", or None to keep the verdict.
+    """
+    if (
+        result is None
+        # Asking for more research without saying what to search for
+        or (not result.is_sufficient and not result.follow_up_queries)
+    ):
+        return "invalid"
+    if result.confidence < min_confidence:
+        return "low_confidence"
+    # Another loop is unlikely to help when the last one found nothing new
+    if not result.is_sufficient and new_source_count == 0:
+        return "no_new_sources"
+    return None
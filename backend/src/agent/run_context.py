@@ -0,0 +1,81 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Mapping, Optional
+
+from langchain_core.runnables import RunnableConfig
+
+from agent.configuration import Configuration
+from agent.prompts import get_current_date
+from agent.utils import get_research_topic, get_run_key
+
+_lock = threading.Lock()
+# Contexts of recent turns, by run key and turn id
+_contexts: OrderedDict[tuple[str, Optional[str]], "RunContext"] = OrderedDict()
+_CONTEXTS_SIZE = 1024
+
+
+@dataclass(frozen=True)
+class RunContext:
+    """Values every node of one turn derives from its configuration and input.
+
+    `research_topic` is None when the context was built by a `Send` branch, whose
+    state does not carry the messages; the next node that has them rebuilds it.
+    """
+
+    configurable: Configuration
+    current_date: str
+    research_topic: Optional[str]
+    max_research_loops: int
+    # The model picked in the request overrides both configured models
+    reflection_model: str
+    answer_model: str
+    # Model tried before reflection_model, None when reflection is not cascaded
+    reflection_fast_model: Optional[str]
+
+
+def build_run_context(state: Mapping[str, Any], config: RunnableConfig) -> RunContext:
+    """Resolve the run context from a node's state and config."""
+    configurable = Configuration.from_runnable_config(config)
+    max_research_loops = state.get("max_research_loops")
+    reasoning_model = state.get("reasoning_model")
+    reflection_model = reasoning_model or configurable.reflection_model
+    return RunContext(
+        configurable=configurable,
+        current_date=get_current_date(),
+        research_topic=(
+            get_research_topic(state["messages"]) if "messages" in state else None
+        ),
+        max_research_loops=(
+            max_research_loops
+            if max_research_loops is not None
+            else configurable.max_research_loops
+        ),
+        reflection_model=reflection_model,
+        answer_model=reasoning_model or configurable.answer_model,
+        reflection_fast_model=(
+            configurable.reflection_fast_model
+            if configurable.reflection_fast_model not in ("", reflection_model)
+            else None
+        ),
+    )
+
+
+def get_run_context(state: Mapping[str, Any], config: RunnableConfig) -> RunContext:
+    """Return the run context of the turn a node invocation belongs to.
+
+    The context is resolved once per turn, identified by the run key and the state's
+    `turn_id`, and shared by every later node, router and branch of that turn in
+    this process.
+    """
+    key = (get_run_key(config), state.get("turn_id"))
+    with _lock:
+        context = _contexts.get(key)
+    if context is None or (context.research_topic is None and "messages" in state):
+        context = build_run_context(state, config)
+        with _lock:
+            _contexts[key] = context
+            _contexts.move_to_end(key)
+            while len(_contexts) > _CONTEXTS_SIZE:
+                _contexts.popitem(last=False)
+    return context
@@ -0,0 +1,243 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from types import SimpleNamespace
+from typing import Any, Optional
+
+from agent.metrics import SEARCH_CACHE_LOOKUPS
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a search query so trivially different spellings share a cache entry."""
+    return " ".join(query.lower().split())
+
+
+def cache_key(query: str, model: str, date_bucket: str) -> str:
+    """Build the cache key for a grounded search of `query` with `model`."""
+    raw = f"{model}\n{normalize_query(query)}\n{date_bucket}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def serialize_response(response: Any) -> dict:
+    """Extract the parts of a grounded Gemini response the web_research node uses."""
+    metadata = response.candidates[0].grounding_metadata
+    chunks = (metadata.grounding_chunks or []) if metadata else []
+    supports = (metadata.grounding_supports or []) if metadata else []
+    return {
+        "text": response.text,
+        "chunks": [{"uri": c.web.uri, "title": c.web.title} for c in chunks],
+        "supports": [
+            {
+                "start_index": s.segment.start_index,
+                "end_index": s.segment.end_index,
+                "grounding_chunk_indices": list(s.grounding_chunk_indices or []),
+            }
+            for s in supports
+            if s.segment is not None
+        ],
+    }
+
+
+def deserialize_response(payload: dict) -> SimpleNamespace:
+    """Rebuild a response object that `resolve_urls` and `get_citations` accept."""
+    metadata = SimpleNamespace(
+        grounding_chunks=[
+            SimpleNamespace(web=SimpleNamespace(uri=c["uri"], title=c["title"]))
+            for c in payload["chunks"]
+        ],
+        grounding_supports=[
+            SimpleNamespace(
+                segment=SimpleNamespace(
+                    start_index=s["start_index"], end_index=s["end_index"]
+                ),
+                grounding_chunk_indices=s["grounding_chunk_indices"],
+            )
+            for s in payload["supports"]
+        ],
+    )
+    return SimpleNamespace(
+        text=payload["text"],
+        candidates=[SimpleNamespace(grounding_metadata=metadata)],
+    )
+
+
+class _MemoryTier:
+    """Thread-safe LRU map of cache keys to (expiry, payload)."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: str, payload: dict, expires_at: float) -> None:
+        with self._lock:
+            self._entries[key] = (expires_at, payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class _SqliteTier:
+    """Persistent tier bounded by TTL and by the total size of stored payloads."""
+
+    def __init__(self, path: str, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS search_cache ("
+            " key TEXT PRIMARY KEY, payload TEXT NOT NULL, size INTEGER NOT NULL,"
+            " expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS search_cache_accessed"
+            " ON search_cache (accessed_at)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[tuple[float, dict]]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, expires_at FROM search_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] < now:
+                self._conn.execute("DELETE FROM search_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute(
+                "UPDATE search_cache SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+        return row[1], json.loads(row[0])
+
+    def put(self, key: str, payload: dict, expires_at: float) -> None:
+        data = json.dumps(payload)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO search_cache VALUES (?, ?, ?, ?, ?)",
+                (key, data, len(data), expires_at, now),
+            )
+            self._conn.execute("DELETE FROM search_cache WHERE expires_at < ?", (now,))
+            # Evict least recently used rows until the table fits the size budget.
+            self._conn.execute(
+                "DELETE FROM search_cache WHERE key IN ("
+                " SELECT key FROM ("
+                "  SELECT key, SUM(size) OVER (ORDER BY accessed_at DESC, key) AS total"
+                "  FROM search_cache)"
+                " WHERE total > ?)",
+                (self.max_bytes,),
+            )
+            self._conn.commit()
+
+
+class SearchCache:
+    """Two-tier cache of grounded web_research responses.
+
+    Lookups go to an in-memory LRU first and then to an optional SQLite file shared
+    by every worker on the host. Hits from SQLite are promoted to memory.
+    """
+
+    def __init__(
+        self,
+        memory_entries: int = 256,
+        sqlite_path: Optional[str] = None,
+        sqlite_max_bytes: int = 256 * 1024 * 1024,
+        ttl_seconds: float = 6 * 3600,
+    ):
+        """Create the cache; a tier with no entries or no path is left out."""
+        self.ttl_seconds = ttl_seconds
+        self._memory = _MemoryTier(memory_entries) if memory_entries > 0 else None
+        self._sqlite = (
+            _SqliteTier(sqlite_path, sqlite_max_bytes) if sqlite_path else None
+        )
+
+    @property
+    def enabled(self) -> bool:
+        """Whether any tier is configured."""
+        return self._memory is not None or self._sqlite is not None
+
+    def get(self, query: str, model: str, date_bucket: str) -> Optional[Any]:
+        """Return the cached response for a search, or None on a miss."""
+        key = cache_key(query, model, date_bucket)
+        if self._memory is not None:
+            payload = self._memory.get(key)
+            SEARCH_CACHE_LOOKUPS.labels(
+                "memory", "miss" if payload is None else "hit"
+            ).inc()
+            if payload is not None:
+                return deserialize_response(payload)
+        if self._sqlite is not None:
+            entry = self._sqlite.get(key)
+            SEARCH_CACHE_LOOKUPS.labels(
+                "sqlite", "miss" if entry is None else "hit"
+            ).inc()
+            if entry is not None:
+                expires_at, payload = entry
+                if self._memory is not None:
+                    self._memory.put(key, payload, expires_at)
+                return deserialize_response(payload)
+        return None
+
+    def put(self, query: str, model: str, date_bucket: str, response: Any) -> None:
+        """Store a grounded response in every configured tier."""
+        key = cache_key(query, model, date_bucket)
+        payload = serialize_response(response)
+        expires_at = time.time() + self.ttl_seconds
+        if self._memory is not None:
+            self._memory.put(key, payload, expires_at)
+        if self._sqlite is not None:
+            self._sqlite.put(key, payload, expires_at)
+
+    async def aget(self, query: str, model: str, date_bucket: str) -> Optional[Any]:
+        """Async variant of `get` that keeps SQLite I/O off the event loop."""
+        if not self.enabled:
+            return None
+        return await asyncio.to_thread(self.get, query, model, date_bucket)
+
+    async def aput(
+        self, query: str, model: str, date_bucket: str, response: Any
+    ) -> None:
+        """Async variant of `put` that keeps SQLite I/O off the event loop."""
+        if self.enabled:
+            await asyncio.to_thread(self.put, query, model, date_bucket, response)
+
+
+_cache: Optional[SearchCache] = None
+_lock = threading.Lock()
+
+
+def get_search_cache() -> SearchCache:
+    """Return the process-wide search cache configured from the environment."""
+    global _cache
+    if _cache is None:
+        with _lock:
+            if _cache is None:
+                _cache = SearchCache(
+                    memory_entries=int(os.getenv("SEARCH_CACHE_MEMORY_ENTRIES", 256)),
+                    sqlite_path=os.getenv("SEARCH_CACHE_PATH") or None,
+                    sqlite_max_bytes=int(
+                        os.getenv("SEARCH_CACHE_MAX_BYTES", 256 * 1024 * 1024)
+                    ),
+                    ttl_seconds=float(os.getenv("SEARCH_CACHE_TTL_SECONDS", 6 * 3600)),
+                )
+    return _cache
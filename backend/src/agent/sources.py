@@ -0,0 +1,57 @@
+from typing import Any, Dict, List, Optional, TypedDict
+
+
+class SourceTable(TypedDict):
+    """Run-level table of the sources cited by web research.
+
+    Each distinct source is stored once as a `(label, short_url, value)` record
+    whose integer id is its position in `records`. `refs` holds one id per citing
+    segment, in the order the segments were gathered, which is all the state needs
+    to reproduce the former per-segment `sources_gathered` list.
+    """
+
+    records: List[tuple]
+    refs: List[int]
+
+
+def _record_to_source(record: tuple) -> Dict[str, Any]:
+    label, short_url, value = record
+    return {"label": label, "short_url": short_url, "value": value}
+
+
+def add_sources(
+    table: Optional[SourceTable], update: Optional[List[Dict[str, Any]]]
+) -> SourceTable:
+    """Reducer that interns gathered sources into the run's source table.
+
+    Nodes keep returning `sources_gathered` as a list of `{label, short_url, value}`
+    dicts, so the payload streamed to the frontend does not change; only the stored
+    state is compact.
+    """
+    if isinstance(table, list):
+        # State checkpointed before sources were interned
+        table = add_sources(None, table)
+    records = list(table["records"]) if table else []
+    refs = list(table["refs"]) if table else []
+    # Short urls restart at the same ids on every turn of a thread, so a record is
+    # identified by its short url together with the url it stands for.
+    ids = {tuple(record[1:]): idx for idx, record in enumerate(records)}
+    for source in update or []:
+        key = (source["short_url"], source["value"])
+        source_id = ids.get(key)
+        if source_id is None:
+            source_id = ids[key] = len(records)
+            records.append((source["label"], source["short_url"], source["value"]))
+        refs.append(source_id)
+    return {"records": records, "refs": refs}
+
+
+def unique_sources(table: Optional[SourceTable]) -> List[Dict[str, Any]]:
+    """Return every distinct source in the table as a `sources_gathered` dict."""
+    return [_record_to_source(record) for record in (table or {}).get("records", [])]
+
+
+def source_url_count(table: Optional[SourceTable]) -> int:
+    """Return how many distinct urls the table's sources stand for."""
+    return len({record[2] for record in (table or {}).get("records", [])})
+
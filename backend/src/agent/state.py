@@ -1,34 +1,67 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import TypedDict
+from typing import Optional, TypedDict
 
 from langgraph.graph import add_messages
 from typing_extensions import Annotated
 
+from agent.sources import SourceTable, add_sources
+
 
 import operator
 from dataclasses import dataclass, field
 from typing_extensions import Annotated
 
 
+class AnswerDraft(TypedDict):
+    content: str
+    message_id: Optional[str]
+    sources: list[dict]
+    # Number of web_research results the draft was written from
+    result_count: int
+
+
 class OverallState(TypedDict):
     messages: Annotated[list, add_messages]
     search_query: Annotated[list, operator.add]
+    # Summaries, or `blob:sha256:` references to them when BLOB_STORE_URI is set
     web_research_result: Annotated[list, operator.add]
-    sources_gathered: Annotated[list, operator.add]
+    sources_gathered: Annotated[SourceTable, add_sources]
+    # Web research branches add the number of searches they were sent, so this is
+    # the first id no search of the thread has used yet
+    next_search_id: Annotated[int, operator.add]
     initial_search_query_count: int
     max_research_loops: int
     research_loop_count: int
     reasoning_model: str
+    research_digest: list[str]
+    digested_result_count: int
+    # Distinct source urls gathered up to the last reflection
+    reflected_source_count: int
+    trace_context: dict[str, str]
+    deadline: float
+    # Identifies one turn of a thread; late searches and the run context are kept by it
+    turn_id: str
+    answer_draft: Optional[AnswerDraft]
 
 
 class ReflectionState(TypedDict):
+    messages: Annotated[list, add_messages]
+    search_query: Annotated[list, operator.add]
+    web_research_result: Annotated[list, operator.add]
+    sources_gathered: Annotated[SourceTable, add_sources]
+    next_search_id: Annotated[int, operator.add]
+    reasoning_model: str
+    max_research_loops: int
     is_sufficient: bool
     knowledge_gap: str
     follow_up_queries: Annotated[list, operator.add]
     research_loop_count: int
     number_of_ran_queries: int
+    trace_context: dict[str, str]
+    deadline: float
+    turn_id: str
 
 
 class Query(TypedDict):
@@ -38,11 +71,19 @@ class Query(TypedDict):
 
 class QueryGenerationState(TypedDict):
     query_list: list[Query]
+    trace_context: dict[str, str]
+    deadline: float
+    turn_id: str
 
 
 class WebSearchState(TypedDict):
     search_query: str
+    # All of a loop's queries when the branch waits only for a quorum of them
+    search_queries: list[str]
     id: str
+    trace_context: dict[str, str]
+    deadline: float
+    turn_id: str
 
 
 @dataclass(kw_only=True)
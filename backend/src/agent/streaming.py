@@ -0,0 +1,90 @@
+from typing import Any, AsyncIterator, Iterator, List, Optional
+
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForLLMRun,
+    CallbackManagerForLLMRun,
+)
+from langchain_core.language_models import BaseChatModel
+from langchain_core.language_models.chat_models import generate_from_stream
+from langchain_core.messages import AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGenerationChunk, ChatResult
+
+from agent.utils import ShortUrlRewriter
+
+
+def message_text(message: BaseMessage) -> str:
+    """Return the plain text of a message whose content may be a list of blocks."""
+    if isinstance(message.content, str):
+        return message.content
+    return "".join(
+        block if isinstance(block, str) else block.get("text", "")
+        for block in message.content
+        if isinstance(block, str) or block.get("type") == "text"
+    )
+
+
+class ShortUrlRewritingChatModel(BaseChatModel):
+    """Chat model wrapper that streams another model's output with short urls resolved.
+
+    The wrapped model runs with the `nostream` tag, so LangGraph's `messages` stream
+    only carries the rewritten chunks emitted by this wrapper and clients never see
+    a short url.
+    """
+
+    llm: BaseChatModel
+    rewriter: ShortUrlRewriter
+
+    model_config = {"arbitrary_types_allowed": True}
+
+    @property
+    def _llm_type(self) -> str:
+        return "short-url-rewriting"
+
+    def _child_config(self, run_manager: Any) -> dict:
+        return {
+            "callbacks": run_manager.get_child() if run_manager else None,
+            "tags": ["nostream"],
+        }
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        config = self._child_config(run_manager)
+        for chunk in self.llm.stream(messages, config, stop=stop, **kwargs):
+            text = self.rewriter.feed(message_text(chunk))
+            if text:
+                yield ChatGenerationChunk(message=AIMessageChunk(content=text))
+        tail = self.rewriter.flush()
+        if tail:
+            yield ChatGenerationChunk(message=AIMessageChunk(content=tail))
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        config = self._child_config(run_manager)
+        async for chunk in self.llm.astream(messages, config, stop=stop, **kwargs):
+            text = self.rewriter.feed(message_text(chunk))
+            if text:
+                yield ChatGenerationChunk(message=AIMessageChunk(content=text))
+        tail = self.rewriter.flush()
+        if tail:
+            yield ChatGenerationChunk(message=AIMessageChunk(content=tail))
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        return generate_from_stream(
+            self._stream(messages, stop=stop, run_manager=run_manager, **kwargs)
+        )
@@ -21,3 +21,8 @@ class Reflection(BaseModel):
     follow_up_queries: List[str] = Field(
         description="A list of follow-up queries to address the knowledge gap."
     )
+    confidence: float = Field(
+        ge=0,
+        le=1,
+        description="How confident the assessment is, from 0 (a guess) to 1 (certain).",
+    )
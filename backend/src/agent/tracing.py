@@ -0,0 +1,142 @@
+import functools
+import os
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Iterator, Optional
+
+from opentelemetry import context as otel_context
+from opentelemetry import propagate, trace
+
+_TRACER_NAME = "agent"
+
+
+def _tracer() -> trace.Tracer:
+    # Resolved on every call so a provider configured after import is picked up
+    return trace.get_tracer(_TRACER_NAME)
+
+
+def inject_trace_context() -> dict[str, str]:
+    """Serialize the active span context into a carrier that can travel in state."""
+    carrier: dict[str, str] = {}
+    propagate.inject(carrier)
+    return carrier
+
+
+def extract_trace_context(
+    carrier: Optional[dict[str, str]],
+) -> Optional[otel_context.Context]:
+    """Rebuild a parent context from a carrier stored in state or a `Send` payload."""
+    return propagate.extract(carrier) if carrier else None
+
+
+def _attributes(attributes: dict[str, Any]) -> dict[str, Any]:
+    return {key: value for key, value in attributes.items() if value is not None}
+
+
+@contextmanager
+def traced(
+    name: str, attributes: Optional[dict[str, Any]] = None
+) -> Iterator[trace.Span]:
+    """Run a block inside a child span of the current span."""
+    with _tracer().start_as_current_span(
+        name, attributes=_attributes(attributes or {})
+    ) as span:
+        yield span
+
+
+def traced_gemini_call(model: str, operation: str) -> Any:
+    """Span around one Gemini request, named and tagged after the GenAI conventions."""
+    return traced(
+        f"{operation} {model}",
+        {
+            "gen_ai.system": "gemini",
+            "gen_ai.operation.name": operation,
+            "gen_ai.request.model": model,
+        },
+    )
+
+
+def traced_node(
+    node: Optional[Callable[..., Awaitable[Any]]] = None, *, entry: bool = False
+) -> Any:
+    """Run an async graph node inside a span.
+
+    LangGraph executes every node, including each `Send` branch, as its own task,
+    so spans do not nest on their own. Instead the entry node stores its span
+    context in the `trace_context` state key, routers copy it into their `Send`
+    payloads, and every later node opens its span as a child of that context. A
+    run is therefore one trace whatever the fan-out or number of research loops.
+
+    Args:
+        node: The node function, when used as a bare decorator.
+        entry: Whether this is the run's entry node. Entry nodes ignore any
+            `trace_context` left in a thread's state by an earlier turn and
+            parent their span on the caller's active span instead.
+    """
+
+    def decorate(node: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        name = node.__name__
+
+        @functools.wraps(node)
+        async def wrapper(state: dict, config: Any = None) -> Any:
+            parent = (
+                None if entry else extract_trace_context(state.get("trace_context"))
+            )
+            metadata = (config or {}).get("metadata", {})
+            attributes = {
+                "langgraph.node": name,
+                "langgraph.step": metadata.get("langgraph_step"),
+                "langgraph.thread_id": metadata.get("thread_id"),
+                "agent.research_loop": state.get("research_loop_count"),
+                "agent.search_query": state.get("search_query")
+                if isinstance(state.get("search_query"), str)
+                else None,
+            }
+            with _tracer().start_as_current_span(
+                f"node {name}",
+                context=parent,
+                attributes=_attributes(attributes),
+            ):
+                result = await node(state, config)
+                if entry:
+                    result = {**result, "trace_context": inject_trace_context()}
+            return result
+
+        return wrapper
+
+    return decorate(node) if node is not None else decorate
+
+
+def configure_tracing(exporter: Optional[str] = None) -> Any:
+    """Install an OpenTelemetry SDK tracer provider with a simple exporter.
+
+    Deployments that already configure OpenTelemetry (e.g. with
+    `opentelemetry-instrument`) do not need this. Requires the `tracing` extra.
+
+    Args:
+        exporter: `console` to print finished spans or `memory` to keep them in an
+            `InMemorySpanExporter`. Defaults to the `AGENT_TRACE_EXPORTER`
+            environment variable.
+
+    Returns:
+        The span exporter, so callers can read spans from the in-memory one.
+    """
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import (
+        ConsoleSpanExporter,
+        SimpleSpanProcessor,
+    )
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+        InMemorySpanExporter,
+    )
+
+    exporter = exporter or os.getenv("AGENT_TRACE_EXPORTER", "console")
+    if exporter == "memory":
+        span_exporter = InMemorySpanExporter()
+    elif exporter == "console":
+        span_exporter = ConsoleSpanExporter()
+    else:
+        raise ValueError(f"Unknown trace exporter: {exporter}")
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(span_exporter))
+    trace.set_tracer_provider(provider)
+    return span_exporter
@@ -1,5 +1,7 @@
+import re
 from typing import Any, Dict, List
 from langchain_core.messages import AnyMessage, AIMessage, HumanMessage
+from langchain_core.runnables import RunnableConfig
 
 
 def get_research_topic(messages: List[AnyMessage]) -> str:
@@ -19,6 +21,164 @@ def get_research_topic(messages: List[AnyMessage]) -> str:
     return research_topic
 
 
+def get_run_key(config: RunnableConfig) -> str:
+    """
+    Get a key that identifies the graph run a node invocation belongs to.
+    Prefers the run id set by langgraph-api, then the thread id. Local runs without
+    either fall back to the parent checkpoint id, which all branches of one
+    superstep share.
+    """
+    configurable = config.get("configurable", {})
+    metadata = config.get("metadata", {})
+    for key in (
+        configurable.get("run_id"),
+        metadata.get("run_id"),
+        configurable.get("thread_id"),
+    ):
+        if key:
+            return str(key)
+    return str(configurable.get("checkpoint_map", {}).get("", ""))
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of Gemini tokens in a text without calling the API.
+    Uses the usual ~4 characters per token rule of thumb for English text.
+    """
+    return len(text) // 4 + 1
+
+
+def _trie_pattern(words: List[str]) -> str:
+    """
+    Build a regex alternation of `words` factored into a prefix trie, so matching
+    walks the shared prefix once instead of trying every word at every position.
+    """
+    trie: Dict[str, Any] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict[str, Any]) -> str:
+        alternatives = [
+            re.escape(char) + build(child) for char, child in node.items() if char
+        ]
+        if not alternatives:
+            return ""
+        optional = "" in node
+        if len(alternatives) == 1 and not optional:
+            return alternatives[0]
+        return "(?:" + "|".join(alternatives) + ")" + ("?" if optional else "")
+
+    return build(trie)
+
+
+class ShortUrlSubstituter:
+    """
+    Replaces every known short url in a text with its original url in a single pass.
+    All short urls are matched by one compiled trie-shaped alternation; a match must
+    not be followed by another url character, so ".../id/0-1" never matches inside
+    ".../id/0-12". Sources that were substituted are collected once each, in order of
+    first use, in `used_sources`.
+    """
+
+    def __init__(self, sources: List[Dict[str, Any]]):
+        """
+        Compile the pattern for `sources`; the first source of a short url wins.
+        """
+        self._sources: Dict[str, Dict[str, Any]] = {}
+        for source in sources:
+            self._sources.setdefault(source["short_url"], source)
+        self._pattern = (
+            re.compile(_trie_pattern(list(self._sources)) + r"(?![\w-])")
+            if self._sources
+            else None
+        )
+        self._used = set()
+        self.used_sources: List[Dict[str, Any]] = []
+
+    def _replace(self, match: re.Match) -> str:
+        source = self._sources[match.group(0)]
+        if match.group(0) not in self._used:
+            self._used.add(match.group(0))
+            self.used_sources.append(source)
+        return source["value"]
+
+    def substitute(self, text: str) -> str:
+        """
+        Return `text` with every known short url replaced by its original url.
+        """
+        if self._pattern is None:
+            return text
+        return self._pattern.sub(self._replace, text)
+
+
+def replace_short_urls(
+    text: str, sources: List[Dict[str, Any]]
+) -> tuple[str, List[Dict[str, Any]]]:
+    """
+    Replace the short urls in a text with the original urls.
+
+    Returns:
+        The rewritten text and the deduplicated sources it uses.
+    """
+    substituter = ShortUrlSubstituter(sources)
+    return substituter.substitute(text), substituter.used_sources
+
+
+class ShortUrlRewriter:
+    """
+    Incrementally replaces short urls with the original urls in streamed text.
+    Text is held back only while it could still be part of a short url, so a url
+    split across chunk boundaries is rewritten as a whole. Every source whose short
+    url was seen is collected once in `used_sources`.
+    """
+
+    PREFIX = "https://vertexaisearch.cloud.google.com/id/"
+    _OPEN_SHORT_URL_RE = re.compile(re.escape(PREFIX) + r"[\w-]*\Z")
+
+    def __init__(self, sources: List[Dict[str, Any]]):
+        """
+        Start an empty stream resolving short urls against `sources`.
+        """
+        self._substituter = ShortUrlSubstituter(sources)
+        self._buffer = ""
+
+    @property
+    def used_sources(self) -> List[Dict[str, Any]]:
+        """Sources whose short urls were rewritten so far, deduplicated."""
+        return self._substituter.used_sources
+
+    def _hold_from(self) -> int:
+        buffer = self._buffer
+        # A short url running to the end of the buffer may continue in the next chunk
+        match = self._OPEN_SHORT_URL_RE.search(buffer)
+        if match:
+            return match.start()
+        # A suffix of the buffer that is a prefix of PREFIX may still become a short url
+        for idx in range(max(len(buffer) - len(self.PREFIX) + 1, 0), len(buffer)):
+            if self.PREFIX.startswith(buffer[idx:]):
+                return idx
+        return len(buffer)
+
+    def feed(self, chunk: str) -> str:
+        """
+        Add a chunk of streamed text and return the rewritten text that is safe to emit.
+        """
+        self._buffer += chunk
+        hold = self._hold_from()
+        text, self._buffer = self._buffer[:hold], self._buffer[hold:]
+        return self._substituter.substitute(text)
+
+    def flush(self) -> str:
+        """
+        Rewrite and return whatever text is still held back at the end of the stream.
+        """
+        text, self._buffer = self._buffer, ""
+        return self._substituter.substitute(text)
+
+
 def resolve_urls(urls_to_resolve: List[Any], id: int) -> Dict[str, str]:
     """
     Create a map of the vertex ai search urls (very long) to a short url with a unique id for each url.
@@ -36,43 +196,51 @@ def resolve_urls(urls_to_resolve: List[Any], id: int) -> Dict[str, str]:
     return resolved_map
 
 
-def insert_citation_markers(text, citations_list):
+def insert_citation_markers(text, citations_list, byte_offsets=False):
     """
     Inserts citation markers into a text string based on start and end indices.
 
+    The insertion points are collected and sorted once, and the output is written in
+    a single pass, so the cost is linear in the text length plus the number of
+    citations. Citations that share an end_index are inserted in start_index order,
+    keeping their original order for equal start indices.
+
     Args:
         text (str): The original text string.
         citations_list (list): A list of dictionaries, where each dictionary
                                contains 'start_index', 'end_index', and
-                               'segment_string' (the marker to insert).
+                               'segments' (the sources to link).
                                Indices are assumed to be for the original text.
+        byte_offsets (bool): Whether the indices are byte offsets into the UTF-8
+                             encoding of the text, as Gemini grounding segments
+                             are, rather than character offsets.
 
     Returns:
         str: The text with citation markers inserted.
     """
-    # Sort citations by end_index in descending order.
-    # If end_index is the same, secondary sort by start_index descending.
-    # This ensures that insertions at the end of the string don't affect
-    # the indices of earlier parts of the string that still need to be processed.
+    if byte_offsets:
+        buffer = memoryview(text.encode("utf-8"))
+    else:
+        buffer = text
+    length = len(buffer)
+
     sorted_citations = sorted(
-        citations_list, key=lambda c: (c["end_index"], c["start_index"]), reverse=True
+        citations_list, key=lambda c: (c["end_index"], c["start_index"])
     )
 
-    modified_text = text
+    parts = []
+    position = 0
     for citation_info in sorted_citations:
-        # These indices refer to positions in the *original* text,
-        # but since we iterate from the end, they remain valid for insertion
-        # relative to the parts of the string already processed.
-        end_idx = citation_info["end_index"]
-        marker_to_insert = ""
+        end_idx = min(max(citation_info["end_index"], position), length)
+        if end_idx > position:
+            chunk = buffer[position:end_idx]
+            parts.append(str(chunk, "utf-8", "replace") if byte_offsets else chunk)
+            position = end_idx
         for segment in citation_info["segments"]:
-            marker_to_insert += f" [{segment['label']}]({segment['short_url']})"
-        # Insert the citation marker at the original end_idx position
-        modified_text = (
-            modified_text[:end_idx] + marker_to_insert + modified_text[end_idx:]
-        )
-
-    return modified_text
+            parts.append(f" [{segment['label']}]({segment['short_url']})")
+    tail = buffer[position:]
+    parts.append(str(tail, "utf-8", "replace") if byte_offsets else tail)
+    return "".join(parts)
 
 
 def get_citations(response, resolved_urls_map):
@@ -0,0 +1,41 @@
+import pytest
+from prometheus_client import REGISTRY
+
+from agent import clients, context_cache, fake_backend, search_cache
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def fake_gemini(monkeypatch):
+    """Point the graph at a fresh offline fake backend with short latencies."""
+    monkeypatch.setenv("GEMINI_BACKEND", "fake")
+    monkeypatch.setenv("FAKE_GEMINI_LATENCY_SECONDS", "0.01")
+    monkeypatch.setenv("SEARCH_CACHE_MEMORY_ENTRIES", "0")
+    monkeypatch.delenv("SEARCH_CACHE_PATH", raising=False)
+    monkeypatch.setattr(clients, "_genai_client", None)
+    monkeypatch.setattr(clients, "_chat_models", {})
+    monkeypatch.setattr(clients, "_structured_models", {})
+    monkeypatch.setattr(context_cache, "_managers", {})
+    monkeypatch.setattr(fake_backend, "_caches", {})
+    monkeypatch.setattr(search_cache, "_cache", None)
+    return monkeypatch
+
+
+def _metric_total(name, **labels):
+    return sum(
+        sample.value
+        for family in REGISTRY.collect()
+        for sample in family.samples
+        if sample.name == name
+        and all(sample.labels.get(key) == value for key, value in labels.items())
+    )
+
+
+@pytest.fixture
+def metric():
+    """Return a metric's current total, summed over the labels not given."""
+    return _metric_total
@@ -0,0 +1,67 @@
+import pytest
+
+from agent.answer_context import (
+    assemble_context,
+    rank_summaries,
+    unseen_content_share,
+)
+from agent.utils import estimate_tokens
+
+LINK = "[source](https://vertexaisearch.cloud.google.com/id/0-0)"
+TOPIC = "heat pump adoption in Europe"
+OFF_TOPIC = f"Electric cars sold well in Asia last year {LINK}. " * 3
+PARTLY = f"Heat pump installers are scarce {LINK}. Prices vary widely by country. " * 3
+RELEVANT = f"Heat pump adoption in Europe doubled {LINK}. Germany led the growth. " * 3
+
+
+def test_summaries_rank_by_topic_relevance():
+    assert rank_summaries([OFF_TOPIC, PARTLY, RELEVANT], TOPIC) == [2, 1, 0]
+
+
+def test_citation_density_breaks_relevance_ties():
+    sparse = "Heat pump adoption rose. " * 4 + LINK
+    dense = f"Heat pump adoption rose {LINK}. " * 4
+    assert rank_summaries([sparse, dense], TOPIC) == [1, 0]
+
+
+def test_everything_is_kept_when_it_fits():
+    summaries = [OFF_TOPIC, PARTLY, RELEVANT]
+    assert assemble_context(summaries, TOPIC, 10_000) == summaries
+
+
+def test_budget_is_filled_best_first_and_kept_in_order():
+    summaries = [OFF_TOPIC, PARTLY, RELEVANT]
+    budget = estimate_tokens(RELEVANT) + 30
+    packed = assemble_context(summaries, TOPIC, budget)
+    # The relevant summary fits whole and the next best contributes its lead
+    # sentences, cut after a citation link rather than inside one
+    assert packed == [f"Heat pump installers are scarce {LINK}.", RELEVANT]
+    assert sum(estimate_tokens(summary) for summary in packed) <= budget
+
+
+def test_summaries_without_a_fitting_sentence_are_left_out():
+    assert assemble_context([OFF_TOPIC, RELEVANT], TOPIC, 5) == []
+
+
+def test_restated_findings_add_nothing():
+    drafted = [f"Heat pump sales grew 12 percent in 2024 {LINK}."]
+    new = ["In 2024 heat pump sales grew 12 percent."]
+    assert unseen_content_share(drafted, new) == 0
+
+
+def test_share_counts_new_words_against_all_material():
+    drafted = ["heat pump sales grew"]
+    new = ["heat pump prices fell"]
+    # prices and fell are new; 8 content words in all
+    assert unseen_content_share(drafted, new) == pytest.approx(2 / 8)
+
+
+def test_same_findings_count_less_after_more_research():
+    new = ["installers report long waiting lists"]
+    little = unseen_content_share(["heat pump sales grew"], new)
+    more = unseen_content_share(["heat pump sales grew"] * 5, new)
+    assert more < little
+
+
+def test_no_material():
+    assert unseen_content_share([], []) == 0
@@ -0,0 +1,28 @@
+import pytest
+
+from agent import blob_store
+from agent.blob_store import BlobStore, FilesystemBlobStore, is_blob_ref
+
+
+def test_blob_store_is_abstract():
+    with pytest.raises(TypeError):
+        BlobStore()
+
+
+def test_filesystem_store_round_trip(tmp_path):
+    store = FilesystemBlobStore(str(tmp_path))
+    ref = store.put(b"summary")
+    assert is_blob_ref(ref)
+    assert store.put(b"summary") == ref
+    assert store.get(ref) == b"summary"
+
+
+def test_large_texts_are_offloaded(tmp_path, monkeypatch):
+    monkeypatch.setenv("BLOB_STORE_URI", f"file://{tmp_path}")
+    monkeypatch.setenv("BLOB_OFFLOAD_MIN_BYTES", "10")
+    monkeypatch.setattr(blob_store, "_recent", blob_store.OrderedDict())
+    assert blob_store.offload_text("short") == "short"
+    ref = blob_store.offload_text("a long research summary")
+    assert is_blob_ref(ref)
+    blob_store._recent.clear()
+    assert blob_store.load_text(ref) == "a long research summary"
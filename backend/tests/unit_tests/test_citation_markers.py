@@ -0,0 +1,63 @@
+from agent.utils import insert_citation_markers
+
+
+def insert_by_slicing(text, citations_list):
+    """The former implementation, inserting each citation by character index."""
+    sorted_citations = sorted(
+        citations_list, key=lambda c: (c["end_index"], c["start_index"]), reverse=True
+    )
+    for citation in sorted_citations:
+        end_idx = citation["end_index"]
+        marker = "".join(
+            f" [{segment['label']}]({segment['short_url']})"
+            for segment in citation["segments"]
+        )
+        text = text[:end_idx] + marker + text[end_idx:]
+    return text
+
+
+def citation(text, start, end, label, byte_offsets=False):
+    """Cite `text[start:end]`, indexed by characters or by UTF-8 bytes."""
+    if byte_offsets:
+        start = len(text[:start].encode("utf-8"))
+        end = len(text[:end].encode("utf-8"))
+    segment = {"label": label, "short_url": f"https://short/{label}"}
+    return {"start_index": start, "end_index": end, "segments": [segment]}
+
+
+TEXT = "Un café — naïve prix: 3 €. Ensuite, 東京 reste cher."
+# Two supports end after "€." and one ends inside the multibyte tail
+SPANS = [(0, 26, "b"), (10, 26, "a"), (36, 38, "c")]
+
+
+def test_character_offsets_match_the_former_implementation():
+    citations = [citation(TEXT, *span) for span in SPANS]
+    assert insert_citation_markers(TEXT, citations) == insert_by_slicing(
+        TEXT, citations
+    )
+
+
+def test_byte_offsets_place_markers_like_character_offsets():
+    by_char = [citation(TEXT, *span) for span in SPANS]
+    by_byte = [citation(TEXT, *span, byte_offsets=True) for span in SPANS]
+    assert by_byte != by_char
+    result = insert_citation_markers(TEXT, by_byte, byte_offsets=True)
+    assert result == insert_by_slicing(TEXT, by_char)
+    assert result == (
+        "Un café — naïve prix: 3 €. [b](https://short/b) [a](https://short/a) "
+        "Ensuite, 東京 [c](https://short/c) reste cher."
+    )
+
+
+def test_citations_sharing_both_indices_keep_their_order():
+    citations = [citation(TEXT, 0, 7, "x"), citation(TEXT, 0, 7, "y")]
+    assert insert_citation_markers(TEXT, citations).startswith(
+        "Un café [x](https://short/x) [y](https://short/y) —"
+    )
+
+
+def test_out_of_range_offsets_are_clamped():
+    citations = [citation(TEXT, 0, 1_000, "end")]
+    assert insert_citation_markers(TEXT, citations, byte_offsets=True) == (
+        TEXT + " [end](https://short/end)"
+    )
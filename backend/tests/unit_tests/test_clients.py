@@ -0,0 +1,27 @@
+import pytest
+
+from agent import clients
+from agent.fake_backend import fake_cached_contents
+from agent.tools_and_schemas import SearchQueryList
+
+
+@pytest.mark.anyio
+async def test_cache_names_do_not_grow_the_pools(fake_gemini):
+    client = clients.get_genai_client()
+    for index in range(5):
+        cache = await client.aio.caches.create(
+            model="gemini-2.5-flash",
+            config={"contents": [f"Cached text {index}. " * 400], "ttl": "60s"},
+        )
+        structured = clients.get_structured_model(
+            "gemini-2.5-flash", SearchQueryList, cached_content=cache.name
+        )
+        result = await structured.ainvoke("Maximum number of queries: 2")
+        assert len(result.query) == 2
+        message = await clients.get_chat_model("gemini-2.5-flash").ainvoke(
+            "Answer", cached_content=cache.name
+        )
+        assert message.usage_metadata["input_token_details"]["cache_read"] > 0
+        assert fake_cached_contents(cache.name, "gemini-2.5-flash")
+    assert len(clients._chat_models) == 1
+    assert len(clients._structured_models) == 1
@@ -0,0 +1,30 @@
+import pytest
+from langchain_core.messages import HumanMessage
+
+from agent import deadline
+from agent.graph import graph
+
+
+@pytest.mark.anyio
+async def test_answer_outlives_a_tight_deadline(fake_gemini):
+    fake_gemini.setattr(deadline, "MIN_CALL_TIMEOUT_SECONDS", 0.01)
+    # Streaming the answer alone takes longer than the whole run's budget
+    fake_gemini.setenv("FAKE_GEMINI_TOKENS_PER_SECOND", "2000")
+    state = await graph.ainvoke(
+        {"messages": [HumanMessage(content="Deadline question")]},
+        {"configurable": {"deadline_seconds": 0.05, "max_research_loops": 1}},
+    )
+    assert state["messages"][-1].content
+    assert state["search_query"]
+
+
+@pytest.mark.anyio
+async def test_query_generation_falls_back_to_the_question(fake_gemini):
+    fake_gemini.setattr(deadline, "MIN_CALL_TIMEOUT_SECONDS", 0.01)
+    fake_gemini.setenv("FAKE_GEMINI_LATENCY_SECONDS", "0.2")
+    state = await graph.ainvoke(
+        {"messages": [HumanMessage(content="Slow question")]},
+        {"configurable": {"deadline_seconds": 0.05, "max_research_loops": 1}},
+    )
+    assert state["search_query"] == ["Slow question"]
+    assert state["messages"][-1].content
@@ -0,0 +1,57 @@
+from agent.digest import (
+    split_sentences,
+    strip_citation_links,
+    truncate_to_tokens,
+    update_digest,
+)
+from agent.utils import estimate_tokens
+
+LINK = "[reuters](https://vertexaisearch.cloud.google.com/id/0-1)"
+
+
+def summary(topic, sentences=6):
+    return " ".join(
+        f"Finding {n} about {topic} was reported in detail. {LINK}"
+        for n in range(sentences)
+    )
+
+
+def test_citation_markers_stay_with_their_sentence():
+    text = f"Prices fell. {LINK} Sales rose! {LINK} {LINK} Outlook unclear"
+    assert split_sentences(text) == [
+        f"Prices fell. {LINK}",
+        f"Sales rose! {LINK} {LINK}",
+        "Outlook unclear",
+    ]
+
+
+def test_truncation_keeps_whole_leading_sentences():
+    text = "First sentence here. Second sentence here. Third sentence here."
+    assert truncate_to_tokens(text, 100) == text
+    assert truncate_to_tokens(text, 12) == "First sentence here. Second sentence here."
+    # A first sentence longer than the budget is cut at a word boundary
+    assert truncate_to_tokens("word " * 40, 5) == "word word word word"
+
+
+def test_digest_drops_citation_links():
+    (entry,) = update_digest([], [summary("solar")], 10_000)
+    assert entry == strip_citation_links(summary("solar"))
+    assert "vertexaisearch" not in entry
+
+
+def test_digest_is_updated_incrementally_within_its_budget():
+    budget = 120
+    digest = update_digest([], [summary("solar"), summary("wind")], budget)
+    assert sum(estimate_tokens(entry) for entry in digest) <= budget
+    later = update_digest(digest, [summary("hydro")], budget)
+    assert len(later) == 3
+    assert sum(estimate_tokens(entry) for entry in later) <= budget
+    # Earlier entries are only ever condensed, never rebuilt from the summaries
+    for before, after in zip(digest, later):
+        assert before.startswith(after)
+        assert len(after) < len(before)
+    assert later[2].startswith("Finding 0 about hydro")
+
+
+def test_empty_digest_stays_empty():
+    assert update_digest([], [], 100) == []
@@ -0,0 +1,106 @@
+import asyncio
+
+import pytest
+
+from agent.hedging import MIN_SAMPLES, LatencyTracker, hedged_call
+
+
+def warm_tracker(seconds=0.01, samples=MIN_SAMPLES):
+    tracker = LatencyTracker()
+    for _ in range(samples):
+        tracker.observe(seconds)
+    return tracker
+
+
+class Calls:
+    """Records each send and whether it ran to completion or was cancelled."""
+
+    def __init__(self, primary_seconds, hedge_seconds=0.0, primary_error=None):
+        self.seconds = {False: primary_seconds, True: hedge_seconds}
+        self.primary_error = primary_error
+        self.sent = []
+        self.cancelled = []
+
+    async def send(self, hedge):
+        self.sent.append(hedge)
+        try:
+            await asyncio.sleep(self.seconds[hedge])
+        except asyncio.CancelledError:
+            self.cancelled.append(hedge)
+            raise
+        if not hedge and self.primary_error:
+            raise self.primary_error
+        return "hedge" if hedge else "primary"
+
+
+def test_percentile_needs_enough_samples():
+    tracker = LatencyTracker()
+    for seconds in range(1, MIN_SAMPLES):
+        tracker.observe(seconds)
+    assert tracker.percentile(95) is None
+    tracker.observe(MIN_SAMPLES)
+    assert tracker.percentile(95) == 19
+    assert tracker.percentile(50) == 10
+
+
+def test_hedge_rate_is_capped():
+    tracker = LatencyTracker()
+    for hedged in [True] + [False] * 8:
+        tracker.record_call(hedged)
+    # A second hedge in ten calls is over a 10% budget; one in eleven is not
+    assert not tracker.can_hedge(0.1)
+    tracker.record_call(False)
+    assert tracker.can_hedge(0.2)
+
+
+@pytest.mark.anyio
+async def test_no_hedge_before_the_tracker_is_warm():
+    calls = Calls(primary_seconds=0.05)
+    result = await hedged_call(calls.send, warm_tracker(samples=5), 95, 1.0)
+    assert (result, calls.sent) == ("primary", [False])
+
+
+@pytest.mark.anyio
+async def test_fast_call_is_not_hedged():
+    calls = Calls(primary_seconds=0)
+    result = await hedged_call(calls.send, warm_tracker(seconds=1), 95, 1.0)
+    assert (result, calls.sent) == ("primary", [False])
+
+
+@pytest.mark.anyio
+async def test_slow_call_is_hedged_and_the_loser_cancelled():
+    calls = Calls(primary_seconds=5)
+    tracker = warm_tracker()
+    result = await hedged_call(calls.send, tracker, 95, 1.0)
+    assert result == "hedge"
+    assert calls.sent == [False, True]
+    # The loser is cancelled on return and stops at its next step
+    await asyncio.sleep(0)
+    assert calls.cancelled == [False]
+    assert list(tracker._hedged) == [True]
+
+
+@pytest.mark.anyio
+async def test_primary_still_wins_a_race_it_finishes_first():
+    calls = Calls(primary_seconds=0.05, hedge_seconds=5)
+    result = await hedged_call(calls.send, warm_tracker(), 95, 1.0)
+    assert result == "primary"
+    await asyncio.sleep(0)
+    assert calls.cancelled == [True]
+
+
+@pytest.mark.anyio
+async def test_no_hedge_over_the_rate_budget():
+    calls = Calls(primary_seconds=0.05)
+    result = await hedged_call(calls.send, warm_tracker(), 95, 0)
+    assert (result, calls.sent) == ("primary", [False])
+
+
+@pytest.mark.anyio
+async def test_failed_call_loses_to_a_hedge_that_succeeds():
+    calls = Calls(primary_seconds=0.05, hedge_seconds=0.1, primary_error=OSError())
+    assert await hedged_call(calls.send, warm_tracker(), 95, 1.0) == "hedge"
+    # Once nothing else is running the failure is raised
+    calls = Calls(primary_seconds=0, primary_error=OSError())
+    with pytest.raises(OSError):
+        await hedged_call(calls.send, warm_tracker(seconds=1), 95, 1.0)
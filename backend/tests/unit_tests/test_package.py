@@ -0,0 +1,22 @@
+import subprocess
+import sys
+
+import pytest
+
+
+@pytest.mark.parametrize(
+    "first_import",
+    [
+        "import agent",
+        "import agent.graph",
+        "from agent.graph import builder",
+        "import importlib; importlib.import_module('agent.graph')",
+    ],
+)
+def test_package_exports_the_compiled_graph(first_import):
+    # The import order matters, so each case runs in a fresh interpreter
+    code = f"{first_import}\nfrom agent import graph\nprint(type(graph).__name__)\n"
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "CompiledStateGraph"
@@ -0,0 +1,103 @@
+import sys
+
+import pytest
+from langchain_core.messages import HumanMessage
+
+from agent import prompts
+from agent.clients import get_genai_client
+from agent.context_cache import REFRESH_FRACTION, cached_prompt, get_context_cache
+from agent.graph import graph
+from agent.utils import estimate_tokens
+
+# Above the explicit cache minimum of both 2.5 Flash and 2.5 Pro
+TEXT = "Static instructions. " * 500
+
+
+@pytest.mark.anyio
+async def test_cache_is_created_once_and_reused(fake_gemini, metric):
+    created = metric("agent_context_cache_operations_total", operation="created")
+    manager = get_context_cache(60)
+    name = await manager.aget("gemini-2.5-flash", TEXT)
+    assert name is not None
+    assert await manager.aget("gemini-2.5-flash", TEXT) == name
+    assert (
+        metric("agent_context_cache_operations_total", operation="created") - created
+        == 1
+    )
+    # Another model cannot read the first model's cache
+    assert await manager.aget("gemini-2.5-pro", TEXT) != name
+
+
+@pytest.mark.anyio
+async def test_cache_is_extended_near_expiry(fake_gemini, metric):
+    refreshed = metric("agent_context_cache_operations_total", operation="refreshed")
+    manager = get_context_cache(60)
+    name = await manager.aget("gemini-2.5-flash", TEXT)
+    (handle,) = manager._handles.values()
+    handle.expires_at -= 60 * (1 - REFRESH_FRACTION) + 1
+    assert await manager.aget("gemini-2.5-flash", TEXT) == name
+    assert (
+        metric("agent_context_cache_operations_total", operation="refreshed")
+        - refreshed
+        == 1
+    )
+
+
+@pytest.mark.anyio
+async def test_short_prefixes_are_sent_inline(fake_gemini):
+    prompt, cache = await cached_prompt("gemini-2.5-flash", "Short. ", "Question", 60)
+    assert (prompt, cache) == ("Short. Question", None)
+
+
+@pytest.mark.anyio
+async def test_fake_rejects_caches_below_the_model_minimum(fake_gemini):
+    client = get_genai_client()
+    with pytest.raises(ValueError, match="too small"):
+        await client.aio.caches.create(
+            model="gemini-2.5-pro", config={"contents": ["Short. " * 100]}
+        )
+
+
+@pytest.mark.anyio
+async def test_shipped_prefixes_are_sent_inline(fake_gemini, metric):
+    config = {
+        "configurable": {"max_research_loops": 1, "prompt_cache_ttl_seconds": 300}
+    }
+    created = metric("agent_context_cache_operations_total", operation="created")
+    failed = metric("agent_context_cache_operations_total", operation="failed")
+    await graph.ainvoke({"messages": [HumanMessage(content="Inline question")]}, config)
+    assert (
+        metric("agent_context_cache_operations_total", operation="created") == created
+    )
+    assert metric("agent_context_cache_operations_total", operation="failed") == failed
+
+
+@pytest.mark.anyio
+async def test_cached_prefix_tokens_are_reported(fake_gemini, metric):
+    graph_module = sys.modules["agent.graph"]
+    # Grow each static prefix past its model's minimum, as longer instructions would
+    padding = "Prefer primary sources over secondary reporting.\n" * 400
+    for name in ("query_writer_prefix", "reflection_prefix", "answer_prefix"):
+        fake_gemini.setattr(graph_module, name, getattr(prompts, name) + padding)
+    config = {
+        "configurable": {
+            "max_research_loops": 1,
+            "prompt_cache_ttl_seconds": 300,
+        }
+    }
+    created = metric("agent_context_cache_operations_total", operation="created")
+    cache_read = metric(
+        "agent_node_tokens_total", node="generate_query", kind="cache_read"
+    )
+    for index in range(2):
+        await graph.ainvoke(
+            {"messages": [HumanMessage(content=f"Cached question {index}")]}, config
+        )
+    # One cache per prefix, query writer, reflection and answer, reused by run two
+    assert (
+        metric("agent_context_cache_operations_total", operation="created") - created
+        == 3
+    )
+    assert metric(
+        "agent_node_tokens_total", node="generate_query", kind="cache_read"
+    ) - cache_read == 2 * estimate_tokens(graph_module.query_writer_prefix)
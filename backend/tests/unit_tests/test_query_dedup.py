@@ -0,0 +1,58 @@
+import pytest
+
+from agent.query_dedup import (
+    cosine_similarity,
+    dedupe_queries,
+    hashed_vector,
+    query_tokens,
+    token_set_similarity,
+)
+
+
+def test_query_tokens_ignore_case_order_and_stopwords():
+    assert query_tokens("What is the cost of Solar panels") == {
+        "cost",
+        "solar",
+        "panels",
+    }
+    # A query of nothing but stopwords still has tokens
+    assert query_tokens("What is it") == {"what", "is", "it"}
+
+
+def test_reordered_query_is_a_duplicate():
+    assert (
+        dedupe_queries(["2024 solar panel costs"], seen=["Solar panel costs 2024"])
+        == []
+    )
+
+
+@pytest.mark.parametrize(
+    "threshold, kept",
+    [(0.75, []), (0.76, ["solar panel installation costs"])],
+)
+def test_jaccard_threshold_is_inclusive(threshold, kept):
+    # 3 shared content words out of 4
+    a, b = "solar panel costs", "solar panel installation costs"
+    assert token_set_similarity(query_tokens(a), query_tokens(b)) == 0.75
+    assert dedupe_queries([b], seen=[a], threshold=threshold) == kept
+
+
+def test_duplicates_within_one_batch_are_dropped():
+    assert dedupe_queries(
+        ["EV sales Europe", "Europe EV sales", "EV charging Europe"], threshold=0.8
+    ) == ["EV sales Europe", "EV charging Europe"]
+
+
+def test_trigram_vectors_catch_different_word_forms():
+    a, b = "solar panel cost", "cost of solar panels"
+    assert token_set_similarity(query_tokens(a), query_tokens(b)) == 0.5
+    assert cosine_similarity(hashed_vector(a), hashed_vector(b)) == pytest.approx(
+        0.804, abs=0.001
+    )
+    assert dedupe_queries([b], seen=[a], threshold=0.8) == [b]
+    assert dedupe_queries([b], seen=[a], threshold=0.8, use_vectors=True) == []
+
+
+def test_hashed_vectors_are_normalized():
+    vector = hashed_vector("renewable energy subsidies")
+    assert cosine_similarity(vector, vector) == pytest.approx(1.0)
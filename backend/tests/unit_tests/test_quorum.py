@@ -0,0 +1,44 @@
+from collections import defaultdict
+
+import pytest
+from langchain_core.messages import HumanMessage
+
+from agent.graph import graph
+from agent.quorum import collect_late_results, merge_updates, quorum_size
+
+
+def test_quorum_size():
+    assert quorum_size(5, 0.6) == 3
+    assert quorum_size(5, 0.01) == 1
+    assert quorum_size(3, 1.0) == 3
+
+
+def test_merge_updates_concatenates_lists():
+    merged = merge_updates([{"search_query": ["a"]}, {"search_query": ["b", "c"]}])
+    assert merged == {"search_query": ["a", "b", "c"]}
+
+
+@pytest.mark.anyio
+async def test_short_urls_stay_unique_with_late_searches(fake_gemini):
+    # A wide latency spread leaves searches running past each loop's quorum
+    fake_gemini.setenv("FAKE_GEMINI_LATENCY_SIGMA", "1.5")
+    for index in range(5):
+        state = await graph.ainvoke(
+            {
+                "messages": [HumanMessage(content=f"Quorum question {index}")],
+                "initial_search_query_count": 5,
+            },
+            {
+                "configurable": {
+                    "max_research_loops": 3,
+                    "reflection_quorum": 0.3,
+                    "query_similarity_threshold": 1.0,
+                }
+            },
+        )
+        urls = defaultdict(set)
+        for _, short_url, value in state["sources_gathered"]["records"]:
+            urls[short_url].add(value)
+        assert urls
+        assert all(len(values) == 1 for values in urls.values()), index
+        collect_late_results(state["turn_id"], cancel_pending=True)
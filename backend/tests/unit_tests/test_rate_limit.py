@@ -0,0 +1,85 @@
+import asyncio
+
+import fakeredis
+import pytest
+
+from agent import rate_limit
+from agent.rate_limit import RateLimiter, RateLimits, get_rate_limiter
+
+
+@pytest.fixture(params=["memory", "redis"])
+def make_limiter(request):
+    def make(rpm=0, tpm=0):
+        redis_client = None
+        if request.param == "redis":
+            redis_client = fakeredis.FakeRedis(server=fakeredis.FakeServer())
+        return RateLimiter("gemini-test", RateLimits(rpm, tpm), redis_client)
+
+    return make
+
+
+def test_unlimited_model_never_waits(make_limiter):
+    limiter = make_limiter()
+    assert not limiter.enabled
+    assert all(limiter.reserve(10_000) == 0 for _ in range(100))
+
+
+def test_requests_past_the_rpm_budget_wait_in_turn(make_limiter):
+    # 6 requests per minute refill one request every 10s
+    limiter = make_limiter(rpm=6)
+    assert all(limiter.reserve(1) == 0 for _ in range(6))
+    assert limiter.reserve(1) == pytest.approx(10, abs=0.1)
+    assert limiter.reserve(1) == pytest.approx(20, abs=0.1)
+
+
+def test_tokens_past_the_tpm_budget_wait(make_limiter):
+    # 600 tokens per minute refill 10 tokens per second
+    limiter = make_limiter(tpm=600)
+    assert limiter.reserve(600) == 0
+    assert limiter.reserve(300) == pytest.approx(30, abs=0.05)
+
+
+def test_wait_is_the_longer_of_both_buckets(make_limiter):
+    limiter = make_limiter(rpm=60, tpm=600)
+    assert limiter.reserve(600) == 0
+    assert limiter.reserve(10) == pytest.approx(1, abs=0.05)
+
+
+def test_call_larger_than_the_budget_is_capped(make_limiter):
+    limiter = make_limiter(tpm=100)
+    assert limiter.reserve(1_000) == 0
+    assert limiter.reserve(1_000) == pytest.approx(60, abs=0.05)
+
+
+def test_redis_bucket_outlives_its_deficit():
+    redis_client = fakeredis.FakeRedis(server=fakeredis.FakeServer())
+    limiter = RateLimiter("gemini-test", RateLimits(tpm=60), redis_client)
+    for _ in range(5):
+        wait = limiter.reserve(60)
+    assert wait == pytest.approx(240, abs=0.1)
+    # The key must not expire, and reset to a full bucket, while still in deficit
+    assert redis_client.ttl("gemini-rate-limit:gemini-test") >= 240 + 60
+
+
+@pytest.mark.anyio
+async def test_calls_queue_instead_of_failing(make_limiter):
+    # 600 tokens per minute refill one token every 100ms
+    limiter = make_limiter(tpm=600)
+    limiter.reserve(600)
+    waits = await asyncio.gather(*(limiter.acquire(1) for _ in range(5)))
+    assert all(wait > 0 for wait in waits)
+    assert sorted(waits) == pytest.approx([0.1 * n for n in range(1, 6)], abs=0.03)
+
+
+def test_limiter_reads_budgets_and_redis_from_the_environment(monkeypatch):
+    monkeypatch.setattr(rate_limit, "_limiters", {})
+    monkeypatch.setattr(rate_limit, "_redis_client", None)
+    monkeypatch.setenv("RATE_LIMIT_REDIS_URI", "fakeredis://")
+    monkeypatch.setenv("GEMINI_RATE_LIMITS", '{"gemini-2.5-pro": {"rpm": 5}}')
+    monkeypatch.setenv("GEMINI_TPM", "1000")
+    pro = get_rate_limiter("gemini-2.5-pro")
+    flash = get_rate_limiter("gemini-2.0-flash")
+    assert pro.limits == RateLimits(rpm=5, tpm=0)
+    assert flash.limits == RateLimits(rpm=0, tpm=1000)
+    assert get_rate_limiter("gemini-2.5-pro") is pro
+    assert isinstance(pro._redis, fakeredis.FakeRedis)
@@ -0,0 +1,63 @@
+import pytest
+from langchain_core.exceptions import OutputParserException
+from langchain_core.output_parsers import PydanticOutputParser
+from pydantic import ValidationError
+
+from agent.reflection_cascade import escalation_reason
+from agent.tools_and_schemas import Reflection
+
+
+def reflection(is_sufficient=False, follow_up_queries=("next query",), confidence=0.9):
+    return Reflection(
+        is_sufficient=is_sufficient,
+        knowledge_gap="" if is_sufficient else "Missing figures",
+        follow_up_queries=list(follow_up_queries),
+        confidence=confidence,
+    )
+
+
+@pytest.mark.parametrize("confidence", [-1, 1.5, 7])
+def test_out_of_range_confidence_fails_validation(confidence):
+    with pytest.raises(ValidationError):
+        reflection(confidence=confidence)
+    parser = PydanticOutputParser(pydantic_object=Reflection)
+    with pytest.raises(OutputParserException):
+        parser.parse(
+            '{"is_sufficient": true, "knowledge_gap": "", "follow_up_queries": [], '
+            f'"confidence": {confidence}}}'
+        )
+
+
+@pytest.mark.parametrize(
+    "result",
+    [None, reflection(follow_up_queries=())],
+    ids=["unparsed", "no-follow-up-queries"],
+)
+def test_invalid_verdicts_escalate(result):
+    assert escalation_reason(result, 3, 0.7) == "invalid"
+
+
+def test_unconfident_verdict_escalates():
+    assert escalation_reason(reflection(confidence=0.5), 3, 0.7) == "low_confidence"
+    # Confidence is checked before the sources, whatever the verdict
+    assert (
+        escalation_reason(reflection(is_sufficient=True, confidence=0.5), 0, 0.7)
+        == "low_confidence"
+    )
+
+
+def test_more_research_after_a_barren_loop_escalates():
+    assert escalation_reason(reflection(), 0, 0.7) == "no_new_sources"
+
+
+@pytest.mark.parametrize(
+    "result, new_sources",
+    [
+        (reflection(), 3),
+        (reflection(is_sufficient=True, follow_up_queries=()), 0),
+        (reflection(confidence=0.7), 1),
+    ],
+    ids=["more-research", "sufficient", "at-threshold"],
+)
+def test_confident_verdict_is_kept(result, new_sources):
+    assert escalation_reason(result, new_sources, 0.7) is None
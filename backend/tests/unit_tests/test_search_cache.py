@@ -0,0 +1,111 @@
+from types import SimpleNamespace
+
+import pytest
+
+from agent import search_cache
+from agent.search_cache import SearchCache, _MemoryTier, _SqliteTier, cache_key
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(search_cache, "time", clock)
+    return clock
+
+
+def grounded_response(text):
+    web = SimpleNamespace(uri=f"https://example.com/{text}", title="example.com")
+    metadata = SimpleNamespace(
+        grounding_chunks=[SimpleNamespace(web=web)],
+        grounding_supports=[
+            SimpleNamespace(
+                segment=SimpleNamespace(start_index=0, end_index=len(text)),
+                grounding_chunk_indices=[0],
+            )
+        ],
+    )
+    return SimpleNamespace(
+        text=text, candidates=[SimpleNamespace(grounding_metadata=metadata)]
+    )
+
+
+def test_queries_differing_in_case_and_spacing_share_a_key():
+    key = cache_key("Solar  panel costs ", "gemini-2.0-flash", "2025-01-01")
+    assert key == cache_key("solar panel\tCOSTS", "gemini-2.0-flash", "2025-01-01")
+    assert key != cache_key("solar panel costs", "gemini-2.5-flash", "2025-01-01")
+    assert key != cache_key("solar panel costs", "gemini-2.0-flash", "2025-01-02")
+    assert key != cache_key("solar panels costs", "gemini-2.0-flash", "2025-01-01")
+
+
+def test_memory_tier_evicts_the_least_recently_used(clock):
+    tier = _MemoryTier(2)
+    tier.put("a", {"n": 1}, clock.now + 60)
+    tier.put("b", {"n": 2}, clock.now + 60)
+    # Reading "a" promotes it, so "b" is the one evicted
+    assert tier.get("a") == {"n": 1}
+    tier.put("c", {"n": 3}, clock.now + 60)
+    assert tier.get("b") is None
+    assert tier.get("a") == {"n": 1}
+    assert tier.get("c") == {"n": 3}
+
+
+def test_memory_tier_drops_expired_entries(clock):
+    tier = _MemoryTier(2)
+    tier.put("a", {"n": 1}, clock.now + 60)
+    clock.now += 61
+    assert tier.get("a") is None
+    assert not tier._entries
+
+
+def test_sqlite_tier_expires_entries(clock, tmp_path):
+    tier = _SqliteTier(str(tmp_path / "cache.db"), max_bytes=1024)
+    tier.put("a", {"n": 1}, clock.now + 60)
+    assert tier.get("a") == (clock.now + 60, {"n": 1})
+    clock.now += 61
+    assert tier.get("a") is None
+
+
+def test_sqlite_tier_evicts_least_recently_used_past_its_size(clock, tmp_path):
+    payload = {"text": "x" * 100}
+    # Room for two payloads but not three
+    tier = _SqliteTier(str(tmp_path / "cache.db"), max_bytes=250)
+    for key in ("a", "b"):
+        tier.put(key, payload, clock.now + 600)
+        clock.now += 1
+    assert tier.get("a") is not None
+    clock.now += 1
+    tier.put("c", payload, clock.now + 600)
+    assert tier.get("b") is None
+    assert tier.get("a") is not None
+    assert tier.get("c") is not None
+
+
+def test_sqlite_hits_survive_a_restart_and_are_promoted(clock, tmp_path):
+    path = str(tmp_path / "cache.db")
+    SearchCache(sqlite_path=path).put(
+        "solar costs", "gemini-2.0-flash", "2025-01-01", grounded_response("Cheap")
+    )
+    cache = SearchCache(memory_entries=4, sqlite_path=path)
+    response = cache.get("Solar Costs", "gemini-2.0-flash", "2025-01-01")
+    assert response.text == "Cheap"
+    support = response.candidates[0].grounding_metadata.grounding_supports[0]
+    assert (support.segment.end_index, support.grounding_chunk_indices) == (5, [0])
+    key = cache_key("solar costs", "gemini-2.0-flash", "2025-01-01")
+    assert cache._memory.get(key) is not None
+
+
+def test_cache_entries_expire_after_the_ttl(clock):
+    cache = SearchCache(ttl_seconds=60)
+    cache.put("query", "gemini-2.0-flash", "2025-01-01", grounded_response("Hit"))
+    clock.now += 59
+    assert cache.get("query", "gemini-2.0-flash", "2025-01-01").text == "Hit"
+    clock.now += 2
+    assert cache.get("query", "gemini-2.0-flash", "2025-01-01") is None
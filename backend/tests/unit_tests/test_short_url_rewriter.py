@@ -0,0 +1,57 @@
+import pytest
+
+from agent.utils import ShortUrlRewriter, ShortUrlSubstituter
+
+PREFIX = ShortUrlRewriter.PREFIX
+SOURCES = [
+    {"label": "Reuters", "short_url": f"{PREFIX}0-1", "value": "https://reuters.com/a"},
+    {"label": "Nature", "short_url": f"{PREFIX}0-12", "value": "https://nature.com/b"},
+    {"label": "Who", "short_url": f"{PREFIX}1-3", "value": "https://who.int/c"},
+]
+TEXT = (
+    f"Revenue grew [Reuters]({PREFIX}0-1). Adoption rose [Nature]({PREFIX}0-12), "
+    f"see also {PREFIX}1-3"
+)
+
+
+def expected(text):
+    substituter = ShortUrlSubstituter(SOURCES)
+    return substituter.substitute(text), substituter.used_sources
+
+
+def stream(chunks):
+    rewriter = ShortUrlRewriter(SOURCES)
+    text = "".join(rewriter.feed(chunk) for chunk in chunks) + rewriter.flush()
+    return text, rewriter.used_sources
+
+
+def test_url_fed_one_character_at_a_time():
+    assert stream(TEXT) == expected(TEXT)
+
+
+def test_url_split_at_any_boundary():
+    for split in range(1, len(TEXT)):
+        assert stream([TEXT[:split], TEXT[split:]]) == expected(TEXT), split
+
+
+def test_short_url_is_held_until_it_ends():
+    rewriter = ShortUrlRewriter(SOURCES)
+    assert rewriter.feed(f"Grew [Reuters]({PREFIX}0-1") == "Grew [Reuters]("
+    # ".../0-1" may still become ".../0-12"
+    assert rewriter.feed("2") == ""
+    assert rewriter.feed(") today") == "https://nature.com/b) today"
+
+
+@pytest.mark.parametrize("tail", ["https://vertexais", PREFIX, f"{PREFIX}9-"])
+def test_flush_returns_a_partial_prefix_unchanged(tail):
+    rewriter = ShortUrlRewriter(SOURCES)
+    text = rewriter.feed("Ends with " + tail)
+    assert text + rewriter.flush() == "Ends with " + tail
+    assert rewriter.used_sources == []
+
+
+def test_flush_rewrites_a_url_at_the_end_of_the_stream():
+    rewriter = ShortUrlRewriter(SOURCES)
+    assert rewriter.feed(f"Source: {PREFIX}1-3") == "Source: "
+    assert rewriter.flush() == "https://who.int/c"
+    assert rewriter.used_sources == [SOURCES[2]]
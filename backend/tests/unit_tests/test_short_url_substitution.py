@@ -0,0 +1,29 @@
+from agent.utils import ShortUrlSubstituter, replace_short_urls
+
+PREFIX = "https://vertexaisearch.cloud.google.com/id/"
+
+
+def source(short_id, value):
+    return {"label": value, "short_url": PREFIX + short_id, "value": value}
+
+
+def test_a_short_url_never_matches_inside_a_longer_one():
+    sources = [source("1-2", "short"), source("1-23", "long")]
+    text, used = replace_short_urls(
+        f"[a]({PREFIX}1-23) [b]({PREFIX}1-2) [c]({PREFIX}1-234)", sources
+    )
+    # ".../1-234" is not a known short url, so it is left alone entirely
+    assert text == f"[a](long) [b](short) [c]({PREFIX}1-234)"
+    assert used == [sources[1], sources[0]]
+
+
+def test_sources_are_collected_once_in_order_of_first_use():
+    sources = [source("0-0", "zero"), source("0-1", "one"), source("0-0", "again")]
+    substituter = ShortUrlSubstituter(sources)
+    text = substituter.substitute(f"{PREFIX}0-1 {PREFIX}0-0 {PREFIX}0-1")
+    assert text == "one zero one"
+    assert substituter.used_sources == [sources[1], sources[0]]
+
+
+def test_no_sources_leave_the_text_unchanged():
+    assert replace_short_urls(f"{PREFIX}0-0", []) == (f"{PREFIX}0-0", [])
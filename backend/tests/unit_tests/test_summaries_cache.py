@@ -0,0 +1,107 @@
+import sys
+
+import pytest
+from langchain_core.messages import HumanMessage
+
+from agent.context_cache import get_context_cache
+from agent.graph import graph
+
+
+def run_config(**configurable):
+    return {
+        "configurable": {
+            "max_research_loops": 2,
+            "summaries_cache_ttl_seconds": 300,
+            **configurable,
+        }
+    }
+
+
+@pytest.mark.anyio
+async def test_answer_reads_the_last_reflections_cache(fake_gemini, metric):
+    created = metric("agent_context_cache_operations_total", operation="created")
+    reflection_read = metric(
+        "agent_node_tokens_total", node="reflection", kind="cache_read"
+    )
+    answer_read = metric(
+        "agent_node_tokens_total", node="finalize_answer", kind="cache_read"
+    )
+    await graph.ainvoke(
+        {
+            "messages": [HumanMessage(content="Shared cache question")],
+            "reasoning_model": "gemini-2.5-flash",
+        },
+        run_config(),
+    )
+    assert (
+        metric("agent_context_cache_operations_total", operation="created") - created
+        == 1
+    )
+    reflection_read = (
+        metric("agent_node_tokens_total", node="reflection", kind="cache_read")
+        - reflection_read
+    )
+    assert reflection_read > 0
+    assert (
+        metric("agent_node_tokens_total", node="finalize_answer", kind="cache_read")
+        - answer_read
+        == reflection_read
+    )
+
+
+@pytest.mark.anyio
+async def test_no_summaries_cache_across_models(fake_gemini, metric):
+    created = metric("agent_context_cache_operations_total", operation="created")
+    await graph.ainvoke(
+        {"messages": [HumanMessage(content="Two models question")]},
+        run_config(reflection_model="gemini-2.5-flash", answer_model="gemini-2.5-pro"),
+    )
+    assert (
+        metric("agent_context_cache_operations_total", operation="created") - created
+        == 0
+    )
+
+
+@pytest.mark.anyio
+async def test_expired_handles_are_dropped(fake_gemini):
+    manager = get_context_cache(60)
+    for index in range(3):
+        await manager.aget("gemini-2.5-flash", f"Summaries {index}. " * 400)
+    for handle in manager._handles.values():
+        handle.expires_at = 0
+    await manager.aget("gemini-2.5-flash", "Other summaries. " * 400)
+    assert len(manager._handles) == 1
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    "configurable",
+    [{"summaries_cache_ttl_seconds": 0}, {"answer_context_tokens": 500}],
+    ids=["disabled", "below-minimum"],
+)
+async def test_no_summaries_built_for_an_uncacheable_reflection(
+    fake_gemini, metric, configurable
+):
+    graph_module = sys.modules["agent.graph"]
+    built = []
+
+    async def answer_summaries(results, context):
+        built.append(len(results))
+        return await original(results, context)
+
+    original = graph_module.answer_summaries
+    fake_gemini.setattr(graph_module, "answer_summaries", answer_summaries)
+    created = metric("agent_context_cache_operations_total", operation="created")
+    await graph.ainvoke(
+        {
+            "messages": [HumanMessage(content="Uncached summaries question")],
+            "reasoning_model": "gemini-2.5-flash",
+        },
+        run_config(**configurable),
+    )
+    # Only the final answer packs the summaries
+    assert len(built) == 1
+    assert (
+        metric("agent_context_cache_operations_total", operation="created") - created
+        == 0
+    )
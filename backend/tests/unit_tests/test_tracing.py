@@ -0,0 +1,69 @@
+from collections import Counter
+
+import pytest
+from langchain_core.messages import HumanMessage
+
+from agent.graph import graph
+from agent.tracing import configure_tracing
+
+
+@pytest.fixture(scope="module")
+def span_exporter():
+    # The global tracer provider can only be set once per process
+    return configure_tracing("memory")
+
+
+@pytest.mark.anyio
+async def test_run_is_one_trace_across_sends_and_loops(fake_gemini, span_exporter):
+    span_exporter.clear()
+    await graph.ainvoke(
+        {
+            "messages": [HumanMessage(content="Traced question")],
+            "initial_search_query_count": 2,
+        },
+        {"configurable": {"max_research_loops": 2}},
+    )
+    spans = span_exporter.get_finished_spans()
+    by_id = {span.context.span_id: span for span in spans}
+
+    assert len({span.context.trace_id for span in spans}) == 1
+    (root,) = [span for span in spans if span.parent is None]
+    assert root.name == "node generate_query"
+    assert all(span.parent.span_id in by_id for span in spans if span is not root)
+
+    def parent_name(span):
+        return by_id[span.parent.span_id].name
+
+    nodes = Counter(span.name for span in spans if span.name.startswith("node "))
+    assert nodes["node reflection"] == 2
+    assert nodes["node finalize_answer"] == 1
+    # Two initial searches plus the first reflection's follow-ups
+    assert nodes["node web_research"] > 2
+    for span in spans:
+        if span.name.startswith("node ") and span is not root:
+            assert span.parent.span_id == root.context.span_id
+
+    calls = [span for span in spans if span.attributes.get("gen_ai.system")]
+    assert {span.attributes["gen_ai.operation.name"] for span in calls} == {
+        "generate_queries",
+        "search",
+        "reflect",
+        "answer",
+    }
+    for span in calls:
+        operation = span.attributes["gen_ai.operation.name"]
+        expected = {
+            "generate_queries": "node generate_query",
+            "search": "node web_research",
+            "reflect": "node reflection",
+            "answer": "node finalize_answer",
+        }[operation]
+        assert parent_name(span) == expected
+
+    post_processing = [
+        span
+        for span in spans
+        if span.name in ("resolve_urls", "get_citations", "insert_citation_markers")
+    ]
+    assert len(post_processing) == 3 * nodes["node web_research"]
+    assert all(parent_name(span) == "node web_research" for span in post_processing)